@@ -0,0 +1,162 @@
+"""
+Latency and agreement of the local text classifier against the LLM sensitivity check.
+
+Reads a labeled corpus (one JSON object per line with "text", "url" and a
+boolean "label") and reports, for each engine:
+    - latency per page (p50/p95), total time and pages per second
+    - agreement with the labels
+and for the combination the guard runs with --classifier-model:
+    - fallback rate (pages the local model was not confident about)
+    - agreement with the labels when uncertain pages go to the LLM
+    - agreement between the local verdicts and the LLM verdicts
+
+Usage:
+    python benchmarks/bench_sensitivity.py --classifier-model model.int8.onnx --classifier-tokenizer tokenizer.json
+    python benchmarks/bench_sensitivity.py --classifier-model ... --classifier-tokenizer ... --no-llm
+    python benchmarks/bench_sensitivity.py --llm-url http://localhost:3001/api/v1/openai/chat/completions
+    python benchmarks/bench_sensitivity.py --llm-batch-size 8   # batched prompts, as --llm-batch-size in the guard
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "sensitivity_corpus.jsonl")
+
+def load_corpus(path: str) -> List[Dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def agreement(verdicts: List[Optional[bool]], expected: List[Optional[bool]]) -> Optional[float]:
+    pairs = [(a, b) for a, b in zip(verdicts, expected) if a is not None and b is not None]
+    if not pairs:
+        return None
+    return sum(a == b for a, b in pairs) / len(pairs)
+
+def run_local(corpus: List[Dict], args) -> Dict:
+    from text_classifier import LocalSensitivityClassifier, OnnxTextClassifier
+    classifier = LocalSensitivityClassifier(
+        OnnxTextClassifier(args.classifier_model, args.classifier_tokenizer, batch_size=args.batch_size),
+        low=args.classifier_thresholds[0],
+        high=args.classifier_thresholds[1]
+    )
+    texts = [item["text"] for item in corpus]
+    classifier.classify(texts[:args.batch_size])  # Warm up the session
+
+    latencies, results = [], []
+    start = time.perf_counter()
+    for offset in range(0, len(texts), args.batch_size):
+        batch = texts[offset:offset + args.batch_size]
+        batch_start = time.perf_counter()
+        results.extend(classifier.classify(batch))
+        latencies.extend([(time.perf_counter() - batch_start) / len(batch)] * len(batch))
+    total = time.perf_counter() - start
+    return {
+        "verdicts": [verdict for verdict, _ in results],
+        "probable": [probability >= 0.5 for _, probability in results],
+        "latencies": latencies,
+        "total": total,
+    }
+
+def run_llm(corpus: List[Dict], args) -> Dict:
+    from unified_privacy_guard import SensitivityChecker, SensitivityCheckError
+    checker = SensitivityChecker(args.llm_url)
+    if args.llm_batch_size > 1:
+        return run_llm_batched(corpus, checker, args)
+    latencies, verdicts = [], []
+    start = time.perf_counter()
+    for item in corpus:
+        page_start = time.perf_counter()
+        try:
+            verdicts.append(checker.is_sensitive(item["text"], item.get("url", "")))
+        except SensitivityCheckError:
+            verdicts.append(None)  # Left out of the agreement
+        latencies.append(time.perf_counter() - page_start)
+    total = time.perf_counter() - start
+    return {"verdicts": verdicts, "latencies": latencies, "total": total}
+
+def run_llm_batched(corpus: List[Dict], checker, args) -> Dict:
+    """Submit every page at once through the guard's request manager, batch_size pages per prompt."""
+    from unified_privacy_guard import LLMRequestManager, SensitivityCheckError
+    manager = LLMRequestManager(checker, max_concurrency=1, batch_size=args.llm_batch_size)
+    try:
+        start = time.perf_counter()
+        futures = [manager.submit(item["text"], item.get("url", "")) for item in corpus]
+        latencies, verdicts = [], []
+        for future in futures:
+            try:
+                verdicts.append(future.result())
+            except SensitivityCheckError:
+                verdicts.append(None)  # Left out of the agreement
+            latencies.append(time.perf_counter() - start)
+        total = time.perf_counter() - start
+        print(f"llm batches: {manager.batches} prompts for {manager.batched_items} pages")
+    finally:
+        manager.close()
+    return {"verdicts": verdicts, "latencies": latencies, "total": total}
+
+def report(name: str, result: Dict, labels: List[bool], verdicts: List[Optional[bool]]):
+    latencies = result["latencies"]
+    accuracy = agreement(verdicts, labels)
+    print(f"{name:<10} p50 {percentile(latencies, 0.5) * 1000:8.2f} ms  "
+          f"p95 {percentile(latencies, 0.95) * 1000:8.2f} ms  "
+          f"total {result['total']:7.2f} s  "
+          f"{len(latencies) / result['total']:7.1f} pages/s  "
+          f"label agreement {accuracy * 100:5.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description="Local classifier vs LLM sensitivity benchmark")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Labeled JSONL corpus")
+    parser.add_argument("--classifier-model", help="ONNX text classifier")
+    parser.add_argument("--classifier-tokenizer", help="tokenizer.json of --classifier-model")
+    parser.add_argument("--classifier-thresholds", type=float, nargs=2, default=[0.2, 0.8],
+                        metavar=("LOW", "HIGH"))
+    parser.add_argument("--batch-size", type=int, default=8, help="Texts per local inference batch (default: 8)")
+    parser.add_argument("--llm-url", default="http://localhost:3001/api/v1/openai/chat/completions")
+    parser.add_argument("--llm-batch-size", type=int, default=1,
+                        help="Pages per LLM prompt; above 1 every page is submitted at once (default: 1)")
+    parser.add_argument("--no-llm", action="store_true", help="Only benchmark the local classifier")
+    args = parser.parse_args()
+
+    if not args.classifier_model and args.no_llm:
+        parser.error("nothing to benchmark without --classifier-model and with --no-llm")
+    if args.classifier_model and not args.classifier_tokenizer:
+        parser.error("--classifier-tokenizer is required with --classifier-model")
+
+    corpus = load_corpus(args.corpus)
+    labels = [bool(item["label"]) for item in corpus]
+    print(f"{len(corpus)} pages, {sum(labels)} sensitive")
+
+    local = run_local(corpus, args) if args.classifier_model else None
+    llm = None if args.no_llm else run_llm(corpus, args)
+
+    if local:
+        # Thresholded at 0.5, to compare the model itself with the LLM
+        report("local", local, labels, local["probable"])
+    if llm:
+        report("llm", llm, labels, llm["verdicts"])
+    if local:
+        deferred = sum(verdict is None for verdict in local["verdicts"])
+        print(f"fallback rate {deferred / len(corpus) * 100:.1f}% "
+              f"({deferred} of {len(corpus)} pages between {args.classifier_thresholds[0]} and {args.classifier_thresholds[1]})")
+        confident = agreement(local["verdicts"], labels)
+        if confident is not None:
+            print(f"confident local verdicts: label agreement {confident * 100:.1f}%")
+    if local and llm:
+        combined = [verdict if verdict is not None else fallback
+                    for verdict, fallback in zip(local["verdicts"], llm["verdicts"])]
+        print(f"local + llm fallback: label agreement {agreement(combined, labels) * 100:.1f}%, "
+              f"LLM calls saved {(len(corpus) - deferred) / len(corpus) * 100:.1f}%")
+        print(f"local vs llm agreement {agreement(local['probable'], llm['verdicts']) * 100:.1f}%")
+
+if __name__ == "__main__":
+    main()
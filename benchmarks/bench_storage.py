@@ -0,0 +1,134 @@
+"""
+Read throughput of the central server's storage API, as the guard polls it.
+
+Stores a tab event of the given size under a key, then reads it back from
+several keep-alive connections for a fixed time and reports:
+    - requests per second and response bytes per second
+    - latency per request (p50/p95/p99)
+    - the same for GET /api/storage (stats) with --stats
+
+Usage:
+    python benchmarks/bench_storage.py --url http://localhost:3000
+    python benchmarks/bench_storage.py --text-bytes 5000 --screenshot-bytes 200000 --connections 8
+    python benchmarks/bench_storage.py --gzip --stats
+
+autocannon gives the same numbers from Node, after storing the event once with this script:
+    npx autocannon -c 8 -d 10 http://localhost:3000/api/storage/latest_tab_event
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+from bench_sensitivity import percentile
+
+def tab_event(text_bytes: int, screenshot_bytes: int) -> Dict:
+    """A tab event shaped like the extension's, with text and screenshot of about the given sizes."""
+    line = "Checking account ending 4821, available balance $3,214.77. "
+    text = (line * (text_bytes // len(line) + 1))[:text_bytes]
+    return {
+        "event": "tab_activated",
+        "timestamp": int(time.time() * 1000),
+        "data": {
+            "url": "https://online.examplebank.com/accounts",
+            "title": "Accounts - Example Bank",
+            "messageData": {"textContent": text},
+            "screenshot": "data:image/png;base64," + "A" * screenshot_bytes if screenshot_bytes else "",
+        },
+    }
+
+def connect(url: str) -> http.client.HTTPConnection:
+    parts = urlsplit(url)
+    return http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=10)
+
+def store(url: str, key: str, event: Dict):
+    connection = connect(url)
+    body = json.dumps({"data": event})
+    connection.request("POST", f"/api/storage/{key}", body=body, headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    response.read()
+    if response.status >= 300:
+        raise RuntimeError(f"Storing the event failed with HTTP {response.status}")
+    connection.close()
+
+def read_loop(url: str, path: str, deadline: float, gzip: bool, latencies: List[float], sizes: List[int],
+              errors: List[int]):
+    connection = connect(url)
+    headers = {"Accept-Encoding": "gzip" if gzip else "identity"}
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            connection.close()
+            connection = connect(url)
+            continue
+        latencies.append(time.perf_counter() - start)
+        sizes.append(len(body))
+        if response.status != 200:
+            errors.append(1)
+    connection.close()
+
+def run(url: str, path: str, connections: int, duration: float, gzip: bool) -> Dict:
+    latencies: List[float] = []
+    sizes: List[int] = []
+    errors: List[int] = []
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=read_loop, args=(url, path, deadline, gzip, latencies, sizes, errors))
+               for _ in range(connections)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "path": path,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "requests_per_s": len(latencies) / elapsed,
+        "mb_per_s": sum(sizes) / elapsed / 1e6,
+        "response_bytes": sizes[-1] if sizes else None,
+        "latency_ms": {name: percentile(latencies, fraction) * 1000 if latencies else None
+                       for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))},
+    }
+
+def print_result(result: Dict):
+    latency = result["latency_ms"]
+    print(f"GET {result['path']}")
+    print(f"  {result['requests']} requests, {result['errors']} errors, {result['requests_per_s']:.0f} req/s, "
+          f"{result['mb_per_s']:.1f} MB/s ({result['response_bytes']} bytes per response)")
+    if result["requests"]:
+        print(f"  latency p50 {latency['p50']:.2f} ms  p95 {latency['p95']:.2f} ms  p99 {latency['p99']:.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reads from the central server's storage API")
+    parser.add_argument("--url", default="http://localhost:3000", help="Central server base URL")
+    parser.add_argument("--key", default="latest_tab_event", help="Key to store and read (default: latest_tab_event)")
+    parser.add_argument("--text-bytes", type=int, default=5000, help="Page text size (default: 5000, the extension's cap)")
+    parser.add_argument("--screenshot-bytes", type=int, default=0, help="Screenshot data URL size (default: none)")
+    parser.add_argument("--connections", type=int, default=4, help="Concurrent keep-alive connections (default: 4)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per endpoint (default: 10)")
+    parser.add_argument("--gzip", action="store_true", help="Accept gzip responses, as requests does by default")
+    parser.add_argument("--stats", action="store_true", help="Also benchmark GET /api/storage")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    store(args.url, args.key, tab_event(args.text_bytes, args.screenshot_bytes))
+    results = [run(args.url, f"/api/storage/{args.key}", args.connections, args.duration, args.gzip)]
+    if args.stats:
+        results.append(run(args.url, "/api/storage", args.connections, args.duration, args.gzip))
+    for result in results:
+        print_result(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
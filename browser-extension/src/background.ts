@@ -232,14 +232,14 @@ class TabMonitor {
     if (!tab.id || !tab.url || this.shouldIgnoreUrl(tab.url)) return;
 
     try {
-      // const screenshot = await this.captureScreenshot(tab.id);
+      const screenshot = await this.captureScreenshot(tab.id);
 
       const tabData: TabData = {
         url: tab.url,
         title: tab.title || "",
         tabId: tab.id,
         timestamp: Date.now(),
-        // screenshot,
+        // The screenshot only goes out with the event, the log would keep every image alive
         visibility: "visible",
       };
 
@@ -255,8 +255,9 @@ class TabMonitor {
         tabId: tab.id,
         url: tab.url,
         title: tab.title || "",
-        // screenshotSize: screenshot?.length || 0,
-        // screenshot: screenshot,
+        // Read by the guard's screenshot OCR for pages without DOM text
+        screenshotSize: screenshot?.length || 0,
+        screenshot: screenshot,
         visibility: "visible",
       };
 
@@ -284,9 +285,10 @@ class TabMonitor {
 
   private async captureScreenshot(tabId: number): Promise<string | undefined> {
     try {
+      // JPEG keeps the event small enough to post on every tab change
       const dataUrl = await chrome.tabs.captureVisibleTab({
-        format: "png",
-        quality: 80,
+        format: "jpeg",
+        quality: 70,
       });
       return dataUrl;
     } catch (error) {
@@ -1,4 +1,21 @@
-import { MessageData, DOMData } from './types';
+import { MessageData, DOMData, TextBlock } from './types';
+
+// Text blocks end after a line whose hash is a multiple of this (content-defined
+// boundaries, so editing one part of the page leaves the other blocks' hashes
+// unchanged) or once they reach MAX_BLOCK_CHARS
+const BLOCK_BOUNDARY_MODULUS = 4;
+const MAX_BLOCK_CHARS = 1000;
+const MAX_PAGE_CHARS = 100000;
+
+// 32-bit FNV-1a hash as 8 hex digits
+function fnv1a(text: string): string {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < text.length; i++) {
+    hash ^= text.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return (hash >>> 0).toString(16).padStart(8, '0');
+}
 
 interface ExtendedDOMData extends DOMData {
   fullHTML: string;
@@ -9,6 +26,7 @@ interface ExtendedDOMData extends DOMData {
 
 class ContentScriptMonitor {
   private tabId: number;
+  private lastFingerprint = '';
 
   constructor() {
     this.tabId = this.getTabId();
@@ -30,7 +48,7 @@ class ContentScriptMonitor {
 
     // Custom event listener for DOM data requests
     window.addEventListener('REQUEST_DOM_DATA', () => {
-      this.sendDOMData();
+      this.sendDOMData(true);
     });
 
     // Custom event listener for HTML requests
@@ -123,9 +141,16 @@ class ContentScriptMonitor {
     });
   }
 
-  private sendDOMData(): void {
+  private sendDOMData(force: boolean = false): void {
     const domData = this.extractDOMData();
 
+    // Mutations that leave the text unchanged (scrolling, lazy layout) are not sent
+    const fingerprint = `${domData.url}#${domData.fingerprint}`;
+    if (!force && fingerprint === this.lastFingerprint) {
+      return;
+    }
+    this.lastFingerprint = fingerprint;
+
     console.log('Sending DOM data:', domData);
 
     this.sendMessage({
@@ -229,6 +254,31 @@ class ContentScriptMonitor {
     return importantElements;
   }
 
+  private extractTextBlocks(text: string): TextBlock[] {
+    const blocks: TextBlock[] = [];
+    let current = '';
+    const flush = () => {
+      if (current) {
+        blocks.push({ hash: fnv1a(current), text: current });
+        current = '';
+      }
+    };
+
+    for (const line of text.substring(0, MAX_PAGE_CHARS).split('\n')) {
+      const trimmed = line.trim();
+      if (!trimmed) continue;
+      if (current.length + trimmed.length > MAX_BLOCK_CHARS) {
+        flush();
+      }
+      current = current ? `${current}\n${trimmed}` : trimmed;
+      if (parseInt(fnv1a(trimmed), 16) % BLOCK_BOUNDARY_MODULUS === 0) {
+        flush();
+      }
+    }
+    flush();
+    return blocks;
+  }
+
   private extractDOMData(): ExtendedDOMData {
     const metaTags: Record<string, string> = {};
 
@@ -241,8 +291,10 @@ class ContentScriptMonitor {
       }
     });
 
-    // Get text content (truncated for performance)
-    const textContent = document.body?.innerText?.substring(0, 5000) || '';
+    // Get text content (truncated for performance), and all of it as hashed blocks
+    const innerText = document.body?.innerText || '';
+    const textContent = innerText.substring(0, 5000);
+    const textBlocks = this.extractTextBlocks(innerText);
 
     // Get full HTML
     const fullHTML = document.documentElement.outerHTML;
@@ -258,6 +310,8 @@ class ContentScriptMonitor {
       linkCount: document.querySelectorAll('a').length,
       textContent,
       metaTags,
+      textBlocks,
+      fingerprint: fnv1a(textBlocks.map(block => block.hash).join('')),
       fullHTML,
       htmlSize: fullHTML.length,
       bodyHTML,
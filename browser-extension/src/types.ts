@@ -17,6 +17,14 @@ export interface DOMData {
   linkCount: number;
   textContent: string;
   metaTags: Record<string, string>;
+  textBlocks?: TextBlock[];
+  fingerprint?: string;
+}
+
+// A chunk of page text identified by the hash of its content
+export interface TextBlock {
+  hash: string;
+  text: string;
 }
 
 export interface MessageData {
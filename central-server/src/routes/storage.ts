@@ -1,85 +1,289 @@
 import { Router, Request, Response } from 'express';
-import { StorageItem, StorageResponse, StorageStats, ErrorResponse } from '../types';
+import { gzipSync } from 'zlib';
+import { StorageItem, StorageResponse, StorageStats, StorageMemoryStats, ErrorResponse } from '../types';
+import { LogEntry, StorageLog } from '../storageLog';
+
+// Smallest body worth compressing, as the compression middleware's default threshold
+const GZIP_THRESHOLD = 1024;
+
+// The GET response around a value's JSON text
+const BODY_PREFIX = Buffer.from('{"success":true,"data":', 'utf8');
+const bodySuffix = (timestamp: number) => Buffer.from(`,"timestamp":${timestamp}}`, 'utf8');
+
+// The log is compacted once it is this much larger than the live values
+const COMPACT_RATIO = 2;
+const COMPACT_MIN_BYTES = 4 * 1024 * 1024;
+
+export interface StorageOptions {
+  maxBytes: number;
+  maxKeys: number;
+  // Seconds after its last write that a value expires, 0 to keep values until evicted
+  ttlSeconds: number;
+  logPath?: string;
+}
+
+function numberFromEnv(name: string, fallback: number): number {
+  const value = process.env[name];
+  return value === undefined || value === '' ? fallback : Number(value);
+}
 
+export function storageOptionsFromEnv(): StorageOptions {
+  return {
+    maxBytes: numberFromEnv('STORAGE_MAX_BYTES', 256 * 1024 * 1024),
+    maxKeys: numberFromEnv('STORAGE_MAX_KEYS', 10000),
+    ttlSeconds: numberFromEnv('STORAGE_TTL_SECONDS', 0),
+    logPath: process.env.STORAGE_LOG || undefined
+  };
+}
+
+// In-memory store bounded by bytes and keys. The Map's order is the LRU order:
+// reads and writes move a key to the end, eviction starts at the front.
 class StorageService {
   private storage: Map<string, StorageItem> = new Map();
+  private totalSize = 0;
+  private memoryBytes = 0;
+  private valueBytes = 0;
+  private version = 0;
+  private evictions = { lru: 0, ttl: 0 };
+  private log: StorageLog | null = null;
+
+  constructor(private options: StorageOptions) {
+    if (options.logPath) {
+      this.log = new StorageLog(options.logPath);
+      this.replayLog();
+    }
+    if (options.ttlSeconds > 0) {
+      const sweepMs = Math.min(options.ttlSeconds, 60) * 1000;
+      setInterval(() => this.expire(), sweepMs).unref();
+    }
+  }
 
-  public set(key: string, data: string): StorageResponse {
+  // JSON text of the data as GET returns it: strings holding JSON are returned parsed
+  private static toJson(data: any): string {
+    if (typeof data !== 'string') {
+      return JSON.stringify(data);
+    }
     try {
-      const item: StorageItem = {
+      JSON.parse(data);
+      return data;
+    } catch {
+      return JSON.stringify(data);
+    }
+  }
+
+  private static memoryOf(item: StorageItem): number {
+    return item.body.length + (item.gzipped ? item.gzipped.length : 0) + item.key.length * 2;
+  }
+
+  private static logEntry(item: StorageItem): LogEntry {
+    const suffixLength = bodySuffix(item.timestamp).length;
+    return {
+      key: item.key,
+      timestamp: item.timestamp,
+      size: item.size,
+      json: item.body.subarray(BODY_PREFIX.length, item.body.length - suffixLength)
+    };
+  }
+
+  private replayLog(): void {
+    const started = Date.now();
+    const records = this.log!.replay();
+    for (const record of records) {
+      if (record.op === 'set') {
+        if (!this.isExpired(record.entry.timestamp, started)) {
+          this.insert(record.entry);
+        }
+      } else if (record.op === 'delete') {
+        this.remove(record.key);
+      } else {
+        this.removeAll();
+      }
+    }
+    console.log(`Replayed ${records.length} storage log records into ${this.storage.size} keys ` +
+      `in ${Date.now() - started} ms`);
+    this.compactIfNeeded();
+  }
+
+  private isExpired(timestamp: number, now: number): boolean {
+    return this.options.ttlSeconds > 0 && now - timestamp >= this.options.ttlSeconds * 1000;
+  }
+
+  private insert(entry: LogEntry): StorageItem {
+    const item: StorageItem = {
+      key: entry.key,
+      timestamp: entry.timestamp,
+      size: entry.size,
+      body: Buffer.concat([BODY_PREFIX, entry.json, bodySuffix(entry.timestamp)]),
+      etag: `W/"${entry.timestamp.toString(36)}-${(++this.version).toString(36)}"`
+    };
+
+    this.remove(entry.key);
+    this.storage.set(entry.key, item);
+    this.totalSize += item.size;
+    this.valueBytes += entry.json.length;
+    this.memoryBytes += StorageService.memoryOf(item);
+    this.evict();
+    return item;
+  }
+
+  private remove(key: string): StorageItem | undefined {
+    const item = this.storage.get(key);
+    if (item) {
+      this.storage.delete(key);
+      this.totalSize -= item.size;
+      this.valueBytes -= item.body.length - BODY_PREFIX.length - bodySuffix(item.timestamp).length;
+      this.memoryBytes -= StorageService.memoryOf(item);
+    }
+    return item;
+  }
+
+  private removeAll(): void {
+    this.storage.clear();
+    this.totalSize = 0;
+    this.valueBytes = 0;
+    this.memoryBytes = 0;
+  }
+
+  // Drop least recently used keys until both limits hold; the newest key is kept
+  private evict(): void {
+    while (this.storage.size > 1 &&
+           (this.memoryBytes > this.options.maxBytes || this.storage.size > this.options.maxKeys)) {
+      const oldest = this.storage.keys().next().value as string;
+      this.remove(oldest);
+      this.log?.appendDelete(oldest);
+      this.evictions.lru++;
+    }
+  }
+
+  private expire(): void {
+    const now = Date.now();
+    for (const item of Array.from(this.storage.values())) {
+      if (this.isExpired(item.timestamp, now)) {
+        this.remove(item.key);
+        this.log?.appendDelete(item.key);
+        this.evictions.ttl++;
+      }
+    }
+    this.compactIfNeeded();
+  }
+
+  private compactIfNeeded(): void {
+    if (this.log && this.log.bytes > Math.max(COMPACT_MIN_BYTES, this.valueBytes * COMPACT_RATIO)) {
+      const started = Date.now();
+      this.log.compact(Array.from(this.storage.values(), StorageService.logEntry));
+      console.log(`Compacted storage log to ${this.log.bytes} bytes in ${Date.now() - started} ms`);
+    }
+  }
+
+  public set(key: string, data: any): StorageResponse {
+    try {
+      const stringData = typeof data === 'string' ? data : JSON.stringify(data);
+      const json = Buffer.from(StorageService.toJson(data), 'utf8');
+      const entry: LogEntry = {
         key,
-        data,
         timestamp: Date.now(),
-        size: Buffer.byteLength(data, 'utf8')
+        size: Buffer.byteLength(stringData, 'utf8'),
+        json
       };
 
-      this.storage.set(key, item);
+      if (BODY_PREFIX.length + json.length > this.options.maxBytes) {
+        return {
+          success: false,
+          message: `Data for key ${key} is larger than the storage limit of ${this.options.maxBytes} bytes`
+        };
+      }
+
+      this.insert(entry);
+      if (this.log) {
+        this.log.appendSet(entry);
+        this.compactIfNeeded();
+      }
 
       return {
         success: true,
         message: `Data stored successfully for key: ${key}`,
-        timestamp: item.timestamp
+        timestamp: entry.timestamp
       };
     } catch (error) {
       throw new Error(`Failed to store data: ${error}`);
     }
   }
 
-  public get(key: string): StorageResponse {
+  public get(key: string): StorageItem | undefined {
     const item = this.storage.get(key);
-
     if (!item) {
-      return {
-        success: false,
-        message: `No data found for key: ${key}`
-      };
+      return undefined;
     }
+    if (this.isExpired(item.timestamp, Date.now())) {
+      this.remove(key);
+      this.log?.appendDelete(key);
+      this.evictions.ttl++;
+      return undefined;
+    }
+    // Most recently used
+    this.storage.delete(key);
+    this.storage.set(key, item);
+    return item;
+  }
 
-    try {
-      // Try to parse as JSON, if it fails return as string
-      let parsedData;
-      try {
-        parsedData = JSON.parse(item.data);
-      } catch {
-        parsedData = item.data;
-      }
-
-      return {
-        success: true,
-        data: parsedData,
-        timestamp: item.timestamp
-      };
-    } catch (error) {
-      throw new Error(`Failed to retrieve data: ${error}`);
+  // Gzipped body, compressed on the first request that accepts it instead of on every read
+  public gzipped(item: StorageItem): Buffer | undefined {
+    if (item.body.length < GZIP_THRESHOLD) {
+      return undefined;
     }
+    if (item.gzipped) {
+      return item.gzipped;
+    }
+    const gzipped = gzipSync(item.body);
+    // Kept only within the memory limit, and only while the value is still stored
+    if (this.storage.get(item.key) === item && this.memoryBytes + gzipped.length <= this.options.maxBytes) {
+      item.gzipped = gzipped;
+      this.memoryBytes += gzipped.length;
+    }
+    return gzipped;
   }
 
   public delete(key: string): StorageResponse {
-    const existed = this.storage.delete(key);
+    const item = this.remove(key);
+    if (item) {
+      this.log?.appendDelete(key);
+    }
 
     return {
       success: true,
-      message: existed
+      message: item
         ? `Data deleted successfully for key: ${key}`
         : `No data found for key: ${key}`
     };
   }
 
   public getStats(): StorageStats {
-    const keys = Array.from(this.storage.keys());
-    const totalSize = Array.from(this.storage.values())
-      .reduce((sum, item) => sum + item.size, 0);
+    return {
+      totalKeys: this.storage.size,
+      totalSize: this.totalSize,
+      keys: Array.from(this.storage.keys())
+    };
+  }
 
+  public getMemoryStats(): StorageMemoryStats {
     return {
-      totalKeys: keys.length,
-      totalSize,
-      keys
+      keys: this.storage.size,
+      maxKeys: this.options.maxKeys,
+      bytes: this.memoryBytes,
+      maxBytes: this.options.maxBytes,
+      ttlSeconds: this.options.ttlSeconds,
+      evictions: { ...this.evictions },
+      log: this.log ? { path: this.log.path, bytes: this.log.bytes } : null
     };
   }
 
   public clear(): StorageResponse {
     const keyCount = this.storage.size;
-    this.storage.clear();
+    this.removeAll();
+    if (this.log) {
+      this.log.appendClear();
+      this.compactIfNeeded();
+    }
 
     return {
       success: true,
@@ -88,11 +292,15 @@ class StorageService {
   }
 
   public exists(key: string): boolean {
-    return this.storage.has(key);
+    return this.get(key) !== undefined;
+  }
+
+  public close(): void {
+    this.log?.close();
   }
 }
 
-const storageService = new StorageService();
+export const storageService = new StorageService(storageOptionsFromEnv());
 const router = Router();
 
 // Middleware for request logging
@@ -126,10 +334,10 @@ router.post('/:key', (req: Request, res: Response) => {
       return res.status(400).json(error);
     }
 
-    // Convert data to string if it's not already
-    const stringData = typeof data === 'string' ? data : JSON.stringify(data);
-
-    const result = storageService.set(key, stringData);
+    const result = storageService.set(key, data);
+    if (!result.success) {
+      return res.status(413).json(result);
+    }
     res.status(201).json(result);
   } catch (error) {
     const errorResponse: ErrorResponse = {
@@ -155,13 +363,28 @@ router.get('/:key', (req: Request, res: Response) => {
       return res.status(400).json(error);
     }
 
-    const result = storageService.get(key);
+    const item = storageService.get(key);
 
-    if (!result.success) {
+    if (!item) {
+      const result: StorageResponse = {
+        success: false,
+        message: `No data found for key: ${key}`
+      };
       return res.status(404).json(result);
     }
 
-    res.json(result);
+    // Written straight from the buffers cached at write time; the ETag set here
+    // also spares Express from hashing the body on every read
+    res.set('ETag', item.etag);
+    res.type('application/json');
+    const gzipped = req.acceptsEncodings('gzip') ? storageService.gzipped(item) : undefined;
+    if (gzipped) {
+      // Already encoded, so the compression middleware passes it through
+      res.set('Content-Encoding', 'gzip');
+      res.vary('Accept-Encoding');
+      return res.send(gzipped);
+    }
+    res.send(item.body);
   } catch (error) {
     const errorResponse: ErrorResponse = {
       success: false,
@@ -2,7 +2,7 @@ import express, { Application, Request, Response } from 'express';
 import cors from 'cors';
 import helmet from 'helmet';
 import compression from 'compression';
-import storageRoutes from './routes/storage';
+import storageRoutes, { storageService } from './routes/storage';
 
 class Server {
   private app: Application;
@@ -48,7 +48,8 @@ class Server {
         status: 'OK',
         timestamp: new Date().toISOString(),
         uptime: process.uptime(),
-        memory: process.memoryUsage()
+        memory: process.memoryUsage(),
+        storage: storageService.getMemoryStats()
       });
     });
 
@@ -110,10 +111,12 @@ server.start();
 // Graceful shutdown
 process.on('SIGTERM', () => {
   console.log('SIGTERM received, shutting down gracefully');
+  storageService.close();
   process.exit(0);
 });
 
 process.on('SIGINT', () => {
   console.log('SIGINT received, shutting down gracefully');
+  storageService.close();
   process.exit(0);
 });
\ No newline at end of file
@@ -0,0 +1,144 @@
+import fs from 'fs';
+
+// One record per change: a JSON header line, then for a set the value's JSON
+// text (length bytes) and a newline. Values are copied as bytes, so replay
+// never parses them.
+interface LogHeader {
+  op: 'set' | 'delete' | 'clear';
+  key?: string;
+  timestamp?: number;
+  size?: number;
+  length?: number;
+}
+
+export interface LogEntry {
+  key: string;
+  timestamp: number;
+  size: number;
+  json: Buffer;
+}
+
+export type LogRecord =
+  | { op: 'set'; entry: LogEntry }
+  | { op: 'delete'; key: string }
+  | { op: 'clear' };
+
+const NEWLINE = Buffer.from('\n');
+
+export class StorageLog {
+  public bytes = 0;
+  private fd: number | null = null;
+
+  constructor(public readonly path: string) {}
+
+  // Records of the log in order. A record cut short by a crash ends the replay
+  // and is truncated away, so appends continue from the last complete one.
+  public replay(): LogRecord[] {
+    if (!fs.existsSync(this.path)) {
+      return [];
+    }
+    const buffer = fs.readFileSync(this.path);
+    const records: LogRecord[] = [];
+    let offset = 0;
+    while (offset < buffer.length) {
+      const end = buffer.indexOf(0x0a, offset);
+      if (end < 0) {
+        break;
+      }
+      let header: LogHeader;
+      try {
+        header = JSON.parse(buffer.toString('utf8', offset, end));
+      } catch {
+        break;
+      }
+      let next = end + 1;
+      if (header.op === 'set') {
+        next += (header.length || 0) + 1;
+        if (next > buffer.length || header.key === undefined) {
+          break;
+        }
+        records.push({
+          op: 'set',
+          entry: {
+            key: header.key,
+            timestamp: header.timestamp || 0,
+            size: header.size || 0,
+            json: buffer.subarray(end + 1, next - 1)
+          }
+        });
+      } else if (header.op === 'delete' && header.key !== undefined) {
+        records.push({ op: 'delete', key: header.key });
+      } else if (header.op === 'clear') {
+        records.push({ op: 'clear' });
+      }
+      offset = next;
+    }
+    if (offset < buffer.length) {
+      console.warn(`Storage log ${this.path}: dropping ${buffer.length - offset} bytes of an incomplete record`);
+      fs.truncateSync(this.path, offset);
+    }
+    this.bytes = offset;
+    return records;
+  }
+
+  public appendSet(entry: LogEntry): void {
+    this.write([this.header({
+      op: 'set', key: entry.key, timestamp: entry.timestamp, size: entry.size, length: entry.json.length
+    }), entry.json, NEWLINE]);
+  }
+
+  public appendDelete(key: string): void {
+    this.write([this.header({ op: 'delete', key })]);
+  }
+
+  public appendClear(): void {
+    this.write([this.header({ op: 'clear' })]);
+  }
+
+  // Replace the log with one set record per live entry, oldest first
+  public compact(entries: Iterable<LogEntry>): void {
+    const temporary = `${this.path}.tmp`;
+    const fd = fs.openSync(temporary, 'w');
+    let bytes = 0;
+    try {
+      for (const entry of entries) {
+        const header = this.header({
+          op: 'set', key: entry.key, timestamp: entry.timestamp, size: entry.size, length: entry.json.length
+        });
+        for (const chunk of [header, entry.json, NEWLINE]) {
+          fs.writeSync(fd, chunk);
+          bytes += chunk.length;
+        }
+      }
+      fs.fsyncSync(fd);
+    } finally {
+      fs.closeSync(fd);
+    }
+    this.close();
+    fs.renameSync(temporary, this.path);
+    this.bytes = bytes;
+  }
+
+  public close(): void {
+    if (this.fd !== null) {
+      fs.closeSync(this.fd);
+      this.fd = null;
+    }
+  }
+
+  private header(header: LogHeader): Buffer {
+    return Buffer.from(`${JSON.stringify(header)}\n`, 'utf8');
+  }
+
+  // Synchronous, so the log always matches memory when it is compacted; the
+  // writes go to the page cache and are not fsynced
+  private write(chunks: Buffer[]): void {
+    if (this.fd === null) {
+      this.fd = fs.openSync(this.path, 'a');
+    }
+    for (const chunk of chunks) {
+      fs.writeSync(this.fd, chunk);
+      this.bytes += chunk.length;
+    }
+  }
+}
@@ -1,8 +1,11 @@
 export interface StorageItem {
   key: string;
-  data: string;
   timestamp: number;
   size: number;
+  // GET response serialized once at write time, and its gzip once first asked for
+  body: Buffer;
+  gzipped?: Buffer;
+  etag: string;
 }
 
 export interface StorageResponse {
@@ -18,6 +21,16 @@ export interface StorageStats {
   keys: string[];
 }
 
+export interface StorageMemoryStats {
+  keys: number;
+  maxKeys: number;
+  bytes: number;
+  maxBytes: number;
+  ttlSeconds: number;
+  evictions: { lru: number; ttl: number };
+  log: { path: string; bytes: number } | null;
+}
+
 export interface ErrorResponse {
   success: false;
   error: string;
@@ -0,0 +1,81 @@
+"""
+Measure multi-camera throughput against camera count.
+
+Runs MultiCameraService with synthetic cameras (no hardware needed) for an
+increasing number of cameras and reports aggregate and per-camera frame rates.
+
+Usage:
+    python benchmarks/bench_multi_camera.py --model-path models/model.onnx --max-cameras 4
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from face_counter.detector import FaceDetector
+from benchmarks.synthetic_model import build_synthetic_model
+from face_counter.multi_camera import MultiCameraService
+
+class SyntheticCapture:
+    """Capture stand-in producing random frames at a fixed rate."""
+
+    def __init__(self, camera_id: int, fps: float = 30.0, size=(480, 640)):
+        self.frame_interval = 1.0 / fps if fps > 0 else 0
+        self.frame = np.random.randint(0, 255, size + (3,), dtype=np.uint8)
+        self.next_frame_time = time.time()
+
+    def isOpened(self) -> bool:
+        return True
+
+    def read(self):
+        delay = self.next_frame_time - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        self.next_frame_time = max(self.next_frame_time, time.time()) + self.frame_interval
+        return True, self.frame
+
+    def release(self):
+        pass
+
+def run_scaling(detector, max_cameras: int, duration: float, fps: float):
+    results = []
+    for camera_count in range(1, max_cameras + 1):
+        service = MultiCameraService(
+            detector=detector,
+            camera_ids=list(range(camera_count)),
+            api_endpoint=None,
+            capture_factory=lambda camera_id: SyntheticCapture(camera_id, fps=fps)
+        )
+        service.start(duration=duration)
+        processed = sum(service.frames_processed.values())
+        results.append({
+            "cameras": camera_count,
+            "total_fps": processed / duration,
+            "per_camera_fps": processed / duration / camera_count,
+            "batches": service.batches_run,
+            "dropped": sum(service.frames_dropped.values()),
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-camera scaling benchmark")
+    parser.add_argument("--model-path", help="Path to the ONNX model file (default: synthetic model on the CPU provider)")
+    parser.add_argument("--max-cameras", type=int, default=4, help="Largest camera count to test (default: 4)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per camera count (default: 5)")
+    parser.add_argument("--fps", type=float, default=30.0, help="Synthetic camera frame rate (default: 30)")
+    args = parser.parse_args()
+
+    if args.model_path:
+        detector = FaceDetector(args.model_path)
+    else:
+        detector = FaceDetector(build_synthetic_model(), providers=["CPUExecutionProvider"])
+    print(f"Batching supported: {detector.supports_batching} (max batch: {detector.max_batch_size})")
+    print(f"{'cameras':>8} {'total fps':>10} {'fps/camera':>11} {'batches':>8} {'dropped':>8}")
+    for row in run_scaling(detector, args.max_cameras, args.duration, args.fps):
+        print(f"{row['cameras']:>8} {row['total_fps']:>10.1f} {row['per_camera_fps']:>11.1f} "
+              f"{row['batches']:>8} {row['dropped']:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Deterministic throughput benchmark of the capture -> detect -> publish pipeline.
+
+Replays a recorded source through CameraHandler without a webcam or display.
+With --publish the FastAPI server is started in-process and every frame's
+count is posted to it, so publish cost is included.
+
+Usage:
+    python benchmarks/bench_pipeline.py --model-path models/model.onnx --source recording.mp4
+    python benchmarks/bench_pipeline.py --model-path models/model.onnx --synthetic-frames 300
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from face_counter.detector import FaceDetector
+from benchmarks.synthetic_model import build_synthetic_model
+from face_counter.camera_handler import CameraHandler
+from face_counter.frame_source import open_frame_source, PACING_MODES
+
+def write_synthetic_dump(frame_count: int, height: int = 480, width: int = 640) -> str:
+    """Write random frames to a temporary .npy dump and return its path."""
+    rng = np.random.default_rng(0)
+    frames = rng.integers(0, 255, (frame_count, height, width, 3), dtype=np.uint8)
+    path = os.path.join(tempfile.mkdtemp(), "synthetic_frames.npy")
+    np.save(path, frames)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay pipeline throughput benchmark")
+    parser.add_argument("--model-path", help="Path to the ONNX model file (default: synthetic model on the CPU provider)")
+    parser.add_argument("--source", help="Video file, image directory or raw frame dump to replay")
+    parser.add_argument("--synthetic-frames", type=int, default=300,
+                        help="Number of random frames to generate when no --source is given (default: 300)")
+    parser.add_argument("--pacing", choices=PACING_MODES, default="fast", help="Pacing mode (default: fast)")
+    parser.add_argument("--fps", type=float, help="Frame rate for fixed pacing")
+    parser.add_argument("--publish", action="store_true", help="Publish every count to an in-process API server")
+    parser.add_argument("--api-port", type=int, default=8765, help="Port for the in-process API server (default: 8765)")
+    args = parser.parse_args()
+
+    source = args.source or write_synthetic_dump(args.synthetic_frames)
+    if args.model_path:
+        detector = FaceDetector(args.model_path)
+    else:
+        detector = FaceDetector(build_synthetic_model(), providers=["CPUExecutionProvider"])
+
+    api_endpoint = None
+    if args.publish:
+        from face_counter.api_server import start_server
+        threading.Thread(target=start_server, args=("127.0.0.1", args.api_port), daemon=True).start()
+        time.sleep(1.0)
+        api_endpoint = f"http://127.0.0.1:{args.api_port}/face-count"
+
+    frame_source = open_frame_source(source, pacing=args.pacing, fps=args.fps)
+    handler = CameraHandler(
+        detector=detector,
+        api_endpoint=api_endpoint,
+        publish_interval=0,
+        frame_source=frame_source,
+        display=False
+    )
+
+    start = time.perf_counter()
+    handler.start()
+    elapsed = time.perf_counter() - start
+
+    print(f"\nFrames: {handler.frames_processed}")
+    print(f"Elapsed: {elapsed:.2f}s")
+    print(f"Throughput: {handler.frames_processed / elapsed:.1f} frames/s")
+    print(f"Mean latency: {elapsed / max(handler.frames_processed, 1) * 1000:.2f} ms/frame")
+
+if __name__ == "__main__":
+    main()
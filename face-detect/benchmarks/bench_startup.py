@@ -0,0 +1,118 @@
+"""
+Startup time of the face counter in each mode.
+
+Every measurement runs in a fresh interpreter:
+    - imports: time to import the modules each mode needs
+    - api-only: `python -m face_counter --api-only` until GET /face-count answers
+    - model cold / cached: FaceDetector construction without and with --model-cache-dir
+    - combined: replay mode until the first count reaches the API
+
+Usage:
+    python benchmarks/bench_startup.py [--model-path models/model.onnx] [--runs 5]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import numpy as np
+
+FACE_DETECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, FACE_DETECT_DIR)
+from benchmarks.synthetic_model import build_synthetic_model
+
+IMPORT_SETS = {
+    "cli": "import face_counter.__main__",
+    "api-only": "import face_counter.__main__, face_counter.api_server, uvicorn",
+    "counter": "import face_counter.__main__, face_counter.detector, face_counter.camera_handler",
+}
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def run_python(code: str) -> float:
+    """Run code in a fresh interpreter and return the float it prints."""
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=FACE_DETECT_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+def time_import(statement: str) -> float:
+    return run_python(f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)")
+
+def time_model_load(model_path: str, providers, cache_dir=None) -> float:
+    return run_python(
+        "import time; from face_counter.detector import FaceDetector; t = time.perf_counter(); "
+        f"FaceDetector({model_path!r}, providers={providers!r}, cache_dir={cache_dir!r}); "
+        "print(time.perf_counter() - t)"
+    )
+
+def time_until(cmd, url: str, ready, timeout: float = 60.0) -> float:
+    """Start a process and time until ready(response_body) is true for url."""
+    start = time.perf_counter()
+    process = subprocess.Popen(cmd, cwd=FACE_DETECT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=0.5) as response:
+                    if ready(response.read()):
+                        return time.perf_counter() - start
+            except Exception:
+                pass
+            time.sleep(0.01)
+        raise TimeoutError(f"{url} not ready after {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+def report(name: str, samples):
+    print(f"{name:<28} median {statistics.median(samples) * 1000:8.1f} ms   "
+          f"min {min(samples) * 1000:8.1f} ms   max {max(samples) * 1000:8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Face counter startup benchmark")
+    parser.add_argument("--model-path", help="ONNX model (default: synthetic model)")
+    parser.add_argument("--providers", nargs="+", default=["CPUExecutionProvider"],
+                        help="Execution providers for the model load measurements (default: CPU)")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement (default: 5)")
+    args = parser.parse_args()
+
+    model_path = os.path.abspath(args.model_path or build_synthetic_model())
+    cache_dir = tempfile.mkdtemp(prefix="face_counter_cache_")
+
+    for name, statement in IMPORT_SETS.items():
+        report(f"imports: {name}", [time_import(statement) for _ in range(args.runs)])
+
+    api_samples = []
+    for _ in range(args.runs):
+        port = free_port()
+        api_samples.append(time_until(
+            [sys.executable, "-m", "face_counter", "--api-only", "--api-port", str(port)],
+            f"http://127.0.0.1:{port}/face-count", lambda body: True
+        ))
+    report("api-only ready", api_samples)
+
+    report("model load: cold", [time_model_load(model_path, args.providers) for _ in range(args.runs)])
+    time_model_load(model_path, args.providers, cache_dir)  # Populate the cache
+    report("model load: cached", [time_model_load(model_path, args.providers, cache_dir) for _ in range(args.runs)])
+
+    frames_path = os.path.join(cache_dir, "frames.npy")
+    np.save(frames_path, np.zeros((10, 480, 640, 3), dtype=np.uint8))
+    combined_samples = []
+    for _ in range(args.runs):
+        port = free_port()
+        combined_samples.append(time_until(
+            [sys.executable, "-m", "face_counter", "--model-path", model_path, "--source", frames_path,
+             "--loop", "--no-display", "--api-port", str(port), "--model-cache-dir", cache_dir],
+            f"http://127.0.0.1:{port}/face-count", lambda body: b'"trace_id":"' in body
+        ))
+    report("combined: first count", combined_samples)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Requests/sec and CPU per request of the face count polling paths.
+
+Starts two API-only servers (TCP and Unix domain socket), seeds a count and
+polls it with:
+    - json:            requests.get + JSON + ISO timestamp parsing, as the guard polls by default
+    - json keep-alive: same response over one persistent connection
+    - binary tcp:      GET /face-count.bin over one persistent TCP connection
+    - binary uds:      GET /face-count.bin over one persistent Unix socket connection
+    - shared memory:   seqlock read of the block the counter writes with --shm-name (no server)
+
+Client CPU is this process's CPU time; server CPU is read from /proc (Linux only).
+
+Usage:
+    python benchmarks/bench_wire.py [--requests 2000]
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+import requests
+
+FACE_DETECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, FACE_DETECT_DIR)
+from face_counter import wire
+from face_counter.shm_channel import SharedCountReader, SharedCountWriter
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def server_cpu_seconds(pid):
+    """utime + stime of a process, or None where /proc is not available."""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            fields = stat.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError):
+        return None
+
+def wait_ready(connect, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            connection = connect()
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                connection.close()
+                return
+        except OSError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError("API server not ready")
+
+def seed(connect):
+    connection = connect()
+    connection.request("POST", "/face-count.bin", body=wire.pack_record(2, 0.0, camera_id=0, trace_id=os.urandom(16).hex(),
+                                                                        captured_at=time.time(), changed_at=time.time()))
+    connection.getresponse().read()
+    connection.close()
+
+def poll_json(url: str):
+    def poll():
+        data = requests.get(url, timeout=3).json()
+        datetime.fromisoformat(data["timestamp"])
+        return data["count"]
+    return poll
+
+def poll_keepalive(connection: http.client.HTTPConnection, path: str, decode):
+    def poll():
+        connection.request("GET", path)
+        return decode(connection.getresponse().read())
+    return poll
+
+def decode_json(body: bytes) -> int:
+    data = json.loads(body)
+    datetime.fromisoformat(data["timestamp"])
+    return data["count"]
+
+def decode_binary(body: bytes) -> int:
+    return wire.unpack_record(body)["count"]
+
+def measure(name: str, poll, server_pid: int, count: int):
+    for _ in range(50):
+        poll()
+    server_start = server_cpu_seconds(server_pid)
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    for _ in range(count):
+        poll()
+    elapsed = time.perf_counter() - start
+    client_cpu = (time.process_time() - cpu_start) / count * 1e6
+    server_end = server_cpu_seconds(server_pid)
+    server_cpu = f"{(server_end - server_start) / count * 1e6:8.1f} us/req" if server_start is not None else "n/a"
+    print(f"{name:<18} {count / elapsed:9.0f} req/s   client CPU {client_cpu:8.1f} us/req   server CPU {server_cpu}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Face count wire format benchmark")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per variant (default: 2000)")
+    args = parser.parse_args()
+
+    port = free_port()
+    uds_path = os.path.join(tempfile.mkdtemp(prefix="face_counter_"), "api.sock")
+    servers = [
+        subprocess.Popen([sys.executable, "-m", "face_counter", "--api-only", "--api-port", str(port)],
+                         cwd=FACE_DETECT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+        subprocess.Popen([sys.executable, "-m", "face_counter", "--api-only", "--api-uds", uds_path],
+                         cwd=FACE_DETECT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+    ]
+    tcp_server, uds_server = servers
+    connect_tcp = lambda: http.client.HTTPConnection("127.0.0.1", port, timeout=3)
+    connect_uds = lambda: wire.UnixHTTPConnection(uds_path)
+    try:
+        wait_ready(connect_tcp)
+        wait_ready(connect_uds)
+        seed(connect_tcp)
+        seed(connect_uds)
+
+        measure("json", poll_json(f"http://127.0.0.1:{port}/face-count"), tcp_server.pid, args.requests)
+        measure("json keep-alive", poll_keepalive(connect_tcp(), "/face-count", decode_json), tcp_server.pid, args.requests)
+        measure("binary tcp", poll_keepalive(connect_tcp(), "/face-count.bin", decode_binary), tcp_server.pid, args.requests)
+        measure("binary uds", poll_keepalive(connect_uds(), "/face-count.bin", decode_binary), uds_server.pid, args.requests)
+
+        writer = SharedCountWriter(f"face_counter_bench_{os.getpid()}")
+        writer.write(2, camera_id=0)
+        reader = SharedCountReader(writer.name)
+        measure("shared memory", lambda: reader.read()["count"], None, args.requests * 100)
+        reader.close()
+        writer.close()
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+
+if __name__ == "__main__":
+    main()
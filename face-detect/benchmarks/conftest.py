@@ -0,0 +1,28 @@
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add the face-detect directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.synthetic_model import build_synthetic_model
+
+@pytest.fixture(scope="session")
+def synthetic_model_path(tmp_path_factory):
+    """Build the synthetic ONNX model once per session"""
+    return build_synthetic_model(str(tmp_path_factory.mktemp("models") / "synthetic.onnx"))
+
+@pytest.fixture(scope="session")
+def detector(synthetic_model_path):
+    """Create a FaceDetector on the CPU provider"""
+    from face_counter.detector import FaceDetector
+    return FaceDetector(synthetic_model_path, providers=["CPUExecutionProvider"])
+
+@pytest.fixture
+def frame():
+    """Create a VGA frame with a few bright blobs"""
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 64, (480, 640, 3), dtype=np.uint8)
+    for y, x in [(120, 160), (240, 400), (360, 520)]:
+        frame[y - 20:y + 20, x - 20:x + 20] = 255
+    return frame
@@ -0,0 +1,47 @@
+"""
+Small synthetic stand-in for the Lightweight Face Detection model.
+
+It has the same interface as the real model (uint16 [N, 1, 480, 640] in,
+float [N, 1, 60, 80] heatmap out) but only casts and average-pools the
+image, so benchmarks can run anywhere on the CPU provider without
+downloading the model.
+"""
+import os
+import tempfile
+import onnx
+from onnx import helper, TensorProto
+
+def build_synthetic_model(path: str = None, dynamic_batch: bool = True) -> str:
+    """Write the synthetic model to disk.
+
+    Args:
+        path: Output path (default: a new temporary file)
+        dynamic_batch: Use a dynamic batch dimension instead of a fixed batch of 1
+
+    Returns:
+        Path of the written model
+    """
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), "synthetic_face_detector.onnx")
+
+    batch = "batch" if dynamic_batch else 1
+    image = helper.make_tensor_value_info("image", TensorProto.UINT16, [batch, 1, 480, 640])
+    heatmap = helper.make_tensor_value_info("heatmap", TensorProto.FLOAT, [batch, 1, 60, 80])
+    scale = helper.make_tensor("scale", TensorProto.FLOAT, [], [1.0 / 65535.0])
+
+    graph = helper.make_graph(
+        [
+            helper.make_node("Cast", ["image"], ["image_float"], to=TensorProto.FLOAT),
+            helper.make_node("Mul", ["image_float", "scale"], ["image_scaled"]),
+            helper.make_node("AveragePool", ["image_scaled"], ["heatmap"], kernel_shape=[8, 8], strides=[8, 8]),
+        ],
+        "synthetic_face_detector",
+        [image],
+        [heatmap],
+        initializer=[scale],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.checker.check_model(model)
+    onnx.save(model, path)
+    return path
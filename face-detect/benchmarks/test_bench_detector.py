@@ -0,0 +1,53 @@
+"""
+Per-stage and end-to-end timings of FaceDetector.
+
+Run from the face-detect directory and keep the JSON for comparisons:
+
+    pytest benchmarks --benchmark-json=benchmarks/results/$(git describe --always).json
+    pytest benchmarks --benchmark-autosave --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+import pytest
+import numpy as np
+
+pytest.importorskip("pytest_benchmark")
+
+FRAME_SIZES = [(240, 320), (480, 640), (720, 1280), (1080, 1920)]
+
+def test_preprocess(benchmark, detector, frame):
+    """Resize, grayscale and scale one frame"""
+    result = benchmark(detector.preprocess_image, frame)
+    assert result.shape == (1, 1, 480, 640)
+
+def test_session_run(benchmark, detector, frame):
+    """ONNX session run on the CPU provider"""
+    input_tensor = detector.preprocess_image(frame)
+    result = benchmark(detector.run_inference, input_tensor)
+    assert result.shape == (1, 1, 60, 80)
+
+def test_find_peaks(benchmark, detector, frame):
+    """Peak search over a 60x80 heatmap"""
+    heatmap = detector.run_inference(detector.preprocess_image(frame))[0, 0]
+    benchmark(detector._find_peaks, heatmap, 0.7)
+
+def test_build_boxes(benchmark, detector, frame):
+    """Convert peaks into image-space boxes"""
+    heatmap = detector.run_inference(detector.preprocess_image(frame))[0, 0]
+    peaks = detector._find_peaks(heatmap, threshold=0.7)
+    boxes = benchmark(detector._build_boxes, peaks, heatmap.shape, frame.shape)
+    assert len(boxes) == len(peaks)
+
+@pytest.mark.parametrize("height,width", FRAME_SIZES, ids=[f"{w}x{h}" for h, w in FRAME_SIZES])
+def test_count_faces(benchmark, detector, height, width):
+    """Full count_faces throughput across frame sizes"""
+    benchmark.group = "count_faces"
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    count = benchmark(detector.count_faces, frame)
+    assert count >= 0
+
+@pytest.mark.parametrize("batch_size", [1, 2, 4])
+def test_count_faces_batch(benchmark, detector, frame, batch_size):
+    """Batched counting through a single session run"""
+    benchmark.group = "count_faces_batch"
+    counts = benchmark(detector.count_faces_batch, [frame] * batch_size)
+    assert len(counts) == batch_size
@@ -1,24 +1,59 @@
 import argparse
 import logging
 import os
-from .detector import FaceDetector
-from .camera_handler import CameraHandler
-from .api_server import start_server
 import threading
 
+# Heavy modules (cv2, onnxruntime, FastAPI, uvicorn, requests) are imported
+# inside the functions of the mode that needs them, so --api-only never
+# loads the model stack and counter-only runs never load the web stack.
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def run_face_counter(model_path: str, camera_id: int, api_endpoint: str = "http://127.0.0.1:8000/face-count"):
-    """Run the face counter with the specified model and camera."""
+def warm_up_detector(detector, warmup_iterations: int = 20, on_calibrated=None) -> dict:
+    """Warm up the detector and report the calibration, e.g. to the in-process API."""
+    from .calibration import calibrate
+    
+    calibration = calibrate(detector, iterations=warmup_iterations)
+    if on_calibrated is not None:
+        on_calibrated(calibration)
+    return calibration
+
+def run_face_counter(model_path: str, camera_id: int, api_endpoint: str = "http://127.0.0.1:8000/face-count",
+                     source: str = None, pacing: str = "realtime", fps: float = None, loop: bool = False,
+                     frame_shape: tuple = None, display: bool = True, model_cache_dir: str = None, warmup_iterations: int = 20,
+                     detection_rate: float = None, publish_interval: float = None, on_calibrated=None,
+                     on_count=None, demand=None, low_power_interval: float = 1.0):
+    """Run the face counter with the specified model and camera or recorded source.
+    
+    The model is warmed up first; detection rate and publish interval default
+    to the values calibrated from its steady-state latency. A CaptureDemand
+    lets a consumer pause capture or lower the detection rate.
+    """
     if not os.path.exists(model_path):
         raise FileNotFoundError(f"Model file not found: {model_path}")
     
-    detector = FaceDetector(model_path)
+    from .detector import FaceDetector
+    from .camera_handler import CameraHandler
+    from .frame_source import open_frame_source
+    
+    detector = FaceDetector(model_path, cache_dir=model_cache_dir)
+    calibration = warm_up_detector(detector, warmup_iterations, on_calibrated)
+    frame_source = (open_frame_source(source, pacing=pacing, fps=fps, loop=loop, frame_shape=frame_shape)
+                    if source else None)
     camera = CameraHandler(
         detector=detector,
         camera_id=camera_id,
-        api_endpoint=api_endpoint
+        api_endpoint=api_endpoint,
+        publish_interval=publish_interval or calibration["publish_interval"],
+        frame_source=frame_source,
+        display=display,
+        on_count=on_count,
+        demand=demand,
+        low_power_interval=low_power_interval,
+        # Replayed sources are paced by the source, so every frame is detected
+        detection_interval=(1.0 / detection_rate if detection_rate else
+                            None if frame_source else calibration["detection_interval"])
     )
     
     try:
@@ -28,13 +63,82 @@ def run_face_counter(model_path: str, camera_id: int, api_endpoint: str = "http:
     finally:
         camera.stop()
 
+def run_multi_camera_counter(model_path: str, camera_ids: list, api_endpoint: str = "http://127.0.0.1:8000/face-count",
+                             model_cache_dir: str = None, warmup_iterations: int = 20,
+                             publish_interval: float = None, on_calibrated=None, demand=None,
+                             low_power_interval: float = 1.0):
+    """Run one shared face detector over several cameras."""
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model file not found: {model_path}")
+    
+    from .detector import FaceDetector
+    from .multi_camera import MultiCameraService
+    
+    detector = FaceDetector(model_path, cache_dir=model_cache_dir)
+    calibration = warm_up_detector(detector, warmup_iterations, on_calibrated)
+    service = MultiCameraService(
+        detector=detector,
+        camera_ids=camera_ids,
+        api_endpoint=api_endpoint,
+        publish_interval=publish_interval or calibration["publish_interval"],
+        demand=demand,
+        low_power_interval=low_power_interval
+    )
+    
+    try:
+        service.start()
+    except KeyboardInterrupt:
+        logger.info("Stopping multi-camera face counter...")
+    finally:
+        service.stop()
+
+def serve_api(host: str, port: int, warming_up: bool = False, uds: str = None):
+    """Import and run the API server."""
+    from .api_server import start_server, set_warming_up
+    if warming_up:
+        set_warming_up()
+    start_server(host=host, port=port, uds=uds)
+
+def report_calibration(calibration: dict):
+    """Hand the calibration to the API server running in this process."""
+    from .api_server import set_calibration
+    set_calibration(calibration)
+
+def record_count(sample: dict):
+    """Store a sample from the counter loop directly in the API server running in this process."""
+    from .api_server import record_face_count
+    record_face_count(sample["count"], sample["camera_id"], sample["trace_id"],
+                      sample["captured_at"], sample["changed_at"])
+
+def frame_shape(value: str) -> tuple:
+    """Parse HxW or HxWx3 into the (height, width) of a raw frame dump."""
+    parts = value.lower().split("x")
+    try:
+        dims = [int(part) for part in parts]
+    except ValueError:
+        dims = []
+    if len(dims) not in (2, 3) or min(dims) <= 0:
+        raise argparse.ArgumentTypeError(f"expected HxW or HxWx3, got {value!r}")
+    if len(dims) == 3 and dims[2] != 3:
+        raise argparse.ArgumentTypeError("raw frame dumps hold 3-channel BGR frames")
+    return dims[0], dims[1]
+
+def capture_demand():
+    """The capture demand of the API server running in this process, set through /pause, /resume and /demand."""
+    from .api_server import demand
+    return demand
+
 def main():
     parser = argparse.ArgumentParser(description="Face Counter with API Server")
     parser.add_argument(
         "--model-path",
         type=str,
-        required=True,
-        help="Path to the ONNX model file"
+        help="Path to the ONNX model file (required unless --api-only)"
+    )
+    parser.add_argument(
+        "--model-cache-dir",
+        type=str,
+        help="Directory for the optimized model / QNN context binary, reused on later starts"
     )
     parser.add_argument(
         "--camera-id",
@@ -42,6 +146,60 @@ def main():
         default=0,
         help="Camera device ID (default: 0)"
     )
+    parser.add_argument(
+        "--camera-ids",
+        type=int,
+        nargs="+",
+        help="Several camera device IDs sharing one inference worker (overrides --camera-id)"
+    )
+    parser.add_argument(
+        "--warmup-iterations",
+        type=int,
+        default=20,
+        help="Synthetic frames to run before reporting ready (default: 20)"
+    )
+    parser.add_argument(
+        "--detection-rate",
+        type=float,
+        help="Detections per second (default: calibrated from warm-up latency)"
+    )
+    parser.add_argument(
+        "--publish-interval",
+        type=float,
+        help="Seconds between count updates to the API (default: calibrated from warm-up latency)"
+    )
+    parser.add_argument(
+        "--source",
+        type=str,
+        help="Replay a video file, image directory or raw frame dump (.npy/.raw/.bin) instead of a camera"
+    )
+    parser.add_argument(
+        "--frame-shape",
+        type=frame_shape,
+        metavar="HxWx3",
+        help="Frame size of a headerless .raw/.bin --source, e.g. 480x640x3"
+    )
+    parser.add_argument(
+        "--pacing",
+        choices=["realtime", "fast", "fixed"],
+        default="realtime",
+        help="Pacing for --source: realtime, fast (as fast as possible) or fixed (default: realtime)"
+    )
+    parser.add_argument(
+        "--fps",
+        type=float,
+        help="Frame rate for --pacing fixed"
+    )
+    parser.add_argument(
+        "--loop",
+        action="store_true",
+        help="Restart --source from the beginning at end of stream"
+    )
+    parser.add_argument(
+        "--no-display",
+        action="store_true",
+        help="Don't open the video window (headless runs)"
+    )
     parser.add_argument(
         "--api-host",
         type=str,
@@ -54,6 +212,20 @@ def main():
         default=8000,
         help="Port for the API server (default: 8000)"
     )
+    parser.add_argument(
+        "--api-uds",
+        help="Serve the API on this Unix domain socket instead of TCP"
+    )
+    parser.add_argument(
+        "--shm-name",
+        help="Also publish every count to this shared memory block for readers on the same machine"
+    )
+    parser.add_argument(
+        "--low-power-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between detections while a consumer requests low-power capture (default: 1.0)"
+    )
     parser.add_argument(
         "--api-only",
         action="store_true",
@@ -61,26 +233,61 @@ def main():
     )
     
     args = parser.parse_args()
+    if not args.api_only and not args.model_path:
+        parser.error("--model-path is required unless --api-only is given")
+    if (args.api_uds or args.shm_name) and not args.api_only and args.camera_ids and len(args.camera_ids) > 1:
+        parser.error("--api-uds and --shm-name are not supported with several --camera-ids")
+    if args.source and args.source.lower().endswith((".raw", ".bin")) and not args.frame_shape:
+        parser.error("--frame-shape is required for a headerless .raw/.bin --source")
     
-    # Construct API endpoint URL
-    api_endpoint = f"http://{args.api_host}:{args.api_port}/face-count"
+    # Construct API endpoint URL. Over a Unix socket the counter stores its
+    # counts in the API directly instead of posting them.
+    api_endpoint = None if args.api_uds else f"http://{args.api_host}:{args.api_port}/face-count"
     
     if args.api_only:
         # Run only the API server
         logger.info("Starting API server only...")
-        start_server(host=args.api_host, port=args.api_port)
+        serve_api(args.api_host, args.api_port, uds=args.api_uds)
     else:
-        # Start API server in a separate thread
+        # Start API server in a separate thread, its imports overlap with model loading
         api_thread = threading.Thread(
-            target=start_server,
-            args=(args.api_host, args.api_port),
+            target=serve_api,
+            args=(args.api_host, args.api_port, True, args.api_uds),
             daemon=True
         )
         api_thread.start()
         
         # Run face counter
-        logger.info("Starting face counter...")
-        run_face_counter(args.model_path, args.camera_id, api_endpoint)
+        if args.camera_ids and len(args.camera_ids) > 1:
+            logger.info(f"Starting multi-camera face counter for cameras {args.camera_ids}...")
+            run_multi_camera_counter(args.model_path, args.camera_ids, api_endpoint, model_cache_dir=args.model_cache_dir,
+                                     warmup_iterations=args.warmup_iterations, publish_interval=args.publish_interval,
+                                     on_calibrated=report_calibration, demand=capture_demand(),
+                                     low_power_interval=args.low_power_interval)
+        else:
+            camera_id = args.camera_ids[0] if args.camera_ids else args.camera_id
+            sinks = [record_count] if args.api_uds else []
+            shm_writer = None
+            if args.shm_name:
+                from .shm_channel import SharedCountWriter
+                shm_writer = SharedCountWriter(args.shm_name)
+                sinks.append(shm_writer.write_sample)
+            
+            def on_count(sample: dict):
+                for sink in sinks:
+                    sink(sample)
+            
+            logger.info("Starting face counter...")
+            try:
+                run_face_counter(args.model_path, camera_id, api_endpoint, source=args.source, pacing=args.pacing,
+                                 fps=args.fps, loop=args.loop, frame_shape=args.frame_shape, display=not args.no_display,
+                                 model_cache_dir=args.model_cache_dir, warmup_iterations=args.warmup_iterations,
+                                 detection_rate=args.detection_rate, publish_interval=args.publish_interval,
+                                 on_calibrated=report_calibration, on_count=on_count if sinks else None,
+                                 demand=capture_demand(), low_power_interval=args.low_power_interval)
+            finally:
+                if shm_writer is not None:
+                    shm_writer.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,10 +1,16 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response
 from pydantic import BaseModel
-from typing import Optional
-import uvicorn
+from typing import Any, Dict, List, Optional
 import logging
+import threading
 from datetime import datetime
+from .count_store import CountRecord, CountStore
+from .demand import FULL, PAUSED, MODES, CaptureDemand
+from .history import CountHistory
+from .metrics import registry
+from . import wire
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,46 +31,212 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
-# Store the latest face count and timestamp
-class FaceCountData:
-    def __init__(self):
-        self.count: int = 0
-        self.timestamp: datetime = datetime.now()
-        self.camera_id: Optional[int] = None
+# Latest face count overall and per camera, swapped atomically on every update.
+# A camera silent for CAMERA_MAX_AGE seconds (its capture thread died) no longer
+# counts as one of the cameras reporting.
+CAMERA_MAX_AGE = 10.0
+store = CountStore(max_age=CAMERA_MAX_AGE)
 
-face_data = FaceCountData()
+# Recent samples for windowed queries, so pollers don't miss short events
+history = CountHistory()
+
+# How hard the camera loop in this process should work, set by the consumer
+demand = CaptureDemand()
+
+# Readiness of the face counter in this process. API-only servers are ready
+# right away; the combined mode clears this until the model is warmed up.
+service_state: Dict[str, Any] = {"ready": True, "calibration": None}
+_state_lock = threading.Lock()
+
+def set_warming_up():
+    """Report not ready until set_calibration is called (no-op if it already was)."""
+    with _state_lock:
+        if service_state["calibration"] is None:
+            service_state["ready"] = False
+
+def set_calibration(calibration: Dict[str, Any]):
+    """Store the warm-up calibration and report ready."""
+    with _state_lock:
+        service_state["calibration"] = calibration
+        service_state["ready"] = True
+
+def record_face_count(count: int, camera_id: Optional[int] = None, trace_id: Optional[str] = None,
+                      captured_at: Optional[float] = None, changed_at: Optional[float] = None):
+    """Store a face count, either from the POST handler or from an in-process writer."""
+    # Stamped by the history under its lock, so concurrent writers stay in order
+    timestamp = history.append(count, camera_id)
+    store.update(CountRecord(count, datetime.fromtimestamp(timestamp), camera_id, trace_id, captured_at, changed_at))
 
 class FaceCountResponse(BaseModel):
     count: int
     timestamp: datetime
     camera_id: Optional[int] = None
+    trace_id: Optional[str] = None
+    captured_at: Optional[float] = None
+    changed_at: Optional[float] = None
+
+class CountSample(BaseModel):
+    timestamp: float
+    count: int
+    camera_id: Optional[int] = None
+
+class WindowResponse(BaseModel):
+    window_ms: float
+    samples: int
+    max: Optional[int] = None
+    min: Optional[int] = None
+    mean: Optional[float] = None
+    latest: Optional[FaceCountResponse] = None
+
+class ExceededResponse(BaseModel):
+    threshold: int
+    window_ms: float
+    exceeded: bool
+    first_at: Optional[float] = None
+    max: Optional[int] = None
+
+class DemandResponse(BaseModel):
+    mode: str
+    expires_in: Optional[float] = None
+
+def _to_response(record: CountRecord) -> FaceCountResponse:
+    return FaceCountResponse(**record._asdict())
 
 @app.get("/face-count", response_model=FaceCountResponse)
-async def get_face_count():
-    """Get the current face count from the video stream."""
-    return FaceCountResponse(
-        count=face_data.count,
-        timestamp=face_data.timestamp,
-        camera_id=face_data.camera_id
+async def get_face_count(camera_id: Optional[int] = None):
+    """Get the current face count from the video stream.
+
+    With several cameras reporting, the camera that currently sees the most
+    faces is returned unless a specific camera_id is requested.
+    """
+    if camera_id is not None:
+        record = store.latest(camera_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail=f"No data for camera {camera_id}")
+        return _to_response(record)
+    
+    busiest = store.busiest() if len(store.cameras()) > 1 else None
+    return _to_response(busiest or store.latest())
+
+@app.get("/face-counts", response_model=List[FaceCountResponse])
+async def get_face_counts():
+    """Get the latest face count reported by each camera."""
+    return [_to_response(record) for record in store.records()]
+
+@app.get("/face-count.bin")
+async def get_face_count_binary(camera_id: Optional[int] = None):
+    """Compact variant of GET /face-count: one fixed-size record (see face_counter.wire)."""
+    if camera_id is not None:
+        record = store.latest(camera_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail=f"No data for camera {camera_id}")
+    else:
+        busiest = store.busiest() if len(store.cameras()) > 1 else None
+        record = busiest or store.latest()
+    return Response(wire.pack_count_record(record), media_type=wire.MEDIA_TYPE)
+
+@app.post("/face-count.bin", status_code=204)
+async def update_face_count_binary(request: Request):
+    """Compact variant of POST /face-count: the body is one record, its timestamp is ignored."""
+    body = await request.body()
+    if len(body) != wire.RECORD.size:
+        raise HTTPException(status_code=400, detail=f"Expected {wire.RECORD.size} bytes, got {len(body)}")
+    data = wire.unpack_record(body)
+    record_face_count(data["count"], data["camera_id"], data["trace_id"], data["captured_at"], data["changed_at"])
+    return Response(status_code=204)
+
+@app.get("/face-count/history", response_model=List[CountSample])
+async def get_face_count_history(since: float = 0.0, camera_id: Optional[int] = None, limit: Optional[int] = None):
+    """Get the samples recorded after `since` (epoch seconds), oldest first."""
+    return history.since(since, camera_id, limit)
+
+@app.get("/face-count/window", response_model=WindowResponse)
+async def get_face_count_window(window_ms: float = 1000.0, camera_id: Optional[int] = None):
+    """Get max, min and mean count over the last window_ms milliseconds, with the latest sample."""
+    latest = store.latest(camera_id) if camera_id is not None or len(history) else None
+    return WindowResponse(
+        window_ms=window_ms,
+        latest=_to_response(latest) if latest is not None else None,
+        **history.window(window_ms, camera_id)
     )
 
+@app.get("/face-count/exceeded", response_model=ExceededResponse)
+async def get_face_count_exceeded(threshold: int, window_ms: float = 1000.0, camera_id: Optional[int] = None):
+    """Check whether the count went above threshold within the last window_ms milliseconds."""
+    return ExceededResponse(threshold=threshold, window_ms=window_ms, **history.exceeded(threshold, window_ms, camera_id))
+
 @app.post("/face-count")
-async def update_face_count(count: int, camera_id: Optional[int] = None):
-    """Update the current face count (used by the camera handler)."""
+async def update_face_count(count: int, camera_id: Optional[int] = None, trace_id: Optional[str] = None,
+                            captured_at: Optional[float] = None, changed_at: Optional[float] = None):
+    """Update the current face count (used by the camera handler).
+
+    trace_id, captured_at and changed_at (epoch seconds of the frame capture and
+    of the first frame showing this count) are passed through for decision tracing.
+    """
     try:
-        face_data.count = count
-        face_data.timestamp = datetime.now()
-        face_data.camera_id = camera_id
+        record_face_count(count, camera_id, trace_id, captured_at, changed_at)
         logger.info(f"Updated face count: {count} (Camera: {camera_id})")
         return {"status": "success", "count": count}
     except Exception as e:
         logger.error(f"Error updating face count: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-def start_server(host: str = "127.0.0.1", port: int = 8000):
-    """Start the API server."""
-    logger.info(f"Starting API server at http://{host}:{port}")
-    uvicorn.run(app, host=host, port=port)
+@app.get("/demand", response_model=DemandResponse)
+async def get_demand():
+    """Current capture demand of the camera loop in this process."""
+    return demand.state()
+
+@app.post("/demand", response_model=DemandResponse)
+async def set_demand(mode: str, ttl: Optional[float] = None):
+    """Set the capture demand: full, low (low-power detection rate) or paused.
+
+    low and paused last ttl seconds (default: 30) unless set again, then the
+    camera goes back to full.
+    """
+    if mode not in MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(MODES)}")
+    demand.set(mode, ttl)
+    logger.info(f"Capture demand: {mode}")
+    return demand.state()
+
+@app.post("/pause", response_model=DemandResponse)
+async def pause_capture(ttl: Optional[float] = None):
+    """Release the camera and stop detecting for ttl seconds (default: 30) or until /resume."""
+    return await set_demand(PAUSED, ttl)
+
+@app.post("/resume", response_model=DemandResponse)
+async def resume_capture():
+    """Go back to full-rate capture."""
+    return await set_demand(FULL)
+
+@app.get("/health")
+async def get_health():
+    """Readiness probe, 503 while the model is still warming up."""
+    if not service_state["ready"]:
+        raise HTTPException(status_code=503, detail="Warming up")
+    return {"status": "ready", "calibration": service_state["calibration"]}
+
+@app.get("/calibration")
+async def get_calibration():
+    """Warm-up latency measurements and the rates chosen from them."""
+    if service_state["calibration"] is None:
+        raise HTTPException(status_code=404, detail="No calibration available")
+    return service_state["calibration"]
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Expose stage latency histograms in Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+def start_server(host: str = "127.0.0.1", port: int = 8000, uds: Optional[str] = None):
+    """Start the API server, on a Unix domain socket instead of TCP if uds is given."""
+    import uvicorn
+    if uds:
+        logger.info(f"Starting API server on unix socket {uds}")
+        uvicorn.run(app, uds=uds)
+    else:
+        logger.info(f"Starting API server at http://{host}:{port}")
+        uvicorn.run(app, host=host, port=port)
 
 if __name__ == "__main__":
     start_server() 
\ No newline at end of file
@@ -0,0 +1,52 @@
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def choose_rates(steady_state_ms: float, target_utilization: float = 0.5, max_fps: float = 30.0,
+                 max_publish_interval: float = 1.0) -> dict:
+    """Pick the detection rate and publish interval from measured latency.
+
+    Detection runs at most at max_fps and is slowed down so inference keeps
+    the device busy for no more than target_utilization of the time. Counts
+    are published every few detections, never less often than
+    max_publish_interval.
+
+    Args:
+        steady_state_ms: Steady-state latency of one detection in milliseconds
+        target_utilization: Fraction of wall time detection may use (default: 0.5)
+        max_fps: Upper bound on the detection rate (default: 30)
+        max_publish_interval: Upper bound on the publish interval in seconds (default: 1.0)
+
+    Returns:
+        Dict with detection_fps, detection_interval and publish_interval (seconds)
+    """
+    latency = max(steady_state_ms, 0.1) / 1000.0
+    detection_interval = max(latency / target_utilization, 1.0 / max_fps)
+    publish_interval = min(max(detection_interval * 3, 0.1), max_publish_interval)
+    return {
+        "detection_fps": round(1.0 / detection_interval, 2),
+        "detection_interval": round(detection_interval, 4),
+        "publish_interval": round(publish_interval, 4),
+    }
+
+def calibrate(detector, iterations: int = 20, target_utilization: float = 0.5, max_fps: float = 30.0) -> dict:
+    """Warm up the detector and derive rates from its steady-state latency.
+
+    Args:
+        detector: Face detector instance
+        iterations: Number of synthetic warm-up frames (default: 20)
+        target_utilization: Fraction of wall time detection may use (default: 0.5)
+        max_fps: Upper bound on the detection rate (default: 30)
+
+    Returns:
+        Warm-up measurements merged with the chosen rates
+    """
+    measurements = detector.warm_up(iterations)
+    calibration = dict(measurements, **choose_rates(measurements["steady_state_ms"], target_utilization, max_fps))
+    logger.info(
+        f"Calibration: first run {calibration['first_run_ms']:.1f} ms, "
+        f"steady state {calibration['steady_state_ms']:.1f} ms (p95 {calibration['p95_ms']:.1f} ms) -> "
+        f"detecting at {calibration['detection_fps']} fps, publishing every {calibration['publish_interval']} s"
+    )
+    return calibration
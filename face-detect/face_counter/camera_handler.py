@@ -2,15 +2,24 @@ import cv2
 import time
 import logging
 import requests
-from typing import Optional
+import uuid
+from typing import Callable, Optional
 from datetime import datetime
+from .demand import LOW, PAUSED
 from .detector import FaceDetector
+from .frame_source import CameraSource
+from .metrics import CAPTURE_SECONDS, PUBLISH_SECONDS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Extra frames read after a low-power wait, so the detected frame is current
+LOW_POWER_DRAIN_FRAMES = 3
+
 class CameraHandler:
-    def __init__(self, detector, camera_id: int = 0, api_endpoint: Optional[str] = "http://127.0.0.1:8000/face-count", publish_interval: float = 1.0):
+    def __init__(self, detector, camera_id: int = 0, api_endpoint: Optional[str] = "http://127.0.0.1:8000/face-count", publish_interval: float = 1.0,
+                 frame_source=None, display: bool = True, on_count: Optional[Callable[[dict], None]] = None,
+                 detection_interval: Optional[float] = None, demand=None, low_power_interval: float = 1.0):
         """Initialize camera handler.
         
         Args:
@@ -18,14 +27,37 @@ class CameraHandler:
             camera_id: Camera device ID (default: 0)
             api_endpoint: API endpoint for publishing face count (default: local server)
             publish_interval: Interval in seconds between API updates (default: 1.0)
+            frame_source: Frame source to read from instead of the live camera,
+                e.g. a replayed video or image sequence (default: None)
+            display: Show the annotated video window (default: True)
+            on_count: Called with a sample dict (count, camera_id, trace_id,
+                captured_at, changed_at) for every processed frame, for
+                in-process consumers that don't go through the API (default: None)
+            detection_interval: Minimum seconds between detections; frames read
+                in between are only displayed (default: None, detect every frame)
+            demand: CaptureDemand set by the consumer; paused releases the live
+                camera until resumed, low detects once per low_power_interval
+                without reading frames in between (default: None, always full)
+            low_power_interval: Seconds between detections under a low demand (default: 1.0)
         """
         self.detector = detector
         self.camera_id = camera_id
         self.api_endpoint = api_endpoint
         self.publish_interval = publish_interval
+        self.frame_source = frame_source
+        self.display = display
+        self.on_count = on_count
+        self.detection_interval = detection_interval
+        self.demand = demand
+        self.low_power_interval = low_power_interval
+        self.demand_mode = None  # Last demand applied, for logging changes
+        self.last_detection_time = 0
         self.last_publish_time = 0
         self.cap = None
         self.last_count = 0  # Track last count for console updates
+        self.frames_processed = 0
+        self.running = False  # Cleared from another thread to end the capture loop
+        self.count_changed_at = time.time()  # Capture time of the first frame showing last_count
         
         if self.api_endpoint:
             logger.info(f"API endpoint configured: {self.api_endpoint}")
@@ -35,29 +67,67 @@ class CameraHandler:
     def start(self):
         """Start video capture and face detection."""
         try:
-            self.cap = cv2.VideoCapture(self.camera_id)
+            self.cap = self.frame_source or CameraSource(self.camera_id)
             if not self.cap.isOpened():
                 raise RuntimeError(f"Failed to open camera {self.camera_id}")
             
-            logger.info(f"Started video capture from camera {self.camera_id}")
+            logger.info(f"Started video capture from {type(self.cap).__name__} (camera {self.camera_id})")
             print("\nFace Counter Started!")
             print("Press 'q' to quit\n")
             
-            while True:
-                ret, frame = self.cap.read()
+            self.running = True
+            while self.running:
+                if self.demand is not None and not self._follow_demand():
+                    continue
+                with CAPTURE_SECONDS.time():
+                    ret, frame = self.cap.read()
+                    if self.demand_mode == LOW and self.frame_source is None:
+                        # Frames queued by the driver while waiting are stale
+                        for _ in range(LOW_POWER_DRAIN_FRAMES):
+                            ret, frame = self.cap.read()
+                captured_at = time.time()
                 if not ret:
-                    logger.error("Failed to read frame from camera")
+                    if self.frame_source is not None:
+                        logger.info("End of frame source reached")
+                    else:
+                        logger.error("Failed to read frame from camera")
                     break
                 
-                # Detect faces
-                face_count = self.detector.count_faces(frame)
+                # Detect faces, at most once per detection_interval
+                if self.detection_interval and (captured_at - self.last_detection_time) < self.detection_interval:
+                    face_count = self.last_count
+                else:
+                    self.last_detection_time = captured_at
+                    face_count = self.detector.count_faces(frame)
+                    self.frames_processed += 1
+                    
+                    # Print to console if count changed
+                    if face_count != self.last_count:
+                        print(f"\rFaces detected: {face_count}", end="", flush=True)
+                        self.last_count = face_count
+                        self.count_changed_at = captured_at
+                    
+                    if self.on_count is not None:
+                        self.on_count({
+                            "count": face_count,
+                            "camera_id": self.camera_id,
+                            "trace_id": uuid.uuid4().hex,
+                            "captured_at": captured_at,
+                            "changed_at": self.count_changed_at
+                        })
+                
+                # Publish count to API if endpoint is configured and interval has elapsed
+                current_time = time.time()
+                if self.api_endpoint and (current_time - self.last_publish_time) >= self.publish_interval:
+                    self._publish_count(face_count, captured_at)
+                    self.last_publish_time = current_time
                 
-                # Print to console if count changed
-                if face_count != self.last_count:
-                    print(f"\rFaces detected: {face_count}", end="", flush=True)
-                    self.last_count = face_count
+                if not self.display:
+                    continue
                 
-                # Draw face count on frame
+                # Draw face count on frame (replayed frames may be read-only)
+                if not frame.flags.writeable:
+                    frame = frame.copy()
                 cv2.putText(
                     frame,
                     f"Faces: {face_count}",
@@ -71,12 +141,6 @@ class CameraHandler:
                 # Display frame
                 cv2.imshow("Face Counter", frame)
                 
-                # Publish count to API if endpoint is configured and interval has elapsed
-                current_time = time.time()
-                if self.api_endpoint and (current_time - self.last_publish_time) >= self.publish_interval:
-                    self._publish_count(face_count)
-                    self.last_publish_time = current_time
-                
                 # Break loop on 'q' key press
                 if cv2.waitKey(1) & 0xFF == ord('q'):
                     print("\nStopping face counter...")
@@ -88,24 +152,63 @@ class CameraHandler:
         finally:
             self.stop()
     
+    def _follow_demand(self) -> bool:
+        """Apply the current capture demand; False when no frame should be read this iteration."""
+        mode = self.demand.mode
+        if mode != self.demand_mode:
+            logger.info(f"Capture demand: {mode}")
+            self.demand_mode = mode
+        
+        if mode == PAUSED:
+            # Only the live camera is released, a replayed source just waits
+            if self.frame_source is None and self.cap is not None:
+                self.cap.release()
+                self.cap = None
+            self.demand.wait(1.0)
+            return False
+        
+        if self.cap is None:
+            self.cap = CameraSource(self.camera_id)
+            if not self.cap.isOpened():
+                raise RuntimeError(f"Failed to reopen camera {self.camera_id}")
+        
+        if mode == LOW:
+            remaining = self.last_detection_time + self.low_power_interval - time.time()
+            if remaining > 0:
+                self.demand.wait(remaining)
+                return False
+        return True
+    
     def stop(self):
         """Stop video capture and cleanup."""
+        self.running = False
         if self.cap is not None:
             self.cap.release()
-        cv2.destroyAllWindows()
+        if self.display:
+            cv2.destroyAllWindows()
         logger.info("Stopped video capture")
         print("\nFace Counter Stopped")
     
-    def _publish_count(self, count: int):
-        """Publish face count to API endpoint."""
+    def _publish_count(self, count: int, captured_at: Optional[float] = None):
+        """Publish face count to API endpoint.
+        
+        Each update carries a new trace ID together with the capture time of the
+        frame and of the first frame that showed this count, so downstream
+        consumers can measure end-to-end decision latency.
+        """
         if not self.api_endpoint:
             return
             
+        params = {
+            "count": count,
+            "camera_id": self.camera_id,
+            "trace_id": uuid.uuid4().hex,
+            "captured_at": captured_at if captured_at is not None else time.time(),
+            "changed_at": self.count_changed_at
+        }
         try:
-            response = requests.post(
-                self.api_endpoint,
-                params={"count": count, "camera_id": self.camera_id}
-            )
+            with PUBLISH_SECONDS.time():
+                response = requests.post(self.api_endpoint, params=params)
             response.raise_for_status()
             logger.debug(f"Published face count: {count}")
         except requests.exceptions.RequestException as e:
@@ -0,0 +1,73 @@
+"""
+Latest face count per camera, safe to read from any thread without locking.
+
+Every update builds a new immutable CountRecord and publishes it by swapping a
+single reference, so a reader always sees one complete record and never a mix
+of old and new fields. The per-camera map is copy-on-write for the same
+reason. Writers serialize on a lock among themselves; readers never take it.
+"""
+import threading
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional
+
+class CountRecord(NamedTuple):
+    """One face count update together with its tracing fields."""
+    count: int
+    timestamp: datetime
+    camera_id: Optional[int] = None
+    trace_id: Optional[str] = None
+    captured_at: Optional[float] = None
+    changed_at: Optional[float] = None
+
+class CountStore:
+    """Atomic snapshot store for the latest count overall and per camera."""
+
+    def __init__(self, max_age: Optional[float] = None):
+        """
+        Args:
+            max_age: Seconds after which a camera that stopped reporting is left
+                out of busiest(), cameras() and records() (default: never)
+        """
+        self.max_age = max_age
+        self._latest = CountRecord(count=0, timestamp=datetime.now())
+        self._by_camera: Dict[int, CountRecord] = {}
+        self._write_lock = threading.Lock()
+
+    def update(self, record: CountRecord):
+        """Publish a new record as the latest one (and its camera's latest)."""
+        with self._write_lock:
+            if record.camera_id is not None:
+                by_camera = dict(self._by_camera)
+                by_camera[record.camera_id] = record
+                self._by_camera = by_camera
+            self._latest = record
+
+    def latest(self, camera_id: Optional[int] = None) -> Optional[CountRecord]:
+        """Return the newest record, or the newest of one camera (None if it never reported)."""
+        if camera_id is None:
+            return self._latest
+        return self._by_camera.get(camera_id)
+
+    def _live(self) -> Mapping[int, CountRecord]:
+        by_camera = self._by_camera
+        if self.max_age is None:
+            return by_camera
+        cutoff = datetime.now() - timedelta(seconds=self.max_age)
+        return {camera_id: record for camera_id, record in by_camera.items() if record.timestamp >= cutoff}
+
+    def cameras(self) -> Mapping[int, CountRecord]:
+        """Return a consistent, read-only snapshot of the newest record per live camera."""
+        return MappingProxyType(self._live())
+
+    def busiest(self) -> Optional[CountRecord]:
+        """Return the record of the live camera with the highest count (None if no camera is live)."""
+        by_camera = self._live()
+        if not by_camera:
+            return None
+        return max(by_camera.values(), key=lambda record: record.count)
+
+    def records(self) -> List[CountRecord]:
+        """Return the newest record of every live camera, ordered by camera ID."""
+        by_camera = self._live()
+        return [by_camera[camera_id] for camera_id in sorted(by_camera)]
@@ -0,0 +1,67 @@
+"""
+Capture demand: how hard the camera loop should work, set by its consumer.
+
+    full    capture and detect at the configured rate
+    low     detect once per low-power interval, without reading frames in between
+    paused  release the camera and stop detecting
+
+A demand other than full is a lease: it expires after its TTL and the loop
+goes back to full, so a consumer that exits without resuming cannot leave
+the camera paused.
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+FULL = "full"
+LOW = "low"
+PAUSED = "paused"
+MODES = (FULL, LOW, PAUSED)
+
+class CaptureDemand:
+    """Thread-safe demand shared by the API server and the camera loop."""
+
+    def __init__(self, default_ttl: float = 30.0):
+        """
+        Args:
+            default_ttl: Seconds a low or paused demand lasts unless renewed (default: 30)
+        """
+        self.default_ttl = default_ttl
+        self._mode = FULL
+        self._expires_at: Optional[float] = None
+        self._changed = threading.Condition()
+
+    def set(self, mode: str, ttl: Optional[float] = None):
+        """Set the demand, waking a camera loop waiting on it.
+
+        Raises:
+            ValueError: For a mode not in MODES
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown capture demand '{mode}', expected one of {', '.join(MODES)}")
+        with self._changed:
+            self._mode = mode
+            self._expires_at = None if mode == FULL else time.time() + (ttl or self.default_ttl)
+            self._changed.notify_all()
+
+    @property
+    def mode(self) -> str:
+        """Current demand, full once a lease has expired."""
+        with self._changed:
+            if self._expires_at is not None and time.time() >= self._expires_at:
+                self._mode, self._expires_at = FULL, None
+            return self._mode
+
+    def state(self) -> Dict:
+        mode = self.mode
+        with self._changed:
+            expires_in = None if self._expires_at is None else max(0.0, self._expires_at - time.time())
+        return {"mode": mode, "expires_in": expires_in}
+
+    def wait(self, timeout: float) -> str:
+        """Sleep up to timeout seconds, returning early when the demand changes. Returns the demand."""
+        with self._changed:
+            if self._expires_at is not None:
+                timeout = min(timeout, max(0.0, self._expires_at - time.time()))
+            self._changed.wait(timeout)
+        return self.mode
@@ -0,0 +1,238 @@
+import abc
+import os
+import cv2
+import time
+import logging
+from typing import List, Optional, Tuple, Union
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PACING_MODES = ("realtime", "fast", "fixed")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+RAW_EXTENSIONS = (".raw", ".bin", ".npy")
+
+class FrameSource(abc.ABC):
+    """Base class for anything that yields BGR frames.
+
+    Follows the cv2.VideoCapture interface (isOpened/read/release) so sources
+    can be used wherever a capture object is expected.
+    """
+
+    def __init__(self, pacing: str = "realtime", fps: Optional[float] = None, loop: bool = False):
+        """Initialize pacing for the source.
+
+        Args:
+            pacing: "realtime" (native source rate), "fast" (as fast as possible)
+                or "fixed" (the given fps)
+            fps: Frame rate for "fixed" pacing, or override of the native rate
+            loop: Restart from the first frame at end of stream
+        """
+        if pacing not in PACING_MODES:
+            raise ValueError(f"Unknown pacing mode: {pacing} (expected one of {PACING_MODES})")
+        if pacing == "fixed" and not fps:
+            raise ValueError("Fixed pacing requires an fps value")
+
+        self.pacing = pacing
+        self.fps = fps
+        self.loop = loop
+        self.frames_read = 0
+        self._next_frame_time: Optional[float] = None
+
+    @property
+    def native_fps(self) -> float:
+        """Frame rate the source was recorded at."""
+        return 30.0
+
+    @abc.abstractmethod
+    def isOpened(self) -> bool:
+        """Whether the source can deliver frames."""
+
+    @abc.abstractmethod
+    def _read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Next frame without pacing, (False, None) at end of stream."""
+
+    @abc.abstractmethod
+    def _rewind(self):
+        """Go back to the first frame, for looping."""
+
+    def release(self):
+        pass
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Read the next frame, waiting as required by the pacing mode."""
+        ret, frame = self._read_frame()
+        if not ret and self.loop and self.frames_read > 0:
+            self._rewind()
+            ret, frame = self._read_frame()
+        if not ret:
+            return False, None
+
+        self._wait_for_next_frame()
+        self.frames_read += 1
+        return True, frame
+
+    def _wait_for_next_frame(self):
+        if self.pacing == "fast":
+            return
+
+        fps = self.fps if self.fps else self.native_fps
+        now = time.perf_counter()
+        if self._next_frame_time is None:
+            self._next_frame_time = now
+        delay = self._next_frame_time - now
+        if delay > 0:
+            time.sleep(delay)
+        # Don't try to catch up after a stall, just keep the interval going forward
+        self._next_frame_time = max(self._next_frame_time, now) + 1.0 / fps
+
+class CameraSource(FrameSource):
+    """Live camera capture, paced by the camera itself."""
+
+    def __init__(self, camera_id: int = 0):
+        super().__init__(pacing="fast")
+        self.camera_id = camera_id
+        self.cap = cv2.VideoCapture(camera_id)
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def _read_frame(self):
+        return self.cap.read()
+
+    def _rewind(self):
+        pass  # A live stream has no first frame to go back to
+
+    def release(self):
+        self.cap.release()
+
+class VideoFileSource(FrameSource):
+    """Frames decoded from a video file."""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+
+    @property
+    def native_fps(self) -> float:
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        return fps if fps and fps > 0 else 30.0
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def _read_frame(self):
+        return self.cap.read()
+
+    def _rewind(self):
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def release(self):
+        self.cap.release()
+
+class ImageDirectorySource(FrameSource):
+    """Frames loaded from the image files of a directory, in sorted name order."""
+
+    def __init__(self, path: str, preload: bool = True, **kwargs):
+        """Initialize the image sequence.
+
+        Args:
+            path: Directory containing the images
+            preload: Decode every image up front so disk and decode time
+                don't show up in throughput measurements (default: True)
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.files: List[str] = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.frames: Optional[List[np.ndarray]] = None
+        if preload:
+            self.frames = [cv2.imread(file) for file in self.files]
+        self.position = 0
+
+    def isOpened(self) -> bool:
+        return len(self.files) > 0
+
+    def _read_frame(self):
+        if self.position >= len(self.files):
+            return False, None
+        if self.frames is not None:
+            frame = self.frames[self.position]
+        else:
+            frame = cv2.imread(self.files[self.position])
+        self.position += 1
+        return frame is not None, frame
+
+    def _rewind(self):
+        self.position = 0
+
+class RawFrameDumpSource(FrameSource):
+    """Frames from a memory-mapped dump of raw uint8 BGR frames.
+
+    Accepts either a .npy array of shape (N, H, W, 3) or a headerless raw file
+    of concatenated frames, in which case the frame size must be given.
+    """
+
+    def __init__(self, path: str, frame_shape: Optional[Tuple[int, int]] = None, **kwargs):
+        """Initialize the memory-mapped dump.
+
+        Args:
+            path: Path to the .npy or raw dump file
+            frame_shape: (height, width) of each frame, required for raw files
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        if path.endswith(".npy"):
+            self.frames = np.load(path, mmap_mode="r")
+        else:
+            if frame_shape is None:
+                raise ValueError("frame_shape is required for raw frame dumps")
+            height, width = frame_shape
+            raw = np.memmap(path, dtype=np.uint8, mode="r")
+            frame_size = height * width * 3
+            self.frames = raw[:len(raw) // frame_size * frame_size].reshape(-1, height, width, 3)
+        self.position = 0
+
+    def isOpened(self) -> bool:
+        return len(self.frames) > 0
+
+    def _read_frame(self):
+        if self.position >= len(self.frames):
+            return False, None
+        frame = self.frames[self.position]
+        self.position += 1
+        return True, frame
+
+    def _rewind(self):
+        self.position = 0
+
+def open_frame_source(source: Union[int, str], pacing: str = "realtime", fps: Optional[float] = None,
+                      loop: bool = False, frame_shape: Optional[Tuple[int, int]] = None) -> FrameSource:
+    """Open a frame source from a camera ID or a path.
+
+    Args:
+        source: Camera ID, video file, image directory or raw frame dump
+        pacing: Pacing mode for recorded sources (see FrameSource)
+        fps: Frame rate for fixed pacing
+        loop: Restart recorded sources at end of stream
+        frame_shape: (height, width) for headerless raw dumps
+
+    Returns:
+        Frame source ready to read
+    """
+    if isinstance(source, int) or str(source).isdigit():
+        return CameraSource(int(source))
+
+    if os.path.isdir(source):
+        frame_source = ImageDirectorySource(source, pacing=pacing, fps=fps, loop=loop)
+    elif source.lower().endswith(RAW_EXTENSIONS):
+        frame_source = RawFrameDumpSource(source, frame_shape=frame_shape, pacing=pacing, fps=fps, loop=loop)
+    else:
+        frame_source = VideoFileSource(source, pacing=pacing, fps=fps, loop=loop)
+
+    logger.info(f"Opened {type(frame_source).__name__} from {source} (pacing: {pacing})")
+    return frame_source
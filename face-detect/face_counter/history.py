@@ -0,0 +1,141 @@
+"""
+Fixed-size history of face count samples.
+
+Samples live in preallocated numpy arrays used as a ring buffer, so appending
+is O(1) and never allocates. Timestamps are appended in order, which lets the
+windowed queries binary-search the (at most two) contiguous segments instead
+of scanning the whole buffer.
+"""
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# Stored in place of a missing camera_id
+NO_CAMERA = -1
+
+class CountHistory:
+    """Ring buffer of (timestamp, count, camera_id) samples."""
+
+    def __init__(self, capacity: int = 4096):
+        """Initialize an empty history.
+
+        Args:
+            capacity: Number of samples kept; the oldest are overwritten (default: 4096)
+        """
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1")
+        self.capacity = capacity
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._counts = np.zeros(capacity, dtype=np.int64)
+        self._camera_ids = np.full(capacity, NO_CAMERA, dtype=np.int64)
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, count: int, camera_id: Optional[int] = None, timestamp: Optional[float] = None) -> float:
+        """Record one sample, overwriting the oldest when full.
+
+        The default timestamp is taken under the lock, so concurrent writers
+        append in timestamp order; an explicit timestamp older than the newest
+        sample is raised to it, keeping the buffer sorted for the binary searches.
+
+        Args:
+            count: Face count
+            camera_id: Camera that reported the count (default: None)
+            timestamp: Epoch seconds of the sample (default: now)
+
+        Returns:
+            The timestamp stored
+        """
+        with self._lock:
+            index = self._next
+            if timestamp is None:
+                timestamp = time.time()
+            if self._size:
+                timestamp = max(timestamp, float(self._timestamps[index - 1]))
+            self._timestamps[index] = timestamp
+            self._counts[index] = count
+            self._camera_ids[index] = NO_CAMERA if camera_id is None else camera_id
+            self._next = (index + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+        return timestamp
+
+    def _select(self, since: float, camera_id: Optional[int] = None,
+                inclusive: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Copy out the samples newer than since, oldest first."""
+        side = "left" if inclusive else "right"
+        with self._lock:
+            if self._size < self.capacity:
+                segments = [slice(0, self._size)]
+            else:
+                segments = [slice(self._next, self.capacity), slice(0, self._next)]
+            parts = []
+            for segment in segments:
+                timestamps = self._timestamps[segment]
+                start = int(np.searchsorted(timestamps, since, side=side))
+                if start < len(timestamps):
+                    offset = segment.start + start
+                    parts.append(slice(offset, segment.stop))
+            timestamps = np.concatenate([self._timestamps[part] for part in parts]) if parts else np.empty(0)
+            counts = np.concatenate([self._counts[part] for part in parts]) if parts else np.empty(0, dtype=np.int64)
+            camera_ids = (np.concatenate([self._camera_ids[part] for part in parts]) if parts
+                          else np.empty(0, dtype=np.int64))
+
+        if camera_id is not None:
+            mask = camera_ids == camera_id
+            timestamps, counts, camera_ids = timestamps[mask], counts[mask], camera_ids[mask]
+        return timestamps, counts, camera_ids
+
+    def since(self, timestamp: float, camera_id: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Return the samples recorded after timestamp, oldest first.
+
+        Args:
+            timestamp: Epoch seconds; only later samples are returned
+            camera_id: Only return samples of this camera (default: all)
+            limit: Return at most this many of the newest matching samples (default: all)
+        """
+        timestamps, counts, camera_ids = self._select(timestamp, camera_id)
+        if limit is not None:
+            timestamps, counts, camera_ids = timestamps[-limit:], counts[-limit:], camera_ids[-limit:]
+        return [
+            {"timestamp": float(ts), "count": int(count), "camera_id": None if cam == NO_CAMERA else int(cam)}
+            for ts, count, cam in zip(timestamps, counts, camera_ids)
+        ]
+
+    def window(self, window_ms: float, camera_id: Optional[int] = None, now: Optional[float] = None) -> Dict:
+        """Aggregate the samples of the last window_ms milliseconds.
+
+        Returns:
+            Dict with samples, max, min and mean (None when the window is empty)
+        """
+        now = now if now is not None else time.time()
+        _, counts, _ = self._select(now - window_ms / 1000.0, camera_id, inclusive=True)
+        if len(counts) == 0:
+            return {"samples": 0, "max": None, "min": None, "mean": None}
+        return {
+            "samples": int(len(counts)),
+            "max": int(counts.max()),
+            "min": int(counts.min()),
+            "mean": float(counts.mean()),
+        }
+
+    def exceeded(self, threshold: int, window_ms: float, camera_id: Optional[int] = None,
+                 now: Optional[float] = None) -> Dict:
+        """Check whether the count went above threshold within the last window_ms milliseconds.
+
+        Returns:
+            Dict with exceeded, first_at (epoch seconds of the first sample above
+            threshold, or None) and max
+        """
+        now = now if now is not None else time.time()
+        timestamps, counts, _ = self._select(now - window_ms / 1000.0, camera_id, inclusive=True)
+        above = np.flatnonzero(counts > threshold)
+        return {
+            "exceeded": bool(len(above)),
+            "first_at": float(timestamps[above[0]]) if len(above) else None,
+            "max": int(counts.max()) if len(counts) else None,
+        }
@@ -0,0 +1,111 @@
+"""
+Lightweight latency histograms with Prometheus text exposition.
+
+Recording a sample is a bisect over a short bucket list plus a few integer
+updates under an uncontended lock, so timers can stay enabled on the hot path.
+"""
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+# Bucket upper bounds in seconds, from 0.5 ms up to 10 s
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+class Histogram:
+    """Fixed-bucket latency histogram."""
+
+    def __init__(self, name: str, description: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        """Record one duration in seconds."""
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+            self._count += 1
+
+    @contextmanager
+    def time(self):
+        """Time the enclosed block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return cumulative bucket counts, sum and count."""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative: List[int] = []
+        running = 0
+        for value in counts:
+            running += value
+            cumulative.append(running)
+        return {"buckets": cumulative, "sum": total, "count": count}
+
+    def render(self) -> str:
+        """Render the histogram in Prometheus text format."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for bound, value in zip(self.buckets, snapshot["buckets"]):
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {value}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {snapshot["buckets"][-1]}')
+        lines.append(f"{self.name}_sum {snapshot['sum']}")
+        lines.append(f"{self.name}_count {snapshot['count']}")
+        return "\n".join(lines)
+
+class MetricsRegistry:
+    """Collection of named histograms."""
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, description: str = "", buckets: Optional[Sequence[float]] = None) -> Histogram:
+        """Get or create a histogram."""
+        full_name = f"{self.prefix}{name}"
+        with self._lock:
+            if full_name not in self._histograms:
+                self._histograms[full_name] = Histogram(full_name, description, buckets or DEFAULT_BUCKETS)
+            return self._histograms[full_name]
+
+    def render(self) -> str:
+        """Render every histogram in Prometheus text format."""
+        with self._lock:
+            histograms = list(self._histograms.values())
+        return "\n".join(histogram.render() for histogram in histograms) + "\n"
+
+# Process-wide registry used by the face counter
+registry = MetricsRegistry(prefix="face_counter_")
+
+CAPTURE_SECONDS = registry.histogram("capture_read_seconds", "Time to read one frame from the source")
+PREPROCESS_SECONDS = registry.histogram("preprocess_seconds", "Time to preprocess a frame or batch")
+INFERENCE_SECONDS = registry.histogram("inference_seconds", "Time spent in the ONNX session run")
+POSTPROCESS_SECONDS = registry.histogram("postprocess_seconds", "Time to turn heatmaps into boxes")
+PUBLISH_SECONDS = registry.histogram("publish_seconds", "Time to publish a count to the API")
@@ -0,0 +1,199 @@
+import cv2
+import time
+import logging
+import threading
+import requests
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from .camera_handler import LOW_POWER_DRAIN_FRAMES
+from .demand import FULL, LOW, PAUSED
+from .metrics import CAPTURE_SECONDS, PUBLISH_SECONDS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class MultiCameraService:
+    def __init__(self, detector, camera_ids: List[int], api_endpoint: Optional[str] = "http://127.0.0.1:8000/face-count",
+                 publish_interval: float = 1.0, capture_factory: Optional[Callable[[int], object]] = None,
+                 demand=None, low_power_interval: float = 1.0):
+        """Initialize a multi-camera face counter with one shared inference worker.
+
+        Each camera gets its own capture thread that keeps only the newest frame.
+        A single worker collects the pending frames from all cameras and runs them
+        through one detector session, batched when the model allows it.
+
+        Args:
+            detector: Face detector instance shared by all cameras
+            camera_ids: Camera device IDs to capture from
+            api_endpoint: API endpoint for publishing face counts (default: local server)
+            publish_interval: Interval in seconds between API updates per camera (default: 1.0)
+            capture_factory: Callable returning a capture object for a camera ID
+                (default: cv2.VideoCapture)
+            demand: CaptureDemand set by the consumer, applied to every camera;
+                paused releases the cameras until resumed, low reads one frame
+                per camera per low_power_interval
+            low_power_interval: Seconds between frames under a low demand (default: 1.0)
+        """
+        if not camera_ids:
+            raise ValueError("At least one camera ID is required")
+
+        self.detector = detector
+        self.camera_ids = list(camera_ids)
+        self.api_endpoint = api_endpoint
+        self.publish_interval = publish_interval
+        self.capture_factory = capture_factory or cv2.VideoCapture
+        self.demand = demand
+        self.low_power_interval = low_power_interval
+
+        self.running = False
+        self._threads: List[threading.Thread] = []
+        self._condition = threading.Condition()
+        self._pending: Dict[int, Tuple[np.ndarray, float]] = {}
+
+        self.counts: Dict[int, int] = {camera_id: 0 for camera_id in self.camera_ids}
+        self.frames_processed: Dict[int, int] = {camera_id: 0 for camera_id in self.camera_ids}
+        self.frames_dropped: Dict[int, int] = {camera_id: 0 for camera_id in self.camera_ids}
+        self.batches_run = 0
+        self._last_publish_time: Dict[int, float] = {camera_id: 0 for camera_id in self.camera_ids}
+        self._count_changed_at: Dict[int, float] = {camera_id: time.time() for camera_id in self.camera_ids}
+
+    def start(self, duration: Optional[float] = None):
+        """Start all capture threads and run the inference worker in the calling thread.
+
+        Args:
+            duration: Optional number of seconds to run before stopping (default: until stopped)
+        """
+        self.running = True
+        for camera_id in self.camera_ids:
+            thread = threading.Thread(
+                target=self._capture_loop,
+                args=(camera_id,),
+                name=f"capture-{camera_id}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        logger.info(f"Started multi-camera face counter for cameras {self.camera_ids} "
+                    f"(batching: {self.detector.supports_batching})")
+
+        deadline = time.time() + duration if duration is not None else None
+        try:
+            while self.running and (deadline is None or time.time() < deadline):
+                self._process_pending(timeout=0.1)
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Stop the worker and all capture threads."""
+        self.running = False
+        with self._condition:
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads.clear()
+        logger.info("Stopped multi-camera face counter")
+
+    def _capture_loop(self, camera_id: int):
+        """Read frames from one camera and hand the newest one to the worker."""
+        cap = self.capture_factory(camera_id)
+        try:
+            if not cap.isOpened():
+                logger.error(f"Failed to open camera {camera_id}")
+                return
+
+            logger.info(f"Started video capture from camera {camera_id}")
+            mode, read_at = FULL, 0.0
+            while self.running:
+                if self.demand is not None:
+                    if self.demand.mode != mode:
+                        mode = self.demand.mode
+                        logger.info(f"Capture demand for camera {camera_id}: {mode}")
+                    if mode == PAUSED:
+                        if cap is not None:
+                            cap.release()
+                            cap = None
+                        self.demand.wait(1.0)
+                        continue
+                    if cap is None:
+                        cap = self.capture_factory(camera_id)
+                        if not cap.isOpened():
+                            logger.error(f"Failed to reopen camera {camera_id}")
+                            return
+                    if mode == LOW and time.time() < read_at + self.low_power_interval:
+                        self.demand.wait(read_at + self.low_power_interval - time.time())
+                        continue
+                with CAPTURE_SECONDS.time():
+                    ret, frame = cap.read()
+                    if mode == LOW:
+                        # Frames queued by the driver while waiting are stale
+                        for _ in range(LOW_POWER_DRAIN_FRAMES):
+                            ret, frame = cap.read()
+                read_at = time.time()
+                if not ret:
+                    logger.error(f"Failed to read frame from camera {camera_id}")
+                    break
+
+                with self._condition:
+                    # Only the newest frame matters, older unprocessed ones are dropped
+                    if camera_id in self._pending:
+                        self.frames_dropped[camera_id] += 1
+                    self._pending[camera_id] = (frame, time.time())
+                    self._condition.notify()
+        finally:
+            if cap is not None:
+                cap.release()
+
+    def _process_pending(self, timeout: float) -> int:
+        """Run inference on all frames currently waiting.
+
+        Args:
+            timeout: Seconds to wait for a frame before returning
+
+        Returns:
+            Number of frames processed
+        """
+        with self._condition:
+            if not self._pending:
+                self._condition.wait(timeout)
+            pending = self._pending
+            self._pending = {}
+
+        if not pending:
+            return 0
+
+        camera_ids = list(pending.keys())
+        frames = [pending[camera_id][0] for camera_id in camera_ids]
+        counts = self.detector.count_faces_batch(frames)
+        self.batches_run += 1
+
+        current_time = time.time()
+        for camera_id, count in zip(camera_ids, counts):
+            captured_at = pending[camera_id][1]
+            if count != self.counts[camera_id]:
+                self._count_changed_at[camera_id] = captured_at
+            self.counts[camera_id] = count
+            self.frames_processed[camera_id] += 1
+            if self.api_endpoint and (current_time - self._last_publish_time[camera_id]) >= self.publish_interval:
+                self._publish_count(camera_id, count, captured_at)
+                self._last_publish_time[camera_id] = current_time
+
+        return len(frames)
+
+    def _publish_count(self, camera_id: int, count: int, captured_at: Optional[float] = None):
+        """Publish the face count of one camera to the API endpoint."""
+        params = {
+            "count": count,
+            "camera_id": camera_id,
+            "trace_id": uuid.uuid4().hex,
+            "captured_at": captured_at if captured_at is not None else time.time(),
+            "changed_at": self._count_changed_at[camera_id]
+        }
+        try:
+            with PUBLISH_SECONDS.time():
+                response = requests.post(self.api_endpoint, params=params)
+            response.raise_for_status()
+            logger.debug(f"Published face count for camera {camera_id}: {count}")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to publish face count for camera {camera_id}: {str(e)}")
@@ -0,0 +1,136 @@
+"""
+Shared-memory channel for the latest face count, for consumers on the same machine.
+
+The camera loop writes into a small shared memory block guarded by a seqlock
+and readers copy it out without any system call or lock:
+
+    offset  size  field
+    0       8     sequence, odd while a write is in progress
+    8       48    record in the face_counter.wire layout
+    56      4     CRC-32 of the record
+    60      4     padding
+
+The writer bumps the sequence to odd, writes the record and its checksum,
+then bumps it to even. A reader retries while the sequence is odd or changed
+during its copy. Python gives no memory barriers, so on weakly ordered CPUs
+(ARM64) the reader also verifies the checksum before accepting a copy.
+"""
+import logging
+import os
+import struct
+import time
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional
+from . import wire
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NAME = "face_counter_count"
+
+_SEQUENCE = struct.Struct("<Q")
+_CHECKSUM = struct.Struct("<I")
+_RECORD_OFFSET = _SEQUENCE.size
+_CHECKSUM_OFFSET = _RECORD_OFFSET + wire.RECORD.size
+SIZE = 64
+
+# Blocks written from this process; the resource tracker keeps one entry per
+# name, so a reader in the same process must leave it to the writer
+_written_names = set()
+
+class SharedCountWriter:
+    """Single writer of the shared count block."""
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        """Create the shared memory block, or reuse one left behind by a previous writer.
+
+        Args:
+            name: Shared memory name readers attach to (default: face_counter_count)
+        """
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=SIZE)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+            _SEQUENCE.pack_into(self._shm.buf, 0, 0)
+        self.name = name
+        self._sequence = 0
+        _written_names.add(name)
+        logger.info(f"Publishing face counts to shared memory '{name}'")
+
+    def write(self, count: int, camera_id: Optional[int] = None, trace_id: Optional[str] = None,
+              captured_at: Optional[float] = None, changed_at: Optional[float] = None,
+              timestamp: Optional[float] = None):
+        """Publish a new count. Not safe for concurrent writers."""
+        record = wire.pack_record(count, timestamp if timestamp is not None else time.time(), camera_id,
+                                  trace_id, captured_at, changed_at)
+        buf = self._shm.buf
+        self._sequence += 1
+        _SEQUENCE.pack_into(buf, 0, self._sequence)
+        buf[_RECORD_OFFSET:_CHECKSUM_OFFSET] = record
+        _CHECKSUM.pack_into(buf, _CHECKSUM_OFFSET, zlib.crc32(record))
+        self._sequence += 1
+        _SEQUENCE.pack_into(buf, 0, self._sequence)
+
+    def write_sample(self, sample: Dict):
+        """Publish a sample dict as passed to CameraHandler's on_count."""
+        self.write(sample["count"], sample.get("camera_id"), sample.get("trace_id"),
+                   sample.get("captured_at"), sample.get("changed_at"))
+
+    def close(self, unlink: bool = True):
+        """Detach, and remove the block unless other writers should take it over."""
+        _written_names.discard(self.name)
+        self._shm.close()
+        if unlink:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+class SharedCountReader:
+    """Lock-free reader of the shared count block."""
+
+    def __init__(self, name: str = DEFAULT_NAME, max_retries: int = 1000):
+        """Attach to an existing block.
+
+        Raises:
+            FileNotFoundError: If no writer has created the block yet
+        """
+        # Readers must not unlink the writer's block when they exit
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13 always tracks attached blocks
+            self._shm = shared_memory.SharedMemory(name=name)
+            if os.name == "posix" and name not in _written_names:
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+        self.name = name
+        self.max_retries = max_retries
+
+    @property
+    def sequence(self) -> int:
+        """Current sequence number; unchanged means no new count was written."""
+        return _SEQUENCE.unpack_from(self._shm.buf, 0)[0]
+
+    def read(self) -> Optional[Dict]:
+        """Return the latest record (same fields as wire.unpack_record), or None if nothing was written yet.
+
+        Raises:
+            RuntimeError: If no consistent copy could be taken within max_retries
+        """
+        buf = self._shm.buf
+        for _ in range(self.max_retries):
+            before = _SEQUENCE.unpack_from(buf, 0)[0]
+            if before & 1:
+                time.sleep(0)  # Let the writer finish
+                continue
+            record = bytes(buf[_RECORD_OFFSET:_CHECKSUM_OFFSET])
+            checksum = _CHECKSUM.unpack_from(buf, _CHECKSUM_OFFSET)[0]
+            if _SEQUENCE.unpack_from(buf, 0)[0] != before:
+                continue
+            if before == 0:
+                return None
+            if zlib.crc32(record) == checksum:
+                return wire.unpack_record(record)
+        raise RuntimeError(f"No consistent read of shared memory '{self.name}' after {self.max_retries} attempts")
+
+    def close(self):
+        self._shm.close()
@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from face_counter.calibration import calibrate, choose_rates
+
+def test_choose_rates_fast_model():
+    """Test that a fast model is capped at max_fps"""
+    rates = choose_rates(5.0, max_fps=30.0)
+
+    assert rates["detection_fps"] == pytest.approx(30.0)
+    assert rates["publish_interval"] == pytest.approx(0.1)
+
+def test_choose_rates_slow_model():
+    """Test that a slow model is throttled to the target utilization"""
+    rates = choose_rates(100.0, target_utilization=0.5)
+
+    assert rates["detection_interval"] == pytest.approx(0.2)
+    assert rates["detection_fps"] == pytest.approx(5.0)
+    assert rates["publish_interval"] == pytest.approx(0.6)
+
+def test_choose_rates_publish_interval_capped():
+    """Test that very slow models still publish at least once per interval"""
+    rates = choose_rates(1000.0)
+
+    assert rates["publish_interval"] == pytest.approx(1.0)
+
+def test_calibrate_uses_warm_up():
+    """Test that calibration merges warm-up measurements and chosen rates"""
+    detector = Mock()
+    detector.warm_up.return_value = {"iterations": 10, "first_run_ms": 400.0, "steady_state_ms": 50.0, "p95_ms": 60.0}
+
+    calibration = calibrate(detector, iterations=10)
+
+    detector.warm_up.assert_called_once_with(10)
+    assert calibration["first_run_ms"] == 400.0
+    assert calibration["detection_fps"] == pytest.approx(10.0)
+
+def test_health_reports_warm_up():
+    """Test that /health is 503 until a calibration is set"""
+    from fastapi.testclient import TestClient
+    from face_counter import api_server
+
+    client = TestClient(api_server.app)
+    saved = dict(api_server.service_state)
+    try:
+        api_server.set_warming_up()
+        assert client.get("/health").status_code == 503
+
+        api_server.set_calibration({"detection_fps": 10.0})
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.json()["calibration"] == {"detection_fps": 10.0}
+        assert client.get("/calibration").json() == {"detection_fps": 10.0}
+    finally:
+        api_server.service_state.update(saved)
@@ -0,0 +1,124 @@
+import threading
+import time
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from face_counter.count_store import CountRecord, CountStore
+
+def _record(value: int, camera_id: int) -> CountRecord:
+    # Every field is derived from value, so a torn read shows up as a mismatch
+    return CountRecord(value, datetime.fromtimestamp(value), camera_id, str(value), float(value), float(value))
+
+def _consistent(record: CountRecord) -> bool:
+    return (record.trace_id == str(record.count) and record.captured_at == record.count
+            and record.changed_at == record.count and record.timestamp == datetime.fromtimestamp(record.count))
+
+def test_latest_and_per_camera():
+    """Test that updates are visible overall and per camera"""
+    store = CountStore()
+    store.update(_record(3, 0))
+    store.update(_record(1, 1))
+
+    assert store.latest().count == 1
+    assert store.latest(0).count == 3
+    assert store.latest(2) is None
+    assert store.busiest().count == 3
+    assert store.busiest().timestamp == datetime.fromtimestamp(3)
+    assert store.busiest().camera_id == 0
+    assert [record.camera_id for record in store.records()] == [0, 1]
+
+def test_busiest_keeps_its_own_timestamp():
+    """Test that the busiest camera's record is returned with its own update time"""
+    store = CountStore()
+    store.update(_record(5, 0))
+    store.update(_record(6, 1)._replace(count=2))
+
+    busiest = store.busiest()
+
+    assert busiest.camera_id == 0
+    assert busiest.timestamp == datetime.fromtimestamp(5)
+
+def test_silent_cameras_age_out():
+    """Test that a camera that stopped reporting is left out after max_age"""
+    store = CountStore(max_age=60.0)
+    now = datetime.now()
+    store.update(CountRecord(4, now - timedelta(seconds=120), camera_id=0))
+    store.update(CountRecord(1, now, camera_id=1))
+
+    assert store.busiest().camera_id == 1
+    assert list(store.cameras()) == [1]
+    assert [record.camera_id for record in store.records()] == [1]
+    assert store.latest(0).count == 4
+
+def test_concurrent_pollers_never_see_torn_records():
+    """Stress test: many readers polling while several writers update"""
+    store = CountStore()
+    store.update(_record(0, 0))
+    stop = threading.Event()
+    errors = []
+    reads = [0]
+
+    def writer(camera_id: int):
+        value = camera_id
+        while not stop.is_set():
+            store.update(_record(value, camera_id))
+            value += 4
+
+    def poller():
+        while not stop.is_set():
+            latest = store.latest()
+            if not _consistent(latest):
+                errors.append(latest)
+            for camera_id, record in store.cameras().items():
+                if record.camera_id != camera_id or not _consistent(record):
+                    errors.append(record)
+            reads[0] += 1
+
+    threads = [threading.Thread(target=writer, args=(camera_id,)) for camera_id in range(4)]
+    threads += [threading.Thread(target=poller) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert reads[0] > 0
+    assert sorted(store.cameras()) == [0, 1, 2, 3]
+
+def test_concurrent_http_pollers():
+    """Test that GET /face-count stays consistent while counts are posted"""
+    from fastapi.testclient import TestClient
+    from face_counter import api_server
+
+    client = TestClient(api_server.app)
+    stop = threading.Event()
+    errors = []
+
+    def writer():
+        value = 0
+        while not stop.is_set():
+            api_server.record_face_count(value, None, str(value), float(value), float(value))
+            value += 1
+
+    def poller():
+        for _ in range(50):
+            data = client.get("/face-count").json()
+            if data["trace_id"] is not None and (data["trace_id"] != str(data["count"]) or data["captured_at"] != data["count"]):
+                errors.append(data)
+
+    threads = [threading.Thread(target=poller) for _ in range(8)]
+    writer_thread = threading.Thread(target=writer)
+    writer_thread.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stop.set()
+    writer_thread.join()
+
+    assert not errors
@@ -0,0 +1,66 @@
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from face_counter.demand import CaptureDemand, FULL, LOW, PAUSED
+
+def test_demand_defaults_to_full():
+    """Test that a new demand asks for full-rate capture without a lease"""
+    demand = CaptureDemand()
+
+    assert demand.mode == FULL
+    assert demand.state() == {"mode": FULL, "expires_in": None}
+
+def test_demand_lease_expires_to_full():
+    """Test that low and paused demands go back to full after their TTL"""
+    demand = CaptureDemand()
+
+    demand.set(PAUSED, ttl=0.05)
+    assert demand.mode == PAUSED
+    assert 0 < demand.state()["expires_in"] <= 0.05
+
+    time.sleep(0.06)
+    assert demand.mode == FULL
+
+def test_demand_uses_default_ttl():
+    """Test that a demand set without a TTL lasts default_ttl"""
+    demand = CaptureDemand(default_ttl=30.0)
+
+    demand.set(LOW)
+
+    assert demand.state()["expires_in"] == pytest.approx(30.0, abs=0.5)
+
+def test_demand_rejects_unknown_mode():
+    """Test that an unknown mode raises ValueError and keeps the demand"""
+    demand = CaptureDemand()
+
+    with pytest.raises(ValueError):
+        demand.set("off")
+    assert demand.mode == FULL
+
+def test_demand_wait_returns_on_change():
+    """Test that wait returns as soon as the demand changes"""
+    demand = CaptureDemand()
+    demand.set(PAUSED, ttl=10.0)
+    threading.Timer(0.05, demand.set, args=(FULL,)).start()
+
+    start = time.monotonic()
+    mode = demand.wait(5.0)
+
+    assert mode == FULL
+    assert time.monotonic() - start < 1.0
+
+def test_demand_wait_ends_at_expiry():
+    """Test that wait does not sleep past the end of the lease"""
+    demand = CaptureDemand()
+    demand.set(LOW, ttl=0.05)
+
+    start = time.monotonic()
+    mode = demand.wait(5.0)
+
+    assert mode == FULL
+    assert time.monotonic() - start < 1.0
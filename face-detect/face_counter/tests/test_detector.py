@@ -112,4 +112,56 @@ def test_detect_faces_invalid_input(detector):
     # Test with too small image
     small_image = np.zeros((10, 10))
     result = detector.detect_faces(small_image)
-    assert result == []  # Should return empty list for invalid image 
\ No newline at end of file
+    assert result == []  # Should return empty list for invalid image 
+
+def test_detect_faces_batch_sequential(detector, mock_session):
+    """Test that a fixed batch-1 model runs frames back to back"""
+    frames = [np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(3)]
+    mock_heatmap = np.zeros((1, 1, 60, 80))
+    mock_heatmap[0, 0, 30, 40] = 1.0
+    mock_session.run.return_value = [mock_heatmap]
+
+    counts = detector.count_faces_batch(frames)
+
+    assert counts == [1, 1, 1]
+    assert mock_session.run.call_count == 3
+
+def test_detect_faces_batch_dynamic(detector, mock_session):
+    """Test that a dynamic batch model runs all frames in one call"""
+    detector.input_shape = ['batch', 1, 480, 640]
+    frames = [np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(3)]
+    mock_heatmap = np.zeros((3, 1, 60, 80))
+    mock_heatmap[0, 0, 30, 40] = 1.0
+    mock_heatmap[2, 0, 15, 20] = 1.0
+    mock_heatmap[2, 0, 45, 60] = 0.9
+    mock_session.run.return_value = [mock_heatmap]
+
+    counts = detector.count_faces_batch(frames)
+
+    assert counts == [1, 0, 2]
+    mock_session.run.assert_called_once()
+    assert mock_session.run.call_args[0][1]['input'].shape == (3, 1, 480, 640)
+
+def test_model_cache_path(tmp_path, mock_session):
+    """Test that the cache key follows the model file"""
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"model")
+    with patch('onnxruntime.InferenceSession', return_value=mock_session):
+        detector = FaceDetector(str(model_path), providers=['CPUExecutionProvider'], cache_dir=str(tmp_path / "cache"))
+
+    first = detector._cache_path()
+    assert first.startswith(str(tmp_path / "cache"))
+    assert detector._cache_path() == first
+
+    model_path.write_bytes(b"new model contents")
+    assert detector._cache_path() != first
+
+def test_warm_up(detector, mock_session):
+    """Test that warm-up runs the pipeline and reports latency"""
+    mock_session.run.return_value = [np.zeros((1, 1, 60, 80))]
+
+    result = detector.warm_up(iterations=6)
+
+    assert mock_session.run.call_count == 6
+    assert result["iterations"] == 6
+    assert result["steady_state_ms"] <= result["p95_ms"]
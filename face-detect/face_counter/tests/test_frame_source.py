@@ -0,0 +1,105 @@
+import pytest
+import numpy as np
+import cv2
+import time
+import sys
+import os
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from face_counter.frame_source import (
+    open_frame_source, ImageDirectorySource, RawFrameDumpSource, FrameSource
+)
+
+@pytest.fixture
+def frames():
+    """Create a few small distinct frames"""
+    return np.stack([np.full((24, 32, 3), i, dtype=np.uint8) for i in range(4)])
+
+def read_all(source):
+    result = []
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            return result
+        result.append(frame)
+
+def test_image_directory_source(tmp_path, frames):
+    """Test that images are read in sorted name order"""
+    for i, frame in enumerate(frames):
+        cv2.imwrite(str(tmp_path / f"frame_{i:03d}.png"), frame)
+
+    source = open_frame_source(str(tmp_path), pacing="fast")
+
+    assert isinstance(source, ImageDirectorySource)
+    read = read_all(source)
+    assert [int(frame[0, 0, 0]) for frame in read] == [0, 1, 2, 3]
+
+def test_npy_dump_source(tmp_path, frames):
+    """Test replay of a memory-mapped .npy dump"""
+    path = str(tmp_path / "frames.npy")
+    np.save(path, frames)
+
+    source = open_frame_source(path, pacing="fast")
+
+    assert isinstance(source, RawFrameDumpSource)
+    assert len(read_all(source)) == 4
+
+def test_raw_dump_requires_shape(tmp_path, frames):
+    """Test that a headerless dump needs the frame shape"""
+    path = str(tmp_path / "frames.raw")
+    frames.tofile(path)
+
+    with pytest.raises(ValueError):
+        open_frame_source(path, pacing="fast")
+
+    source = open_frame_source(path, pacing="fast", frame_shape=(24, 32))
+    read = read_all(source)
+    assert len(read) == 4
+    assert read[2].shape == (24, 32, 3)
+
+def test_loop_restarts_stream(tmp_path, frames):
+    """Test that looping sources keep producing frames"""
+    path = str(tmp_path / "frames.npy")
+    np.save(path, frames)
+
+    source = open_frame_source(path, pacing="fast", loop=True)
+
+    values = [int(source.read()[1][0, 0, 0]) for _ in range(6)]
+    assert values == [0, 1, 2, 3, 0, 1]
+
+def test_fixed_pacing(tmp_path, frames):
+    """Test that fixed pacing spaces frames by 1/fps"""
+    path = str(tmp_path / "frames.npy")
+    np.save(path, frames)
+
+    source = open_frame_source(path, pacing="fixed", fps=50)
+    start = time.perf_counter()
+    read_all(source)
+    elapsed = time.perf_counter() - start
+
+    # Four frames at 50 fps need at least three 20 ms gaps
+    assert elapsed >= 0.055
+
+def test_invalid_pacing(tmp_path):
+    """Test pacing validation"""
+    with pytest.raises(ValueError):
+        ImageDirectorySource(str(tmp_path), pacing="sometimes")
+    with pytest.raises(ValueError):
+        ImageDirectorySource(str(tmp_path), pacing="fixed")
+
+def test_frame_source_is_abstract():
+    """Test that a source must implement isOpened, _read_frame and _rewind"""
+    with pytest.raises(TypeError):
+        FrameSource()
+
+def test_frame_shape_argument():
+    """Test that --frame-shape accepts HxW and HxWx3 only"""
+    import argparse
+    from face_counter.__main__ import frame_shape
+
+    assert frame_shape("480x640x3") == (480, 640)
+    assert frame_shape("24X32") == (24, 32)
+    for value in ("480x640x4", "480", "0x640", "ax640"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            frame_shape(value)
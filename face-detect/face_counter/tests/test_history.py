@@ -0,0 +1,98 @@
+import pytest
+import sys
+import os
+import threading
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from face_counter.history import CountHistory
+
+def test_appends_stay_in_timestamp_order():
+    """Test that concurrent writers and late explicit timestamps keep the buffer sorted"""
+    history = CountHistory(capacity=64)
+    history.append(1, timestamp=100.0)
+    assert history.append(2, timestamp=99.0) == 100.0
+
+    threads = [threading.Thread(target=lambda: [history.append(3) for _ in range(200)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    timestamps = [sample["timestamp"] for sample in history.since(0.0)]
+    assert len(timestamps) == 64
+    assert timestamps == sorted(timestamps)
+
+def test_since_returns_newer_samples():
+    """Test that since() returns samples after the timestamp, oldest first"""
+    history = CountHistory(capacity=8)
+    for second, count in enumerate([1, 2, 3]):
+        history.append(count, camera_id=0, timestamp=100.0 + second)
+
+    samples = history.since(100.0)
+
+    assert [sample["count"] for sample in samples] == [2, 3]
+    assert samples[0] == {"timestamp": 101.0, "count": 2, "camera_id": 0}
+
+def test_ring_overwrites_oldest():
+    """Test that a full history wraps around and keeps chronological order"""
+    history = CountHistory(capacity=4)
+    for second in range(10):
+        history.append(second, timestamp=float(second))
+
+    samples = history.since(0.0)
+
+    assert len(history) == 4
+    assert [sample["count"] for sample in samples] == [6, 7, 8, 9]
+    assert [sample["count"] for sample in history.since(7.5)] == [8, 9]
+    assert [sample["count"] for sample in history.since(0.0, limit=2)] == [8, 9]
+
+def test_window_aggregates():
+    """Test windowed max, min and mean"""
+    history = CountHistory(capacity=16)
+    for second, count in enumerate([5, 1, 2, 3]):
+        history.append(count, timestamp=100.0 + second)
+
+    stats = history.window(2000, now=103.0)
+
+    assert stats == {"samples": 3, "max": 3, "min": 1, "mean": pytest.approx(2.0)}
+    assert history.window(500, now=110.0)["samples"] == 0
+
+def test_window_filters_camera():
+    """Test that queries can be limited to one camera"""
+    history = CountHistory(capacity=16)
+    history.append(4, camera_id=0, timestamp=100.0)
+    history.append(1, camera_id=1, timestamp=100.5)
+
+    assert history.window(1000, camera_id=1, now=101.0)["max"] == 1
+    assert history.window(1000, now=101.0)["max"] == 4
+
+def test_exceeded():
+    """Test detection of a short spike above the threshold"""
+    history = CountHistory(capacity=16)
+    for second, count in enumerate([1, 1, 2, 1]):
+        history.append(count, timestamp=100.0 + second)
+
+    result = history.exceeded(1, 5000, now=103.5)
+
+    assert result == {"exceeded": True, "first_at": 102.0, "max": 2}
+    assert history.exceeded(1, 1000, now=103.5)["exceeded"] is False
+
+def test_history_endpoints():
+    """Test the windowed query endpoints"""
+    from fastapi.testclient import TestClient
+    from face_counter import api_server
+
+    client = TestClient(api_server.app)
+    client.post("/face-count", params={"count": 3, "camera_id": 7})
+    client.post("/face-count", params={"count": 1, "camera_id": 7})
+
+    window = client.get("/face-count/window", params={"window_ms": 60000, "camera_id": 7}).json()
+    assert window["max"] == 3
+    assert window["latest"]["count"] == 1
+
+    exceeded = client.get("/face-count/exceeded", params={"threshold": 2, "window_ms": 60000, "camera_id": 7}).json()
+    assert exceeded["exceeded"] is True
+
+    samples = client.get("/face-count/history", params={"camera_id": 7}).json()
+    assert [sample["count"] for sample in samples][-2:] == [3, 1]
@@ -0,0 +1,48 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from face_counter.metrics import Histogram, MetricsRegistry
+
+def test_histogram_buckets():
+    """Test that samples land in cumulative buckets"""
+    histogram = Histogram("test_seconds", "Test", buckets=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.05, 0.05, 5.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["buckets"] == [1, 3, 3, 4]
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(5.105)
+
+def test_histogram_timer():
+    """Test the timing context manager"""
+    histogram = Histogram("test_seconds", "Test")
+    with histogram.time():
+        pass
+    assert histogram.count == 1
+
+def test_registry_render():
+    """Test Prometheus text output"""
+    registry = MetricsRegistry(prefix="demo_")
+    registry.histogram("stage_seconds", "A stage", buckets=(0.5,)).observe(0.25)
+
+    text = registry.render()
+
+    assert "# TYPE demo_stage_seconds histogram" in text
+    assert 'demo_stage_seconds_bucket{le="0.5"} 1' in text
+    assert 'demo_stage_seconds_bucket{le="+Inf"} 1' in text
+    assert "demo_stage_seconds_count 1" in text
+
+def test_metrics_endpoint():
+    """Test that the API exposes the face counter histograms"""
+    from fastapi.testclient import TestClient
+    from face_counter.api_server import app
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert "face_counter_inference_seconds_bucket" in response.text
@@ -0,0 +1,102 @@
+import pytest
+import numpy as np
+from unittest.mock import Mock
+import sys
+import os
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from face_counter.demand import CaptureDemand, PAUSED
+from face_counter.multi_camera import MultiCameraService
+
+class FakeCapture:
+    """Capture returning a fixed number of frames."""
+
+    def __init__(self, frames=5):
+        self.reads = 0
+        self.remaining = frames
+        self.released = False
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self.remaining <= 0:
+            return False, None
+        self.remaining -= 1
+        self.reads += 1
+        return True, np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def release(self):
+        self.released = True
+
+@pytest.fixture
+def detector():
+    """Create a mock detector that counts one face per camera frame"""
+    detector = Mock()
+    detector.supports_batching = True
+    detector.count_faces_batch.side_effect = lambda frames: [1] * len(frames)
+    return detector
+
+def test_requires_camera_ids(detector):
+    """Test that an empty camera list is rejected"""
+    with pytest.raises(ValueError):
+        MultiCameraService(detector, [], api_endpoint=None)
+
+def test_process_pending_batches_all_cameras(detector):
+    """Test that frames from several cameras go through one batched call"""
+    service = MultiCameraService(detector, [0, 1, 2], api_endpoint=None)
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    service._pending = {0: (frame, 0.0), 1: (frame, 0.0), 2: (frame, 0.0)}
+
+    processed = service._process_pending(timeout=0)
+
+    assert processed == 3
+    detector.count_faces_batch.assert_called_once()
+    assert len(detector.count_faces_batch.call_args[0][0]) == 3
+    assert service.counts == {0: 1, 1: 1, 2: 1}
+    assert service.batches_run == 1
+
+def test_publishes_per_camera(detector):
+    """Test that each camera's count is published with its camera_id"""
+    service = MultiCameraService(detector, [0, 1], api_endpoint="http://localhost/face-count")
+    service._publish_count = Mock()
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    service._pending = {0: (frame, 0.0), 1: (frame, 0.0)}
+
+    service._process_pending(timeout=0)
+
+    published = sorted(call.args[:2] for call in service._publish_count.call_args_list)
+    assert published == [(0, 1), (1, 1)]
+
+def test_start_runs_until_duration(detector):
+    """Test a short run with fake captures on every camera"""
+    captures = {}
+
+    def factory(camera_id):
+        captures[camera_id] = FakeCapture()
+        return captures[camera_id]
+
+    service = MultiCameraService(detector, [0, 1], api_endpoint=None, capture_factory=factory)
+    service.start(duration=0.3)
+
+    assert sum(service.frames_processed.values()) > 0
+    assert all(capture.released for capture in captures.values())
+
+def test_paused_demand_releases_every_camera(detector):
+    """Test that a paused demand releases all cameras and they reopen once it expires"""
+    captures = []
+
+    def factory(camera_id):
+        captures.append(FakeCapture(frames=10 ** 6))
+        return captures[-1]
+
+    demand = CaptureDemand()
+    demand.set(PAUSED, ttl=0.2)
+    service = MultiCameraService(detector, [0, 1], api_endpoint=None, capture_factory=factory, demand=demand)
+    service.start(duration=0.6)
+
+    assert len(captures) == 4
+    assert all(capture.released and capture.reads == 0 for capture in captures[:2])
+    assert all(capture.reads > 0 for capture in captures[2:])
+    assert sum(service.frames_processed.values()) > 0
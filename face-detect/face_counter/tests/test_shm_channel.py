@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+import uuid
+import pytest
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from face_counter.shm_channel import SharedCountReader, SharedCountWriter
+
+@pytest.fixture
+def name():
+    return f"fc_test_{uuid.uuid4().hex[:8]}"
+
+def test_round_trip(name):
+    """Test that the reader sees what the writer wrote"""
+    writer = SharedCountWriter(name)
+    try:
+        reader = SharedCountReader(name)
+        assert reader.read() is None
+
+        trace_id = uuid.uuid4().hex
+        writer.write(3, camera_id=1, trace_id=trace_id, captured_at=10.0, changed_at=9.0, timestamp=11.0)
+        sequence = reader.sequence
+
+        assert reader.read() == {"count": 3, "camera_id": 1, "timestamp": 11.0, "trace_id": trace_id,
+                                 "captured_at": 10.0, "changed_at": 9.0}
+        writer.write_sample({"count": 4, "camera_id": 1})
+        assert reader.sequence > sequence
+        assert reader.read()["count"] == 4
+        reader.close()
+    finally:
+        writer.close()
+
+def test_reader_requires_writer(name):
+    """Test that attaching before the writer exists fails"""
+    with pytest.raises(FileNotFoundError):
+        SharedCountReader(name)
+
+# Writer in a separate interpreter, like the face counter and the guard
+WRITER_SCRIPT = textwrap.dedent("""
+    import sys, time
+    from face_counter.shm_channel import SharedCountWriter
+    writer = SharedCountWriter(sys.argv[1])
+    print("ready", flush=True)
+    value = 0
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        # Every field derived from value, so torn reads show up as mismatches
+        writer.write(value, camera_id=value % 1000, captured_at=float(value), changed_at=float(value),
+                     timestamp=float(value))
+        value += 1
+    writer.close()
+""")
+
+def test_concurrent_writer_process(name):
+    """Stress test: reads from another process never tear"""
+    face_detect_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    process = subprocess.Popen([sys.executable, "-c", WRITER_SCRIPT, name], cwd=face_detect_dir,
+                               stdout=subprocess.PIPE, text=True)
+    try:
+        assert process.stdout.readline().strip() == "ready"
+        reader = SharedCountReader(name)
+        seen = set()
+        deadline = time.time() + 1
+        while time.time() < deadline:
+            record = reader.read()
+            if record is None:
+                continue
+            value = record["count"]
+            assert record["camera_id"] == value % 1000
+            assert record["captured_at"] == record["changed_at"] == record["timestamp"] == value
+            seen.add(value)
+        reader.close()
+        assert len(seen) > 1
+    finally:
+        process.kill()
+        process.wait()
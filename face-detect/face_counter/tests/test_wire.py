@@ -0,0 +1,45 @@
+import uuid
+import sys
+import os
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from face_counter import wire
+
+def test_round_trip():
+    """Test that a record survives encoding and decoding"""
+    trace_id = uuid.uuid4().hex
+    data = wire.pack_record(3, 1700000000.5, camera_id=2, trace_id=trace_id, captured_at=1700000000.25, changed_at=1699999999.0)
+
+    assert len(data) == wire.RECORD.size == 48
+    assert wire.unpack_record(data) == {
+        "count": 3, "camera_id": 2, "timestamp": 1700000000.5, "trace_id": trace_id,
+        "captured_at": 1700000000.25, "changed_at": 1699999999.0,
+    }
+
+def test_unset_fields():
+    """Test that missing optional fields decode as None"""
+    decoded = wire.unpack_record(wire.pack_record(0, 1.0, trace_id="not-a-uuid"))
+
+    assert decoded["camera_id"] is None
+    assert decoded["trace_id"] is None
+    assert decoded["captured_at"] is None and decoded["changed_at"] is None
+
+def test_binary_endpoints():
+    """Test POST and GET of /face-count.bin"""
+    from fastapi.testclient import TestClient
+    from face_counter import api_server
+
+    client = TestClient(api_server.app)
+    trace_id = uuid.uuid4().hex
+    response = client.post("/face-count.bin", content=wire.pack_record(4, 0.0, camera_id=9, trace_id=trace_id))
+    assert response.status_code == 204
+
+    response = client.get("/face-count.bin", params={"camera_id": 9})
+    assert response.headers["content-type"] == wire.MEDIA_TYPE
+    decoded = wire.unpack_record(response.content)
+    assert decoded["count"] == 4
+    assert decoded["trace_id"] == trace_id
+    assert decoded["timestamp"] > 0
+
+    assert client.post("/face-count.bin", content=b"short").status_code == 400
@@ -0,0 +1,79 @@
+"""
+Fixed-size binary encoding of a face count record for high-rate local polling.
+
+One record is 48 little-endian bytes:
+
+    offset  type     field
+    0       int32    count
+    4       int32    camera_id (-1 when unset)
+    8       float64  timestamp, epoch seconds the API stored the count
+    16      float64  captured_at (NaN when unset)
+    24      float64  changed_at (NaN when unset)
+    32      16 bytes trace_id as raw UUID bytes (all zero when unset)
+
+Decoding is a single struct unpack, with no JSON parsing or ISO datetime handling.
+"""
+import http.client
+import math
+import socket
+import struct
+from datetime import datetime
+from typing import Dict, Optional
+
+RECORD = struct.Struct("<iiddd16s")
+MEDIA_TYPE = "application/x-face-count"
+
+_NO_CAMERA = -1
+_NO_TRACE = bytes(16)
+
+def _optional_float(value: Optional[float]) -> float:
+    return math.nan if value is None else value
+
+def _trace_bytes(trace_id: Optional[str]) -> bytes:
+    # Trace IDs written by the face counter are UUID hex strings; anything else is dropped
+    try:
+        raw = bytes.fromhex(trace_id) if trace_id else _NO_TRACE
+    except ValueError:
+        return _NO_TRACE
+    return raw if len(raw) == 16 else _NO_TRACE
+
+def pack_record(count: int, timestamp: float, camera_id: Optional[int] = None, trace_id: Optional[str] = None,
+                captured_at: Optional[float] = None, changed_at: Optional[float] = None) -> bytes:
+    """Encode one record. trace_id is kept only if it is a 32 character hex string (a UUID)."""
+    return RECORD.pack(
+        count,
+        _NO_CAMERA if camera_id is None else camera_id,
+        timestamp,
+        _optional_float(captured_at),
+        _optional_float(changed_at),
+        _trace_bytes(trace_id),
+    )
+
+def unpack_record(data: bytes) -> Dict:
+    """Decode one record into a dict with the same fields as the JSON response (timestamp as epoch seconds)."""
+    count, camera_id, timestamp, captured_at, changed_at, trace_id = RECORD.unpack(data)
+    return {
+        "count": count,
+        "camera_id": None if camera_id == _NO_CAMERA else camera_id,
+        "timestamp": timestamp,
+        "captured_at": None if math.isnan(captured_at) else captured_at,
+        "changed_at": None if math.isnan(changed_at) else changed_at,
+        "trace_id": None if trace_id == _NO_TRACE else trace_id.hex(),
+    }
+
+def pack_count_record(record) -> bytes:
+    """Encode a count_store.CountRecord."""
+    timestamp = record.timestamp.timestamp() if isinstance(record.timestamp, datetime) else record.timestamp
+    return pack_record(record.count, timestamp, record.camera_id, record.trace_id, record.captured_at, record.changed_at)
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket, for an API served with --api-uds."""
+
+    def __init__(self, path: str, timeout: float = 3.0):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
@@ -0,0 +1,16 @@
+"""
+Load-test harness for unified_privacy_guard.py.
+
+Local stand-ins for the services the guard depends on, so it can be driven
+without a camera, browser or LLM:
+
+    fake_llm.FakeLLM          OpenAI-compatible chat completions with configurable
+                              latency and token streaming
+    fake_face_api.FakeFaceAPI face counter API replaying a face count trace
+    fake_storage.FakeStorage  central server storage emitting tab events
+
+servers.py runs all three in one process, and driver.py runs the guard
+against them and reports decision throughput, latency percentiles and CPU:
+
+    python -m loadtest.driver --duration 30 --llm-latency 0.5
+"""
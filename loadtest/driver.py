@@ -0,0 +1,245 @@
+"""
+Load driver: runs UnifiedPrivacyGuard against the fake servers and reports
+decision throughput, decision latency percentiles and CPU usage.
+
+The fake servers run in a child process (loadtest.servers), so the guard's CPU
+time is this process's and the servers' is reported separately (from /proc,
+Linux only). Screen brightness changes are recorded instead of applied.
+
+Usage:
+    python -m loadtest.driver --duration 30
+    python -m loadtest.driver --check-interval 0 --llm-latency 1.0 --llm-concurrency 2 --llm-batch-size 4
+    python -m loadtest.driver --face-trace trace.jsonl --json results.json
+    python -m loadtest.driver --face-trace trace.jsonl --compare   # fixed vs adaptive check interval
+    python -m loadtest.driver --camera-demand --idle-camera-mode paused
+    python -m loadtest.driver --llm-latency 1.0 --record-workload workload.jsonl   # then workload_trace.py replay
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from trace_analyzer import percentile
+from unified_privacy_guard import BinaryFaceClient, CameraDemandClient, FaceDetectionClient, UnifiedPrivacyGuard
+from workload_trace import WorkloadRecorder
+from .servers import add_server_arguments
+
+class RecordingScreenController:
+    """ScreenController stand-in that counts brightness changes."""
+
+    def __init__(self):
+        self._is_dimmed = False
+        self.dims = 0
+        self.restores = 0
+
+    @property
+    def is_dimmed(self) -> bool:
+        return self._is_dimmed
+
+    def dim_screen(self, dim_percentage: Optional[int] = None) -> bool:
+        self._is_dimmed = True
+        self.dims += 1
+        return True
+
+    def restore_brightness(self) -> bool:
+        self._is_dimmed = False
+        self.restores += 1
+        return True
+
+def process_cpu_seconds(pid: int) -> Optional[float]:
+    """utime + stime of a process, or None where /proc is not available."""
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            fields = stat.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError):
+        return None
+
+def start_servers(args) -> Tuple[subprocess.Popen, Dict]:
+    command = [sys.executable, "-m", "loadtest.servers",
+               "--host", args.host,
+               "--llm-latency", str(args.llm_latency),
+               "--llm-jitter", str(args.llm_jitter),
+               "--llm-token-latency", str(args.llm_token_latency),
+               "--face-period", str(args.face_period),
+               "--face-latency", str(args.face_latency),
+               "--storage-latency", str(args.storage_latency),
+               "--event-interval", str(args.event_interval),
+               "--edit-probability", str(args.edit_probability)]
+    if args.face_trace:
+        command += ["--face-trace", args.face_trace]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True,
+                               cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    line = process.stdout.readline()
+    if not line:
+        process.kill()
+        raise RuntimeError("Fake servers exited before reporting their URLs")
+    return process, json.loads(line)
+
+def server_stats(urls: Dict[str, str]) -> Dict[str, Dict]:
+    stats = {}
+    for name, url in urls.items():
+        try:
+            stats[name] = requests.get(f"{url}/stats", timeout=3).json()
+        except (requests.RequestException, ValueError):
+            stats[name] = {}
+    return stats
+
+def run(args) -> Dict:
+    process, urls = start_servers(args)
+    guard = None
+    try:
+        guard_urls = urls["guard"]
+        if args.face_wire == "binary":
+            face_client = BinaryFaceClient(guard_urls["face_api_url"])
+        else:
+            face_client = FaceDetectionClient(guard_urls["face_api_url"], window_ms=args.face_window_ms or None)
+        guard = UnifiedPrivacyGuard(
+            browser_server_url=guard_urls["browser_server_url"],
+            llm_url=guard_urls["llm_url"],
+            check_interval=args.check_interval,
+            face_client=face_client,
+            llm_concurrency=args.llm_concurrency,
+            llm_wait=args.llm_wait,
+            llm_batch_size=args.llm_batch_size,
+            tick_budget=args.tick_budget,
+            degraded_policy=args.degraded_policy,
+            llm_slow_threshold=args.llm_slow_threshold,
+            breaker_reset=args.breaker_reset,
+            adaptive_interval=args.adaptive_interval,
+            min_interval=args.min_interval,
+            max_interval=args.max_interval,
+            camera_demand=CameraDemandClient(guard_urls["face_api_url"]) if args.camera_demand else None,
+            idle_camera_mode=args.idle_camera_mode,
+            recorder=(WorkloadRecorder(args.record_workload, settings={"check_interval": args.check_interval})
+                      if args.record_workload else None)
+        )
+        screen = guard.screen_controller = RecordingScreenController()
+
+        latencies = []
+        cpu_start = time.process_time()
+        server_cpu_start = process_cpu_seconds(process.pid)
+        start = time.perf_counter()
+        deadline = start + args.duration
+        while time.perf_counter() < deadline:
+            tick = time.perf_counter()
+            guard.run_once()
+            finished = time.perf_counter()
+            latencies.append(finished - tick)
+            if args.check_interval > 0:
+                time.sleep(max(0.0, guard.next_interval() - (finished - tick)))
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+        server_cpu_end = process_cpu_seconds(process.pid)
+
+        return {
+            "duration_s": elapsed,
+            "decisions": len(latencies),
+            "decisions_per_s": len(latencies) / elapsed,
+            "latency_ms": {name: percentile(latencies, pct) * 1000
+                           for name, pct in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))},
+            "guard_cpu_s": cpu,
+            "guard_cpu_percent": cpu / elapsed * 100,
+            "guard_cpu_ms_per_decision": cpu / max(1, len(latencies)) * 1000,
+            "servers_cpu_s": (server_cpu_end - server_cpu_start
+                              if server_cpu_start is not None and server_cpu_end is not None else None),
+            "dims": screen.dims,
+            "restores": screen.restores,
+            "servers": server_stats(urls["servers"]),
+            "breakers": {breaker.name: {"state": breaker.state, "trips": breaker.trips,
+                                        "rejected": breaker.rejected, "timeouts": breaker.timeouts}
+                         for breaker in (guard.face_breaker, guard.browser_breaker, guard.llm_breaker)
+                         if breaker is not None},
+        }
+    finally:
+        if guard is not None:
+            guard.stop()
+        process.terminate()
+        process.wait(timeout=5)
+
+def requests_made(report: Dict) -> int:
+    servers = report["servers"]
+    return sum(servers[name].get(key, 0) for name, key in (("llm", "requests"), ("face", "polls"), ("storage", "polls")))
+
+def print_report(report: Dict):
+    latency = report["latency_ms"]
+    print(f"decisions        {report['decisions']} in {report['duration_s']:.1f} s ({report['decisions_per_s']:.1f}/s)")
+    print(f"decision latency p50 {latency['p50']:.2f} ms  p95 {latency['p95']:.2f} ms  "
+          f"p99 {latency['p99']:.2f} ms  max {latency['max']:.2f} ms")
+    print(f"guard cpu        {report['guard_cpu_s']:.2f} s ({report['guard_cpu_percent']:.1f}% of a core, "
+          f"{report['guard_cpu_ms_per_decision']:.3f} ms per decision)")
+    if report["servers_cpu_s"] is not None:
+        print(f"fake servers cpu {report['servers_cpu_s']:.2f} s")
+    print(f"screen changes   {report['dims']} dims, {report['restores']} restores")
+    servers = report["servers"]
+    print(f"requests         llm {servers['llm'].get('requests', '?')} ({servers['llm'].get('items', '?')} items), "
+          f"face {servers['face'].get('polls', '?')}, storage {servers['storage'].get('polls', '?')}")
+    print(f"requests/s       {requests_made(report) / report['duration_s']:.1f}")
+    mode_seconds = servers["face"].get("mode_seconds")
+    if mode_seconds:
+        total = sum(mode_seconds.values()) or 1.0
+        print("camera demand    " + ", ".join(f"{mode} {seconds / total * 100:.0f}%" for mode, seconds in mode_seconds.items())
+              + f" ({servers['face'].get('demand_changes', 0)} changes)")
+    for name, breaker in report["breakers"].items():
+        print(f"breaker {name:<15} {breaker['state']}, {breaker['trips']} trips, "
+              f"{breaker['rejected']} rejected, {breaker['timeouts']} timeouts")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the unified privacy guard against fake servers")
+    add_server_arguments(parser)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run (default: 30)")
+    parser.add_argument("--check-interval", type=float, default=0.5,
+                        help="Guard check interval, 0 to run checks back to back (default: 0.5)")
+    parser.add_argument("--face-wire", choices=["json", "binary"], default="json")
+    parser.add_argument("--face-window-ms", type=float, default=0)
+    parser.add_argument("--llm-concurrency", type=int, default=1)
+    parser.add_argument("--llm-wait", type=float, default=0.2)
+    parser.add_argument("--llm-batch-size", type=int, default=1)
+    parser.add_argument("--tick-budget", type=float, help="Guard tick budget (default: the check interval)")
+    parser.add_argument("--degraded-policy", default="cached", choices=["fail-open", "fail-closed", "cached", "local"])
+    parser.add_argument("--llm-slow-threshold", type=float, default=5.0)
+    parser.add_argument("--breaker-reset", type=float, default=5.0)
+    parser.add_argument("--adaptive-interval", action="store_true", help="Use the guard's adaptive check interval")
+    parser.add_argument("--min-interval", type=float)
+    parser.add_argument("--max-interval", type=float)
+    parser.add_argument("--camera-demand", action="store_true",
+                        help="Let the guard lower the fake camera's capture rate on harmless pages")
+    parser.add_argument("--idle-camera-mode", default="low", choices=["low", "paused"])
+    parser.add_argument("--compare", action="store_true",
+                        help="Run with a fixed and then an adaptive interval on the same trace and compare requests")
+    parser.add_argument("--record-workload", help="Record what the guard saw, for replay with workload_trace.py")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Keep the guard's info logging")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger("unified_privacy_guard").setLevel(logging.WARNING)
+
+    if args.compare:
+        reports = {}
+        for adaptive in (False, True):
+            name = "adaptive" if adaptive else "fixed"
+            print(f"--- {name} interval")
+            reports[name] = run(argparse.Namespace(**dict(vars(args), adaptive_interval=adaptive)))
+            print_report(reports[name])
+        fixed, adaptive = requests_made(reports["fixed"]), requests_made(reports["adaptive"])
+        print(f"--- adaptive interval made {adaptive} requests instead of {fixed} "
+              f"({(1 - adaptive / max(1, fixed)) * 100:.1f}% fewer), "
+              f"{reports['adaptive']['dims']} dims instead of {reports['fixed']['dims']}")
+        report = reports
+    else:
+        report = run(args)
+        print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
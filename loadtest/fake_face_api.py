@@ -0,0 +1,182 @@
+"""
+Face counter API replaying a face count trace.
+
+A trace is a list of (offset seconds, count) changes, loaded from a JSONL file
+with one {"t": seconds, "count": n} object per line (lines with an epoch
+"timestamp" instead of "t", as in GET /face-count/history samples, work too)
+or generated. It is replayed in a loop from when the server starts. Serves the
+endpoints the guard polls: /face-count, /face-count/window, /face-count.bin
+and /health, and records the capture demand set through /demand so /stats
+shows how long the camera would have run at each rate.
+"""
+
+import asyncio
+import json
+import math
+import struct
+import time
+import uuid
+from bisect import bisect_right
+from datetime import datetime
+from typing import Sequence, Tuple
+
+from aiohttp import web
+
+# Must match face_counter/wire.py
+RECORD = struct.Struct("<iiddd16s")
+MEDIA_TYPE = "application/x-face-count"
+
+class FaceTrace:
+    """Face count changes over time, looping after the last one."""
+
+    def __init__(self, changes: Sequence[Tuple[float, int]], duration: float = None):
+        """
+        Args:
+            changes: (offset seconds, count) pairs; the first should be at offset 0
+            duration: Loop length (default: one second after the last change)
+        """
+        changes = sorted(changes)
+        if not changes:
+            raise ValueError("A face trace needs at least one sample")
+        self.offsets = [offset - changes[0][0] for offset, _ in changes]
+        self.counts = [count for _, count in changes]
+        self.duration = duration or self.offsets[-1] + 1.0
+
+    @classmethod
+    def from_file(cls, path: str) -> "FaceTrace":
+        changes = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    sample = json.loads(line)
+                    changes.append((float(sample["t"] if "t" in sample else sample["timestamp"]), int(sample["count"])))
+        return cls(changes)
+
+    @classmethod
+    def alternating(cls, period: float = 5.0, counts: Sequence[int] = (1, 2)) -> "FaceTrace":
+        """Each count held for period seconds in turn."""
+        return cls([(index * period, count) for index, count in enumerate(counts)], duration=period * len(counts))
+
+    def _index(self, elapsed: float) -> Tuple[int, int]:
+        """(loop number, change index) in effect elapsed seconds into the replay."""
+        loop, position = divmod(max(0.0, elapsed), self.duration)
+        return int(loop), bisect_right(self.offsets, position) - 1
+
+    def count_at(self, elapsed: float) -> Tuple[int, float, int]:
+        """Count in effect, elapsed seconds of its change, and a sequence number of that change."""
+        loop, index = self._index(elapsed)
+        return self.counts[index], loop * self.duration + self.offsets[index], loop * len(self.counts) + index
+
+    def max_between(self, start: float, end: float) -> int:
+        """Highest count in effect at any time between two elapsed times."""
+        highest, _, change = self.count_at(start)
+        highest_until, _, last_change = self.count_at(end)
+        for sequence in range(change + 1, last_change + 1):
+            highest = max(highest, self.counts[sequence % len(self.counts)])
+        return max(highest, highest_until)
+
+class FakeFaceAPI:
+    """Replays a FaceTrace as the face counter's HTTP API."""
+
+    def __init__(self, trace: FaceTrace, camera_id: int = 0, detection_latency: float = 0.03,
+                 response_latency: float = 0.0):
+        """
+        Args:
+            trace: Counts to replay
+            camera_id: Camera the counts are reported for
+            detection_latency: Seconds between capture and publish reported for each count
+            response_latency: Seconds each response is delayed, to simulate a stalled API (default: 0)
+        """
+        self.trace = trace
+        self.response_latency = response_latency
+        self.camera_id = camera_id
+        self.detection_latency = detection_latency
+        self.started_at = time.time()
+        self.polls = 0
+        self.demand = "full"
+        self.demand_changes = 0
+        self._demand_since = self.started_at
+        self._mode_seconds = {"full": 0.0, "low": 0.0, "paused": 0.0}
+
+    async def _delay(self):
+        if self.response_latency > 0:
+            await asyncio.sleep(self.response_latency)
+
+    def _record(self):
+        now = time.time()
+        count, changed, sequence = self.trace.count_at(now - self.started_at)
+        # One trace ID per change, like the face counter's
+        trace_id = uuid.uuid5(uuid.NAMESPACE_OID, f"{self.started_at}-{sequence}").hex
+        return count, now, trace_id, now - self.detection_latency, self.started_at + changed
+
+    def _json(self, record) -> dict:
+        count, now, trace_id, captured_at, changed_at = record
+        return {
+            "count": count,
+            "timestamp": datetime.fromtimestamp(now).isoformat(),
+            "camera_id": self.camera_id,
+            "trace_id": trace_id,
+            "captured_at": captured_at,
+            "changed_at": changed_at,
+        }
+
+    async def face_count(self, request: web.Request) -> web.Response:
+        self.polls += 1
+        await self._delay()
+        return web.json_response(self._json(self._record()))
+
+    async def face_count_bin(self, request: web.Request) -> web.Response:
+        self.polls += 1
+        await self._delay()
+        count, now, trace_id, captured_at, changed_at = self._record()
+        body = RECORD.pack(count, self.camera_id, now, captured_at, changed_at, bytes.fromhex(trace_id))
+        return web.Response(body=body, content_type=MEDIA_TYPE)
+
+    async def window(self, request: web.Request) -> web.Response:
+        self.polls += 1
+        await self._delay()
+        window_ms = float(request.query.get("window_ms", 1000))
+        record = self._record()
+        elapsed = record[1] - self.started_at
+        highest = self.trace.max_between(elapsed - window_ms / 1000, elapsed)
+        return web.json_response({
+            "window_ms": window_ms,
+            "samples": max(1, math.ceil(window_ms / 1000 * 30)),
+            "max": highest,
+            "min": None,
+            "mean": None,
+            "latest": self._json(record),
+        })
+
+    def _switch_demand(self, mode: str):
+        now = time.time()
+        self._mode_seconds[self.demand] += now - self._demand_since
+        if mode != self.demand:
+            self.demand_changes += 1
+        self.demand, self._demand_since = mode, now
+
+    async def set_demand(self, request: web.Request) -> web.Response:
+        mode = request.query.get("mode", "")
+        if mode not in self._mode_seconds:
+            return web.json_response({"detail": f"Unknown mode {mode}"}, status=400)
+        # Leases are not expired here, the guard renews or resets them
+        self._switch_demand(mode)
+        return web.json_response({"mode": mode, "expires_in": None})
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    async def stats(self, request: web.Request) -> web.Response:
+        self._switch_demand(self.demand)
+        return web.json_response({"polls": self.polls, "demand_changes": self.demand_changes,
+                                  "mode_seconds": self._mode_seconds})
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/face-count", self.face_count)
+        app.router.add_get("/face-count.bin", self.face_count_bin)
+        app.router.add_get("/face-count/window", self.window)
+        app.router.add_post("/demand", self.set_demand)
+        app.router.add_get("/health", self.health)
+        app.router.add_get("/stats", self.stats)
+        return app
@@ -0,0 +1,119 @@
+"""
+OpenAI-compatible chat completions server answering sensitivity prompts.
+
+A prompt is answered "yes" when its user message contains one of the
+sensitive words. Batched prompts (numbered "Item N" sections, see
+SensitivityChecker.BATCH_SYSTEM_PROMPT) get a JSON list with one answer per
+item. With "stream": true the answer is sent as server-sent event chunks,
+one token at a time.
+"""
+
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from typing import Dict, List, Sequence
+
+from aiohttp import web
+
+SENSITIVE_WORDS = ("bank", "account", "password", "patient", "payroll", "confidential",
+                   "passport", "tax", "card", "salary", "mail")
+
+_ITEM = re.compile(r"(?m)^Item \d+\n")
+_TOKEN = re.compile(r"\S+\s*")
+
+class FakeLLM:
+    """Chat completions endpoint with configurable latency."""
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.0, token_latency: float = 0.01,
+                 sensitive_words: Sequence[str] = SENSITIVE_WORDS, seed: int = 0):
+        """
+        Args:
+            latency: Seconds before the first token (prefill) (default: 0.2)
+            jitter: Up to this many seconds added to latency at random (default: 0)
+            token_latency: Seconds per generated token (default: 0.01)
+            sensitive_words: Words that make a prompt or item sensitive
+            seed: Seed of the jitter
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.token_latency = token_latency
+        self.sensitive_words = tuple(word.lower() for word in sensitive_words)
+        self._random = random.Random(seed)
+        self.requests = 0
+        self.items = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def is_sensitive(self, text: str) -> bool:
+        text = text.lower()
+        return any(word in text for word in self.sensitive_words)
+
+    def answer(self, messages: List[Dict]) -> str:
+        """Answer to the last user message: 'yes'/'no', or a JSON list for batched items."""
+        user = next((message.get("content", "") for message in reversed(messages)
+                     if message.get("role") == "user"), "")
+        items = [item for item in _ITEM.split(user) if item.strip()] if _ITEM.search(user) else []
+        if items:
+            self.items += len(items)
+            return json.dumps(["yes" if self.is_sensitive(item) else "no" for item in items])
+        self.items += 1
+        return "yes" if self.is_sensitive(user) else "no"
+
+    async def chat(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            answer = self.answer(body.get("messages", []))
+            tokens = _TOKEN.findall(answer) or [answer]
+            await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            model = body.get("model", "fake")
+
+            if body.get("stream"):
+                response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+                await response.prepare(request)
+                for token in tokens:
+                    await asyncio.sleep(self.token_latency)
+                    await response.write(self._chunk(completion_id, model, {"content": token}, None))
+                await response.write(self._chunk(completion_id, model, {}, "stop"))
+                await response.write(b"data: [DONE]\n\n")
+                await response.write_eof()
+                return response
+
+            await asyncio.sleep(self.token_latency * len(tokens))
+            return web.json_response({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}],
+                "usage": {"completion_tokens": len(tokens)},
+            })
+        finally:
+            self.in_flight -= 1
+
+    @staticmethod
+    def _chunk(completion_id: str, model: str, delta: Dict, finish_reason) -> bytes:
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(chunk)}\n\n".encode()
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response({"requests": self.requests, "items": self.items, "max_in_flight": self.max_in_flight})
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.chat)
+        app.router.add_post("/api/v1/openai/chat/completions", self.chat)
+        app.router.add_get("/stats", self.stats)
+        return app
@@ -0,0 +1,120 @@
+"""
+Central server storage emitting tab events.
+
+latest_tab_event switches to the next page of a list every event_interval
+seconds, in the shape the browser extension stores it (event, data with url,
+title and messageData.textContent/textBlocks, timestamp in milliseconds).
+Some events also change one line of the page, as dynamic pages do, so block
+reuse in the guard is exercised. Other keys behave like the real storage
+routes (POST stores, GET returns what was stored).
+"""
+
+import asyncio
+import hashlib
+import random
+import time
+from typing import Dict, List, Optional, Sequence
+
+from aiohttp import web
+
+STORAGE_KEY = "latest_tab_event"
+
+DEFAULT_PAGES = [
+    {"url": "https://online.examplebank.com/accounts", "title": "Accounts - Example Bank",
+     "text": "Checking account ending 4821\nAvailable balance $3,214.77\nRecent transactions\nPayroll deposit\nRent payment"},
+    {"url": "https://news.example.com/sports", "title": "Sports - Example News",
+     "text": "The home side won the final 3-1\nThe coach praised the defense\nHighlights and reactions"},
+    {"url": "https://mail.example.com/inbox", "title": "Inbox (3)",
+     "text": "Lease documents attached\nPassport copy for the background check\nCall me if anything is missing"},
+    {"url": "https://docs.python.org/3/library/struct.html", "title": "struct - Python documentation",
+     "text": "This module converts between Python values and C structs\nFormat strings describe the layout"},
+    {"url": "https://recipes.example.com/lemon-cake", "title": "Lemon drizzle cake",
+     "text": "225g butter\n225g sugar\n4 eggs\nBake for 45 minutes"},
+]
+
+def text_blocks(text: str) -> List[Dict[str, str]]:
+    """One block per line, identified by a hash of its text like the extension's blocks."""
+    return [{"hash": hashlib.sha1(line.encode()).hexdigest()[:8], "text": line}
+            for line in text.splitlines() if line.strip()]
+
+class FakeStorage:
+    """Storage API whose latest tab event follows a scripted browsing session."""
+
+    def __init__(self, pages: Optional[Sequence[Dict[str, str]]] = None, event_interval: float = 2.0,
+                 edit_probability: float = 0.3, seed: int = 0, response_latency: float = 0.0):
+        """
+        Args:
+            pages: Pages visited in turn, each with url, title and text (default: DEFAULT_PAGES)
+            event_interval: Seconds between tab events (default: 2)
+            edit_probability: Chance that an event changes one line of its page (default: 0.3)
+            seed: Seed of the page edits
+            response_latency: Seconds each GET is delayed, to simulate a stalled server (default: 0)
+        """
+        self.pages = list(pages or DEFAULT_PAGES)
+        self.event_interval = event_interval
+        self.edit_probability = edit_probability
+        self.seed = seed
+        self.response_latency = response_latency
+        self.started_at = time.time()
+        self.events = 0
+        self.polls = 0
+        self._stored: Dict[str, Dict] = {}
+
+    def event(self, number: int) -> Dict:
+        """The number-th tab event of the session."""
+        page = self.pages[number % len(self.pages)]
+        text = page["text"]
+        if random.Random(self.seed * 1_000_003 + number).random() < self.edit_probability:
+            text = f"{text}\nUpdated {number}"
+        return {
+            "id": f"event-{number}",
+            "event": "tab_activated",
+            "timestamp": int((self.started_at + number * self.event_interval) * 1000),
+            "data": {
+                "url": page["url"],
+                "title": page["title"],
+                "messageData": {"textContent": text[:5000], "textBlocks": text_blocks(text)},
+            },
+        }
+
+    def latest_event(self) -> Dict:
+        number = int((time.time() - self.started_at) / self.event_interval)
+        self.events = number + 1
+        return self.event(number)
+
+    async def get(self, request: web.Request) -> web.Response:
+        key = request.match_info["key"]
+        self.polls += 1
+        if self.response_latency > 0:
+            await asyncio.sleep(self.response_latency)
+        if key in self._stored:
+            return web.json_response({"success": True, **self._stored[key]})
+        if key == STORAGE_KEY:
+            event = self.latest_event()
+            return web.json_response({"success": True, "data": event, "timestamp": event["timestamp"]})
+        return web.json_response({"success": False, "message": f"No data found for key: {key}"}, status=404)
+
+    async def post(self, request: web.Request) -> web.Response:
+        key = request.match_info["key"]
+        body = await request.json()
+        if body.get("data") is None:
+            return web.json_response({"success": False, "error": "Data is required",
+                                      "timestamp": int(time.time() * 1000)}, status=400)
+        timestamp = int(time.time() * 1000)
+        self._stored[key] = {"data": body["data"], "timestamp": timestamp}
+        return web.json_response({"success": True, "message": f"Data stored successfully for key: {key}",
+                                  "timestamp": timestamp}, status=201)
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "OK"})
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response({"polls": self.polls, "events": self.events})
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/health", self.health)
+        app.router.add_get("/stats", self.stats)
+        app.router.add_get("/api/storage/{key}", self.get)
+        app.router.add_post("/api/storage/{key}", self.post)
+        return app
@@ -0,0 +1,84 @@
+"""
+Runs the fake LLM, face API and storage servers in one process.
+
+Prints one JSON line with the URLs the guard should use, then serves until
+interrupted:
+
+    python -m loadtest.servers --llm-latency 0.5 --face-trace trace.jsonl
+    {"servers": {"llm": "http://127.0.0.1:...", ...}, "guard": {"llm_url": "...", "face_api_url": "...", ...}}
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Dict
+
+from aiohttp import web
+
+from .fake_face_api import FaceTrace, FakeFaceAPI
+from .fake_llm import FakeLLM
+from .fake_storage import FakeStorage
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    """Options shared by this module and the load driver."""
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds before the first token (default: 0.2)")
+    parser.add_argument("--llm-jitter", type=float, default=0.0, help="Random extra seconds of LLM latency (default: 0)")
+    parser.add_argument("--llm-token-latency", type=float, default=0.01, help="Seconds per token (default: 0.01)")
+    parser.add_argument("--face-trace", help="JSONL face count trace to replay (default: alternate 1 and 2 faces)")
+    parser.add_argument("--face-period", type=float, default=5.0,
+                        help="Seconds per count of the default alternating trace (default: 5)")
+    parser.add_argument("--face-latency", type=float, default=0.0,
+                        help="Seconds every face API response is delayed (default: 0)")
+    parser.add_argument("--storage-latency", type=float, default=0.0,
+                        help="Seconds every storage response is delayed (default: 0)")
+    parser.add_argument("--event-interval", type=float, default=2.0, help="Seconds between tab events (default: 2)")
+    parser.add_argument("--edit-probability", type=float, default=0.3,
+                        help="Chance a tab event changes one line of its page (default: 0.3)")
+
+def build_apps(args) -> Dict[str, web.Application]:
+    trace = FaceTrace.from_file(args.face_trace) if args.face_trace else FaceTrace.alternating(args.face_period)
+    return {
+        "llm": FakeLLM(args.llm_latency, args.llm_jitter, args.llm_token_latency).app(),
+        "face": FakeFaceAPI(trace, response_latency=args.face_latency).app(),
+        "storage": FakeStorage(event_interval=args.event_interval, edit_probability=args.edit_probability,
+                               response_latency=args.storage_latency).app(),
+    }
+
+async def start(apps: Dict[str, web.Application], host: str = "127.0.0.1") -> Dict[str, str]:
+    """Serve each app on a free port and return the base URL of each."""
+    urls = {}
+    for name, app in apps.items():
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        urls[name] = f"http://{host}:{port}"
+    return urls
+
+def guard_urls(urls: Dict[str, str]) -> Dict[str, str]:
+    """The UnifiedPrivacyGuard URL arguments for servers started with start()."""
+    return {
+        "llm_url": f"{urls['llm']}/api/v1/openai/chat/completions",
+        "face_api_url": f"{urls['face']}/face-count",
+        "browser_server_url": f"{urls['storage']}/api/storage",
+    }
+
+async def serve(args):
+    urls = await start(build_apps(args), args.host)
+    print(json.dumps({"servers": urls, "guard": guard_urls(urls)}), flush=True)
+    await asyncio.Event().wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake LLM, face API and storage servers for load tests")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Text extraction from tab screenshots, for pages whose content is not in the
+DOM text (canvas apps, PDF viewers, images of documents).
+
+A screenshot data URL is decoded, converted to grayscale, downscaled to a
+bounded width and cut into overlapping horizontal tiles. The tiles of one
+screenshot are recognized as a batch on a worker pool and the text is joined
+back in order. Results are cached by the hash of the image bytes, so the same
+screenshot sent with several events is only recognized once.
+
+OCR uses Tesseract through pytesseract and Pillow, which are optional:
+    pip install pytesseract Pillow   (plus the tesseract binary)
+"""
+
+import base64
+import hashlib
+import io
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def decode_data_url(data_url: str) -> bytes:
+    """Return the image bytes of a base64 data URL (or of plain base64)."""
+    _, _, payload = data_url.rpartition(",")
+    return base64.b64decode(payload)
+
+def _tesseract_ocr():
+    try:
+        import pytesseract
+    except ImportError as e:
+        raise RuntimeError("Screenshot OCR needs pytesseract and Pillow (pip install pytesseract Pillow)") from e
+    return pytesseract.image_to_string
+
+class ScreenshotTextExtractor:
+    """Downscaled, tiled OCR of screenshots with a worker pool and a result cache."""
+
+    def __init__(self, max_width: int = 1280, tile_height: int = 480, tile_overlap: int = 32,
+                 workers: int = 2, cache_size: int = 64, ocr: Optional[Callable] = None):
+        """
+        Args:
+            max_width: Screenshots wider than this are downscaled first (default: 1280)
+            tile_height: Height of each OCR tile in pixels after downscaling (default: 480)
+            tile_overlap: Rows shared by neighbouring tiles, so lines on a boundary
+                are read whole in one of them (default: 32)
+            workers: Tiles recognized in parallel (default: 2)
+            cache_size: Screenshots whose text is kept (default: 64)
+            ocr: Callable taking a PIL image and returning its text (default: Tesseract)
+        """
+        from PIL import Image  # Optional dependency, only needed with screenshot OCR
+        self._image = Image
+        self.max_width = max_width
+        self.tile_height = tile_height
+        self.tile_overlap = tile_overlap
+        self.ocr = ocr or _tesseract_ocr()
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screenshot-ocr")
+        self.hits = 0
+        self.misses = 0
+
+    def _tiles(self, image) -> List:
+        image = image.convert("L")
+        if image.width > self.max_width:
+            height = max(1, round(image.height * self.max_width / image.width))
+            image = image.resize((self.max_width, height))
+        step = max(1, self.tile_height - self.tile_overlap)
+        return [image.crop((0, top, image.width, min(top + self.tile_height, image.height)))
+                for top in range(0, max(1, image.height - self.tile_overlap), step)]
+
+    @staticmethod
+    def _join(texts: List[str]) -> str:
+        """Join tile texts, dropping a line repeated across a tile boundary."""
+        lines: List[str] = []
+        for text in texts:
+            tile_lines = [line.strip() for line in text.splitlines() if line.strip()]
+            if lines and tile_lines and tile_lines[0] == lines[-1]:
+                tile_lines = tile_lines[1:]
+            lines.extend(tile_lines)
+        return "\n".join(lines)
+
+    def extract_text(self, data_url: str) -> str:
+        """Return the text in a screenshot data URL, from the cache when the image was seen before."""
+        image_bytes = decode_data_url(data_url)
+        key = hashlib.sha1(image_bytes).hexdigest()
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return self._cache[key]
+
+        self.misses += 1
+        image = self._image.open(io.BytesIO(image_bytes))
+        text = self._join(list(self._pool.map(self.ocr, self._tiles(image))))
+
+        self._cache[key] = text
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        logger.debug(f"Extracted {len(text)} characters from screenshot {key[:8]}")
+        return text
+
+    def close(self):
+        self._pool.shutdown(wait=False)
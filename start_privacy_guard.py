@@ -12,12 +12,116 @@ import os
 import time
 import argparse
 import signal
+import logging
+import threading
+import urllib.request
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
+class ServiceSpec:
+    """How to launch, probe and restart one service."""
+    
+    def __init__(self, name, cmd, cwd, env=None, health_url=None, restart=True):
+        self.name = name
+        self.cmd = cmd
+        self.cwd = cwd
+        self.env = env
+        self.health_url = health_url
+        self.restart = restart
+        self.restart_count = 0
+        self.next_restart_time = None
+        self.started_at = 0.0
+
 class ServiceManager:
-    def __init__(self):
+    def __init__(self, log_dir=None, max_restarts=5, restart_backoff=1.0, max_backoff=30.0):
         self.processes = {}
+        self.specs = {}
         self.base_dir = Path(__file__).parent
+        self.log_dir = Path(log_dir) if log_dir else self.base_dir / "logs"
+        self.max_restarts = max_restarts
+        self.restart_backoff = restart_backoff
+        self.max_backoff = max_backoff
+        self._stopping = False
+        self._lock = threading.Lock()
+    
+    def _service_logger(self, name):
+        """Get a logger writing the service's output to a rotating file."""
+        service_logger = logging.getLogger(f"service.{name}")
+        if not service_logger.handlers:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(self.log_dir / f"{name}.log", maxBytes=5 * 1024 * 1024, backupCount=3)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            service_logger.addHandler(handler)
+            service_logger.setLevel(logging.INFO)
+            service_logger.propagate = False
+        return service_logger
+    
+    def _drain_output(self, name, process):
+        """Copy a child's output into its log file so the pipe never fills up."""
+        service_logger = self._service_logger(name)
+        for line in iter(process.stdout.readline, b''):
+            service_logger.info(line.decode(errors="replace").rstrip())
+        process.stdout.close()
+    
+    def _launch(self, spec):
+        """Start the process for a spec and begin draining its output."""
+        process = subprocess.Popen(
+            spec.cmd,
+            cwd=spec.cwd,
+            env=spec.env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT
+        )
+        threading.Thread(target=self._drain_output, args=(spec.name, process), daemon=True).start()
+        spec.started_at = time.time()
+        with self._lock:
+            self.specs[spec.name] = spec
+            self.processes[spec.name] = process
+        return process
+    
+    def _probe(self, url, timeout=1.0):
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                return 200 <= response.status < 300
+        except Exception:
+            return False
+    
+    def wait_until_ready(self, name, timeout=60.0, poll_interval=0.2):
+        """Wait until a service answers its health probe.
+        
+        Returns False if the process exits or the timeout passes first.
+        Services without a health URL are ready as soon as they are running.
+        """
+        spec = self.specs.get(name)
+        process = self.processes.get(name)
+        if spec is None or process is None:
+            return False
+        
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if process.poll() is not None:
+                print(f"❌ {name} exited during startup (exit code: {process.returncode}), see {self.log_dir / (name + '.log')}")
+                return False
+            if spec.health_url is None or self._probe(spec.health_url):
+                print(f"✅ {name} ready after {time.time() - spec.started_at:.1f}s")
+                return True
+            time.sleep(poll_interval)
+        
+        print(f"❌ {name} not ready after {timeout:.0f}s")
+        return False
+    
+    def wait_all_ready(self, names, timeout=60.0):
+        """Probe several services concurrently, so the wait is bounded by the slowest one."""
+        results = {}
+        threads = [
+            threading.Thread(target=lambda n=name: results.__setitem__(n, self.wait_until_ready(n, timeout)))
+            for name in names
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return all(results.get(name, False) for name in names)
         
     def start_face_detection(self, model_path: str, api_host: str = "127.0.0.1", api_port: int = 8000):
         """Start the face detection service."""
@@ -40,13 +144,13 @@ class ServiceManager:
         ]
         
         try:
-            process = subprocess.Popen(
+            spec = ServiceSpec(
+                'face_detection',
                 cmd,
                 cwd=face_detect_dir,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+                health_url=f"http://{api_host}:{api_port}/health"
             )
-            self.processes['face_detection'] = process
+            process = self._launch(spec)
             print(f"✅ Face detection service started (PID: {process.pid})")
             return True
         except Exception as e:
@@ -87,14 +191,14 @@ class ServiceManager:
             env = os.environ.copy()
             env['PORT'] = str(port)
             
-            process = subprocess.Popen(
+            spec = ServiceSpec(
+                'central_server',
                 ["npm", "start"],
                 cwd=central_server_dir,
                 env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+                health_url=f"http://localhost:{port}/health"
             )
-            self.processes['central_server'] = process
+            process = self._launch(spec)
             print(f"✅ Central server started (PID: {process.pid})")
             return True
         except Exception as e:
@@ -121,17 +225,22 @@ class ServiceManager:
             cmd.extend(['--llm-url', kwargs['llm_url']])
         if 'check_interval' in kwargs:
             cmd.extend(['--check-interval', str(kwargs['check_interval'])])
+        if kwargs.get('embedded'):
+            cmd.extend(['--embedded', '--model-path', kwargs['model_path']])
+            if kwargs.get('serve_face_api'):
+                cmd.extend(['--serve-face-api', '--face-api-host', kwargs['face_api_host'],
+                            '--face-api-port', str(kwargs['face_api_port'])])
         if kwargs.get('test_once'):
             cmd.append('--test-once')
             
         try:
-            process = subprocess.Popen(
+            spec = ServiceSpec(
+                'privacy_guard',
                 cmd,
                 cwd=self.base_dir,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT
+                restart=not kwargs.get('test_once')
             )
-            self.processes['privacy_guard'] = process
+            process = self._launch(spec)
             print(f"✅ Privacy guard started (PID: {process.pid})")
             return True
         except Exception as e:
@@ -141,6 +250,7 @@ class ServiceManager:
     def stop_all(self):
         """Stop all running services."""
         print("\nStopping all services...")
+        self._stopping = True
         
         for service_name, process in self.processes.items():
             if process and process.poll() is None:  # Process is still running
@@ -158,6 +268,7 @@ class ServiceManager:
                     print(f"❌ Error stopping {service_name}: {e}")
         
         self.processes.clear()
+        self.specs.clear()
         print("All services stopped")
     
     def status(self):
@@ -187,18 +298,11 @@ class ServiceManager:
         
         try:
             print("\nAll services started. Press Ctrl+C to stop all services.")
-            print("Use 'python start_privacy_guard.py --status' to check service status.")
+            print(f"Service output is written to {self.log_dir}")
             
-            while True:
-                time.sleep(1)
-                # Check if any critical process has died
-                dead_services = []
-                for service_name, process in self.processes.items():
-                    if process.poll() is not None:
-                        dead_services.append(service_name)
-                
-                if dead_services:
-                    print(f"\n⚠️  Services died: {', '.join(dead_services)}")
+            while self.processes:
+                time.sleep(0.5)
+                if not self.supervise_once():
                     self.status()
                     break
                     
@@ -207,6 +311,40 @@ class ServiceManager:
         finally:
             self.stop_all()
 
+    def supervise_once(self):
+        """Restart crashed services with exponential backoff.
+        
+        Returns False once a service has crashed more than max_restarts times.
+        Services that exit cleanly are left stopped.
+        """
+        now = time.time()
+        for name, process in list(self.processes.items()):
+            if self._stopping or process.poll() is None:
+                continue
+            
+            spec = self.specs[name]
+            if process.returncode == 0 or not spec.restart:
+                print(f"\nℹ️  {name} exited (exit code: {process.returncode})")
+                del self.processes[name]
+                continue
+            
+            if spec.next_restart_time is None:
+                # A service that stayed up for a while gets a fresh restart budget
+                if now - spec.started_at > self.max_backoff * 2:
+                    spec.restart_count = 0
+                if spec.restart_count >= self.max_restarts:
+                    print(f"\n❌ {name} crashed {spec.restart_count + 1} times, giving up")
+                    return False
+                delay = min(self.restart_backoff * (2 ** spec.restart_count), self.max_backoff)
+                spec.next_restart_time = now + delay
+                print(f"\n⚠️  {name} crashed (exit code: {process.returncode}), restarting in {delay:.1f}s")
+            elif now >= spec.next_restart_time:
+                spec.restart_count += 1
+                spec.next_restart_time = None
+                new_process = self._launch(spec)
+                print(f"🔄 {name} restarted (PID: {new_process.pid}, restart #{spec.restart_count})")
+        return True
+
 def main():
     parser = argparse.ArgumentParser(description="Privacy Guard System Launcher")
     
@@ -215,6 +353,10 @@ def main():
     parser.add_argument('--server-only', action='store_true', help='Start only central server')
     parser.add_argument('--guard-only', action='store_true', help='Start only privacy guard')
     parser.add_argument('--status', action='store_true', help='Check service status')
+    parser.add_argument('--embedded', action='store_true',
+                        help='Run face detection inside the privacy guard process instead of as a separate service')
+    parser.add_argument('--serve-face-api', action='store_true',
+                        help='With --embedded, still serve the face count API for external consumers')
     
     # Face detection options
     parser.add_argument('--model-path', required=False, help='Path to ONNX model file for face detection')
@@ -231,9 +373,14 @@ def main():
     parser.add_argument('--check-interval', type=float, default=2.0, help='Privacy guard check interval')
     parser.add_argument('--test-once', action='store_true', help='Run privacy guard once and exit')
     
+    # Supervisor options
+    parser.add_argument('--log-dir', help='Directory for rotating service logs (default: ./logs)')
+    parser.add_argument('--startup-timeout', type=float, default=60.0, help='Seconds to wait for each service health check')
+    parser.add_argument('--max-restarts', type=int, default=5, help='Restarts allowed per crashed service before giving up')
+    
     args = parser.parse_args()
     
-    manager = ServiceManager()
+    manager = ServiceManager(log_dir=args.log_dir, max_restarts=args.max_restarts)
     
     if args.status:
         manager.status()
@@ -263,26 +410,45 @@ def main():
         print("Starting all Privacy Guard services...")
         print("=" * 50)
         
-        # Start face detection
-        if args.model_path:
-            success &= manager.start_face_detection(args.model_path, args.face_api_host, args.face_api_port)
-            time.sleep(2)  # Give face detection time to start
+        # Face detection and the central server don't depend on each other, so
+        # start both at once and only wait on their health checks
+        results = {}
+        starters = []
+        if args.embedded:
+            if not args.model_path:
+                print("Error: --model-path is required for --embedded")
+                sys.exit(1)
+            print("ℹ️  Face detection runs inside the privacy guard (embedded mode)")
+        elif args.model_path:
+            starters.append(threading.Thread(target=lambda: results.__setitem__(
+                'face_detection', manager.start_face_detection(args.model_path, args.face_api_host, args.face_api_port))))
         else:
             print("⚠️  Skipping face detection (no --model-path provided)")
+        starters.append(threading.Thread(target=lambda: results.__setitem__(
+            'central_server', manager.start_central_server(args.server_port))))
+        for starter in starters:
+            starter.start()
+        for starter in starters:
+            starter.join()
         
-        # Start central server
-        success &= manager.start_central_server(args.server_port)
-        time.sleep(2)  # Give server time to start
+        dependencies = list(results)
+        success &= all(results.values())
+        success = success and manager.wait_all_ready(dependencies, timeout=args.startup_timeout)
         
-        # Start privacy guard
+        # Start privacy guard once its dependencies answer
         guard_kwargs = {
             'face_api_url': args.face_api_url,
             'browser_server_url': args.browser_server_url,
             'llm_url': args.llm_url,
             'check_interval': args.check_interval,
-            'test_once': args.test_once
+            'test_once': args.test_once,
+            'embedded': args.embedded,
+            'model_path': args.model_path,
+            'serve_face_api': args.serve_face_api,
+            'face_api_host': args.face_api_host,
+            'face_api_port': args.face_api_port
         }
-        success &= manager.start_privacy_guard(**guard_kwargs)
+        success = success and manager.start_privacy_guard(**guard_kwargs)
     
     if not success:
         print("\n❌ Some services failed to start")
@@ -0,0 +1,29 @@
+import sys
+import os
+import pytest
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unified_privacy_guard as upg
+from tests.fakes import FakeBrowserClient, FakeChecker, FakeFaceClient, FakeScreen
+
+@pytest.fixture
+def make_guard():
+    """Build a UnifiedPrivacyGuard on fakes; returns (guard, face, browser, checker)."""
+    guards = []
+
+    def build(checker=None, **kwargs):
+        face, browser = FakeFaceClient(), FakeBrowserClient()
+        checker = checker or FakeChecker()
+        guard = upg.UnifiedPrivacyGuard(face_client=face, **kwargs)
+        guard.browser_client = browser
+        guard.sensitivity_checker = checker
+        if guard.llm_manager is not None:
+            guard.llm_manager.checker = checker
+        guard.screen_controller = FakeScreen()
+        guards.append(guard)
+        return guard, face, browser, checker
+
+    yield build
+    for guard in guards:
+        guard.stop()
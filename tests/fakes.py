@@ -0,0 +1,92 @@
+"""
+Stand-ins for the guard's face API, browser server, LLM and screen.
+"""
+import asyncio
+import sys
+import os
+import time
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unified_privacy_guard as upg
+
+class FakeFaceClient:
+    """Face client returning a settable count."""
+
+    def __init__(self, count: int = 2):
+        self.count = count
+        self.error = None
+
+    def get_face_count(self) -> int:
+        return self.count
+
+    def get_face_sample(self):
+        now = time.time()
+        sample = {"count": self.count, "trace_id": None, "captured_at": now, "changed_at": now,
+                  "received_at": now, "polled_at": now}
+        if self.error:
+            sample["error"] = self.error
+        return sample
+
+class FakeBrowserClient:
+    """Browser client returning the page last given to show()."""
+
+    def __init__(self):
+        self.data = {"url": "", "title": "", "dom": "", "screenshot": "", "timestamp": 0}
+
+    def show(self, url: str, dom: str = "", title: str = "", blocks=None):
+        self.data = {"url": url, "title": title, "dom": dom, "screenshot": "", "blocks": blocks or [],
+                     "timestamp": self.data["timestamp"] + 1}
+
+    def get_latest_browser_data(self):
+        return dict(self.data)
+
+class FakeChecker:
+    """SensitivityChecker stand-in: sensitive if a word of sensitive_words is in the content.
+
+    With fail set, every check raises SensitivityCheckError instead.
+    """
+
+    def __init__(self, sensitive_words=("balance",), latency: float = 0.0):
+        self.sensitive_words = sensitive_words
+        self.latency = latency
+        self.fail = False
+        self.calls = []
+        self.batches = []
+
+    def _verdict(self, content: str, url: str) -> bool:
+        self.calls.append((content, url))
+        if self.fail:
+            raise upg.SensitivityCheckError("LLM down")
+        return any(word in content.lower() for word in self.sensitive_words)
+
+    def is_sensitive(self, content: str, url: str) -> bool:
+        time.sleep(self.latency)
+        return self._verdict(content, url)
+
+    async def is_sensitive_async(self, session, content: str, url: str) -> bool:
+        await asyncio.sleep(self.latency)
+        return self._verdict(content, url)
+
+    async def is_sensitive_batch_async(self, session, items):
+        self.batches.append(list(items))
+        await asyncio.sleep(self.latency)
+        return [self._verdict(content, url) for content, url in items]
+
+class FakeScreen:
+    """ScreenController stand-in."""
+
+    def __init__(self):
+        self._is_dimmed = False
+
+    @property
+    def is_dimmed(self) -> bool:
+        return self._is_dimmed
+
+    def dim_screen(self, dim_percentage=None) -> bool:
+        self._is_dimmed = True
+        return True
+
+    def restore_brightness(self) -> bool:
+        self._is_dimmed = False
+        return True
@@ -0,0 +1,66 @@
+import sys
+import os
+import pytest
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from unified_privacy_guard import AdaptiveScheduler
+
+def test_defaults_follow_the_base_interval():
+    """Test that min and max intervals default to half and four times the base"""
+    scheduler = AdaptiveScheduler(0.5)
+
+    assert scheduler.min_interval == 0.25
+    assert scheduler.max_interval == 2.0
+
+@pytest.mark.parametrize("face_count, is_sensitive, dimmed, awaiting", [
+    (2, True, False, False),     # Sensitive page in view
+    (2, None, False, False),     # Several faces, page not classified yet
+    (0, False, True, False),     # Screen dimmed
+    (1, False, False, True),     # Check running
+])
+def test_alert_when_something_is_at_stake(face_count, is_sensitive, dimmed, awaiting):
+    """Test that risky situations are checked at min_interval"""
+    scheduler = AdaptiveScheduler(0.5)
+
+    assert scheduler.update(face_count, is_sensitive, dimmed, awaiting) == 0.25
+    assert scheduler.state == "alert"
+
+def test_rising_face_count_alerts_once():
+    """Test that a rising face count alerts, and the same count next cycle does not"""
+    scheduler = AdaptiveScheduler(0.5)
+    scheduler.update(0, False, False, False)
+
+    assert scheduler.update(1, False, False, False) == 0.25
+    assert scheduler.state == "alert"
+    scheduler.update(1, False, False, False)
+    assert scheduler.state == "idle"
+
+def test_watch_on_harmless_page_with_several_faces():
+    """Test that several faces on a harmless page are checked at the base interval"""
+    scheduler = AdaptiveScheduler(0.5)
+    scheduler.update(2, False, False, False)
+
+    assert scheduler.update(2, False, False, False) == 0.5
+    assert scheduler.state == "watch"
+
+def test_idle_backs_off_up_to_max_interval():
+    """Test that the idle interval grows by backoff per cycle and stops at max_interval"""
+    scheduler = AdaptiveScheduler(0.5, max_interval=1.0, backoff=1.5)
+
+    intervals = [scheduler.update(0, None, False, False) for _ in range(4)]
+
+    assert intervals == [0.75, 1.0, 1.0, 1.0]
+    assert scheduler.state == "idle"
+    # Anything at stake ends the backoff at once
+    assert scheduler.update(2, True, False, False) == 0.25
+
+def test_failed_check_does_not_back_off(make_guard):
+    """Test that a page whose check failed keeps the guard on alert instead of idling"""
+    guard, face, browser, checker = make_guard(tick_budget=0, adaptive_interval=True, degraded_policy="fail-open")
+    browser.show("https://bank.example", dom="Available balance")
+    checker.fail = True
+
+    guard.should_dim_screen()
+
+    assert guard.next_interval() == guard.scheduler.min_interval
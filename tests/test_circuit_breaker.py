@@ -0,0 +1,114 @@
+import sys
+import os
+import threading
+import time
+import pytest
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from unified_privacy_guard import BudgetedCalls, CircuitBreaker
+
+@pytest.fixture
+def breaker():
+    breaker = CircuitBreaker("test", failure_threshold=3, slow_threshold=0.5, reset_timeout=0.1)
+    yield breaker
+    breaker.close()
+
+def _fail(breaker, times: int):
+    for _ in range(times):
+        assert breaker.allow()
+        breaker.record(0.01, failed=True)
+
+def test_breaker_opens_after_failures_in_a_row(breaker):
+    """Test that failure_threshold failed calls in a row open the breaker, and a success resets the count"""
+    _fail(breaker, 2)
+    breaker.record(0.01)
+    _fail(breaker, 2)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    _fail(breaker, 1)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.trips == 1
+
+def test_slow_calls_count_as_failures(breaker):
+    """Test that calls slower than slow_threshold open the breaker"""
+    for _ in range(3):
+        breaker.record(1.0)
+
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_half_open_probe_closes_or_reopens(breaker):
+    """Test that after reset_timeout one probe goes through and its outcome decides the state"""
+    _fail(breaker, 3)
+    time.sleep(0.12)
+
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()  # One probe at a time
+    breaker.record(0.01, failed=True)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.12)
+    assert breaker.allow()
+    breaker.record(0.01)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_call_falls_back_on_timeout_and_while_the_call_runs(breaker):
+    """Test that call() waits at most its timeout and does not queue behind a stalled call"""
+    release = threading.Event()
+
+    start = time.monotonic()
+    assert breaker.call(lambda: release.wait(5), timeout=0.05, fallback=lambda: "fallback") == "fallback"
+    assert time.monotonic() - start < 1.0
+    assert breaker.timeouts == 1
+
+    assert breaker.call(lambda: "answer", timeout=1.0, fallback=lambda: "fallback") == "fallback"
+    release.set()
+    time.sleep(0.05)
+    assert breaker.call(lambda: "answer", timeout=1.0, fallback=lambda: "fallback") == "answer"
+
+def test_call_treats_failure_results_as_failures(breaker):
+    """Test that results matching is_failure get the fallback and count against the breaker"""
+    for _ in range(3):
+        result = breaker.call(lambda: {"error": "down"}, timeout=1.0, fallback=lambda: {},
+                              is_failure=lambda data: data.get("error"))
+        assert result == {}
+        time.sleep(0.02)
+
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_budgeted_call_is_picked_up_later():
+    """Test that a call not done within its timeout keeps running and is not started twice"""
+    calls = BudgetedCalls("test")
+    started = []
+
+    def slow():
+        started.append(1)
+        time.sleep(0.2)
+        return "text"
+
+    try:
+        assert calls.result("page", slow, timeout=0.01) == (False, None)
+        assert calls.running("page")
+        time.sleep(0.3)
+        assert calls.result("page", slow, timeout=0.01) == (True, "text")
+        assert len(started) == 1
+        assert not calls.running("page")
+    finally:
+        calls.close()
+
+def test_budgeted_calls_drop_other_keys():
+    """Test that asking for a new key cancels queued calls of other keys"""
+    calls = BudgetedCalls("test")
+    release = threading.Event()
+    try:
+        calls.result("first", lambda: release.wait(5), timeout=0)
+        calls.result("second", lambda: "second", timeout=0)
+        calls.result("third", lambda: "third", timeout=0)
+
+        assert not calls.running("first") and not calls.running("second")
+        release.set()
+        assert calls.result("third", lambda: "again", timeout=1.0) == (True, "third")
+    finally:
+        calls.close()
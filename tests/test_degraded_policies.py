@@ -0,0 +1,102 @@
+import sys
+import os
+import time
+import pytest
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from tests.fakes import FakeChecker
+
+def _open(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.allow()
+        breaker.record(0.01, failed=True)
+
+@pytest.mark.parametrize("policy, known, expected", [
+    ("fail-open", None, False),
+    ("fail-closed", False, True),
+    ("cached", False, False),
+    ("cached", None, True),
+])
+def test_open_llm_breaker_applies_the_policy(make_guard, policy, known, expected):
+    """Test the page verdict each policy gives while the LLM breaker is open"""
+    guard, face, browser, checker = make_guard(degraded_policy=policy)
+    if known is not None:
+        guard._url_verdicts["https://news.example"] = known
+    _open(guard.llm_breaker)
+
+    assert guard._ask_llm("Weather today", "https://news.example") is expected
+    assert guard._llm_degraded
+    assert not checker.calls
+
+@pytest.mark.parametrize("policy, expected", [("fail-open", 0), ("fail-closed", 2), ("cached", 1)])
+def test_face_fallback_applies_the_policy(make_guard, policy, expected):
+    """Test the face count each policy gives while the face API fails"""
+    guard, face, browser, checker = make_guard(degraded_policy=policy)
+    face.count = 1
+    guard._poll_face()
+
+    assert guard._face_fallback()["count"] == expected
+
+def test_cached_without_a_face_sample_assumes_no_faces(make_guard):
+    """Test that the cached policy fails open when the face API never answered"""
+    guard, face, browser, checker = make_guard(degraded_policy="cached", tick_budget=0.5)
+    face.error = "connection refused"
+    browser.show("https://bank.example", "Your balance is 100")
+
+    for _ in range(3):
+        assert guard.should_dim_screen()[0] is False
+    assert guard.last_face_sample["count"] == 0
+    assert not guard._received_face_sample
+
+def test_slow_llm_check_stays_within_the_budget(make_guard):
+    """Test that a sync check slower than the tick budget is waited for by later cycles, not the current one"""
+    guard, face, browser, checker = make_guard(checker=FakeChecker(latency=0.3), tick_budget=0.05)
+    browser.show("https://bank.example", dom="Available balance $3,214")
+
+    start = time.monotonic()
+    should_dim, reason = guard.should_dim_screen()
+
+    assert time.monotonic() - start < 0.25
+    assert reason == "Waiting for sensitivity check"
+    time.sleep(0.35)
+    should_dim, _ = guard.should_dim_screen()
+    assert should_dim
+    assert len(checker.calls) == 1
+
+def test_slow_camera_demand_does_not_block(make_guard):
+    """Test that a camera demand slower than the budget is confirmed by a later cycle"""
+    class SlowDemand:
+        def __init__(self):
+            self.modes = []
+
+        def set(self, mode, ttl=None):
+            time.sleep(0.2)
+            self.modes.append(mode)
+
+    demand = SlowDemand()
+    guard, face, browser, checker = make_guard(tick_budget=0.05, camera_demand=demand)
+    guard._url_verdicts["https://news.example"] = False
+    guard.last_browser_data = {"url": "https://news.example", "timestamp": 1}
+    guard._tick_deadline = time.time() + 0.05
+
+    start = time.monotonic()
+    guard._update_camera_demand()
+    assert time.monotonic() - start < 0.15
+    assert guard.camera_mode == "full"
+
+    time.sleep(0.25)
+    guard._update_camera_demand()
+    assert demand.modes == ["low"]
+    assert guard.camera_mode == "low"
+
+@pytest.mark.parametrize("policy, expected", [("fail-open", 0), ("cached", 2)])
+def test_counts_from_before_a_pause_are_unknown(make_guard, policy, expected):
+    """Test that a count captured before the camera resumed is not reused by the cached policy"""
+    guard, face, browser, checker = make_guard(degraded_policy=policy)
+    face.count = 1
+    guard._camera_resumed_at = time.time() + 60
+
+    guard.should_dim_screen()
+
+    assert guard.last_face_sample["count"] == expected
@@ -0,0 +1,62 @@
+import sys
+import os
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from unified_privacy_guard import BinaryFaceClient
+from face_counter import wire
+
+class IdleClosingHandler(BaseHTTPRequestHandler):
+    """Answers one record, then drops the kept-alive connection as an idle server does."""
+    protocol_version = "HTTP/1.1"
+    requests = 0
+
+    def do_GET(self):
+        type(self).requests += 1
+        body = wire.pack_record(type(self).requests, 100.0, camera_id=0, trace_id="ab" * 16, captured_at=99.5)
+        self.send_response(200)
+        self.send_header("Content-Type", wire.MEDIA_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server():
+    IdleClosingHandler.requests = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), IdleClosingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_binary_client_decodes_the_wire_record(server):
+    """Test that the binary client returns the fields of face_counter.wire"""
+    client = BinaryFaceClient(f"http://127.0.0.1:{server.server_port}/face-count")
+
+    sample = client.get_face_sample()
+
+    assert sample["count"] == 1
+    assert sample["received_at"] == 100.0
+    assert sample["captured_at"] == 99.5
+    assert sample["changed_at"] is None
+    assert sample["trace_id"] == "ab" * 16
+
+def test_binary_client_retries_on_a_closed_connection(server):
+    """Test that a poll after the server closed the kept connection succeeds on a new one"""
+    client = BinaryFaceClient(f"http://127.0.0.1:{server.server_port}/face-count")
+    client.get_face_sample()
+    time.sleep(0.1)
+
+    sample = client.get_face_sample()
+
+    assert "error" not in sample
+    assert sample["count"] == 2
@@ -0,0 +1,101 @@
+import sys
+import os
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from unified_privacy_guard import SensitivityChecker
+from tests.fakes import FakeChecker
+
+def _blocks(*texts):
+    return [{"hash": f"h-{text}", "text": text} for text in texts]
+
+def test_failed_check_is_not_recorded(make_guard):
+    """Test that a failed LLM check applies the degraded policy without becoming the page's verdict"""
+    guard, face, browser, checker = make_guard(tick_budget=0, degraded_policy="fail-open")
+    browser.show("https://bank.example", blocks=_blocks("Available balance $3,214"))
+    checker.fail = True
+
+    should_dim, _ = guard.should_dim_screen()
+
+    assert not should_dim
+    assert "https://bank.example" not in guard._url_verdicts
+    assert guard.page_verdicts.unclassified("https://bank.example", _blocks("Available balance $3,214"))
+
+    # Same page, LLM back: checked again instead of keeping the fail-open answer
+    checker.fail = False
+    should_dim, _ = guard.should_dim_screen()
+
+    assert should_dim
+    assert guard._url_verdicts["https://bank.example"] is True
+
+def test_failed_request_manager_check_is_degraded(make_guard):
+    """Test that a check failing on the request manager gets the degraded verdict"""
+    guard, face, browser, checker = make_guard(llm_concurrency=1, llm_wait=1.0, degraded_policy="fail-closed")
+    browser.show("https://news.example", dom="Weather today")
+    checker.fail = True
+
+    should_dim, _ = guard.should_dim_screen()
+
+    assert should_dim
+    assert guard._llm_degraded
+    assert "https://news.example" not in guard._url_verdicts
+
+def test_only_new_block_text_is_sent(make_guard):
+    """Test that the prompt for a changed page carries the text of its new blocks only"""
+    guard, face, browser, checker = make_guard(tick_budget=0)
+    browser.show("https://mail.example", title="Inbox", blocks=_blocks("Lunch on Friday?"))
+    guard.should_dim_screen()
+
+    browser.show("https://mail.example", title="Inbox", blocks=_blocks("Lunch on Friday?", "Your balance is low"))
+    should_dim, _ = guard.should_dim_screen()
+
+    content, url = checker.calls[-1]
+    assert content == "Inbox Your balance is low"
+    assert should_dim
+
+class PromptChecker(FakeChecker):
+    """Judges the prompt SensitivityChecker would send, so text cut from it goes unseen."""
+
+    def _verdict(self, content: str, url: str) -> bool:
+        payload, _ = SensitivityChecker()._request(content, url)
+        return super()._verdict(payload["messages"][-1]["content"], url)
+
+def test_each_block_gets_its_own_check(make_guard):
+    """Test that a sensitive block far into a long page is seen and harmless blocks stay harmless"""
+    guard, face, browser, checker = make_guard(checker=PromptChecker(), tick_budget=0)
+    filler = [{"hash": f"filler-{number}", "text": f"{number} " + "lorem ipsum " * 85} for number in range(5)]
+    blocks = filler + _blocks("Your account balance is $3,214")
+    browser.show("https://bank.example", title="Statement", blocks=blocks)
+
+    should_dim, _ = guard.should_dim_screen()
+
+    assert should_dim
+    assert not guard.page_verdicts.is_sensitive("https://bank.example", filler)
+    assert len(checker.calls) == len(blocks)
+
+class RecordingDemand:
+    """CaptureDemand stand-in recording the modes asked for."""
+
+    def __init__(self):
+        self.modes = []
+
+    def set(self, mode, ttl=None):
+        self.modes.append(mode)
+
+def test_new_content_at_the_same_url_resumes_the_camera(make_guard):
+    """Test that unclassified content shown without a URL change brings the camera back to full rate"""
+    demand = RecordingDemand()
+    guard, face, browser, checker = make_guard(tick_budget=0, camera_demand=demand, idle_camera_mode="paused")
+    browser.show("https://mail.example", title="Inbox", blocks=_blocks("Lunch on Friday?"))
+    guard.should_dim_screen()
+    guard._update_camera_demand()
+    assert guard.camera_mode == "paused"
+
+    # Single-page app: same URL, new block, last count from before the pause
+    face.count = 1
+    browser.show("https://mail.example", title="Inbox", blocks=_blocks("Lunch on Friday?", "Your balance is low"))
+    guard.should_dim_screen()
+    guard._update_camera_demand()
+
+    assert demand.modes == ["paused", "full"]
+    assert guard.camera_mode == "full"
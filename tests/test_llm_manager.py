@@ -0,0 +1,108 @@
+import sys
+import os
+import concurrent.futures
+import pytest
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from unified_privacy_guard import LLMRequestManager, SensitivityCheckError
+from tests.fakes import FakeChecker
+
+@pytest.fixture
+def managers():
+    """Create request managers and close them after the test."""
+    created = []
+
+    def create(checker, **kwargs):
+        manager = LLMRequestManager(checker, **kwargs)
+        created.append(manager)
+        return manager
+
+    yield create
+    for manager in created:
+        manager.close()
+
+def test_same_content_shares_one_call(managers):
+    """Test that concurrent requests for one page share a call and the verdict is reused"""
+    checker = FakeChecker(latency=0.1)
+    manager = managers(checker)
+
+    first = manager.submit("Available balance", "https://bank.example")
+    second = manager.submit("Available balance", "https://bank.example")
+
+    assert second is first
+    assert first.result(timeout=5) is True
+    assert manager.deduplicated == 1
+
+    assert manager.submit("Available balance", "https://bank.example").result(timeout=5) is True
+    assert len(checker.calls) == 1
+
+def test_failed_check_is_not_cached(managers):
+    """Test that a failure ends the future with SensitivityCheckError and is asked again next time"""
+    checker = FakeChecker()
+    manager = managers(checker)
+    checker.fail = True
+
+    with pytest.raises(SensitivityCheckError):
+        manager.submit("Available balance", "https://bank.example").result(timeout=5)
+
+    checker.fail = False
+    assert manager.submit("Available balance", "https://bank.example").result(timeout=5) is True
+    assert len(checker.calls) == 2
+
+def test_cancel_stale_keeps_the_current_page(managers):
+    """Test that requests of pages the user left are cancelled"""
+    checker = FakeChecker(latency=0.3)
+    manager = managers(checker, max_concurrency=2)
+
+    left = manager.submit("Old page", "https://old.example")
+    current = manager.submit("Available balance", "https://bank.example")
+
+    assert manager.cancel_stale("https://bank.example") == 1
+    with pytest.raises(concurrent.futures.CancelledError):
+        left.result(timeout=5)
+    assert current.result(timeout=5) is True
+    assert manager.cancelled == 1
+
+def test_checks_within_the_window_share_a_prompt(managers):
+    """Test that checks submitted together go to the LLM as one batched prompt"""
+    checker = FakeChecker()
+    manager = managers(checker, batch_size=3, batch_window=0.5)
+
+    futures = [manager.submit(text, f"https://{number}.example")
+               for number, text in enumerate(["Available balance", "Weather", "Recipes"])]
+
+    assert [future.result(timeout=5) for future in futures] == [True, False, False]
+    assert len(checker.batches) == 1
+    assert manager.batches == 1 and manager.batched_items == 3
+
+def test_failed_batch_is_not_cached(managers):
+    """Test that a failed batched prompt fails every item and nothing is cached"""
+    checker = FakeChecker()
+    manager = managers(checker, batch_size=2, batch_window=0.5)
+    checker.fail = True
+
+    futures = [manager.submit(text, "https://a.example") for text in ("Available balance", "Weather")]
+    for future in futures:
+        with pytest.raises(SensitivityCheckError):
+            future.result(timeout=5)
+
+    checker.fail = False
+    assert manager.submit("Available balance", "https://a.example").result(timeout=5) is True
+
+class PartialBatchChecker(FakeChecker):
+    """Batched answers leave the second item undecided."""
+
+    async def is_sensitive_batch_async(self, session, items):
+        verdicts = await super().is_sensitive_batch_async(session, items)
+        return [verdicts[0], None] + verdicts[2:]
+
+def test_undecided_batch_items_are_checked_alone(managers):
+    """Test that items the batched answer did not cover get a check of their own"""
+    checker = PartialBatchChecker()
+    manager = managers(checker, batch_size=2, batch_window=0.5)
+
+    futures = [manager.submit(text, "https://a.example") for text in ("Weather", "Available balance")]
+
+    assert [future.result(timeout=5) for future in futures] == [False, True]
+    assert checker.calls[-1] == ("Available balance", "https://a.example")
@@ -0,0 +1,36 @@
+import sys
+import os
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from unified_privacy_guard import PageVerdicts
+
+def _blocks(*hashes):
+    return [{"hash": block_hash, "text": f"text of {block_hash}"} for block_hash in hashes]
+
+def test_only_new_blocks_are_unclassified():
+    """Test that blocks with a verdict are not returned for classification again"""
+    verdicts = PageVerdicts()
+    verdicts.record("https://a.example", _blocks("h1", "h2"), False)
+
+    assert verdicts.unclassified("https://a.example", _blocks("h1", "h2", "h3")) == _blocks("h3")
+    assert verdicts.unclassified("https://b.example", _blocks("h1")) == _blocks("h1")
+
+def test_one_sensitive_block_makes_the_page_sensitive():
+    """Test that a page is sensitive while any of its current blocks is"""
+    verdicts = PageVerdicts()
+    verdicts.record("https://a.example", _blocks("h1"), False)
+    verdicts.record("https://a.example", _blocks("h2"), True)
+
+    assert verdicts.is_sensitive("https://a.example", _blocks("h1", "h2"))
+    # The sensitive block scrolled away
+    assert not verdicts.is_sensitive("https://a.example", _blocks("h1"))
+
+def test_least_recent_pages_are_dropped():
+    """Test that verdicts are kept for at most max_pages URLs"""
+    verdicts = PageVerdicts(max_pages=2)
+    for url in ("https://a.example", "https://b.example", "https://c.example"):
+        verdicts.record(url, _blocks("h1"), True)
+
+    assert verdicts.unclassified("https://a.example", _blocks("h1")) == _blocks("h1")
+    assert verdicts.is_sensitive("https://c.example", _blocks("h1"))
@@ -0,0 +1,43 @@
+import sys
+import os
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from unified_privacy_guard import SensitivityChecker
+
+def _user_prompt(payload) -> str:
+    return next(message["content"] for message in payload["messages"] if message["role"] == "user")
+
+def test_prompt_includes_truncated_content():
+    """Test that the page content, cut to max_item_chars, is part of the prompt"""
+    checker = SensitivityChecker(max_item_chars=20)
+
+    payload, _ = checker._request("Checking account ending 4821, balance $3,214", "https://bank.example/accounts")
+    prompt = _user_prompt(payload)
+
+    assert "URL: https://bank.example/accounts" in prompt
+    assert "Content: Checking account end" in prompt
+    assert "4821" not in prompt
+
+def test_single_and_batched_prompts_show_pages_alike():
+    """Test that a page reads the same in a single prompt and as a batch item"""
+    checker = SensitivityChecker(max_item_chars=50)
+    page = ("Checking account ending 4821", "https://bank.example/accounts")
+
+    single = _user_prompt(checker._request(*page)[0])
+    batched = _user_prompt(checker._batch_request([("Weather today", "https://news.example"), page])[0])
+
+    assert batched.endswith(f"Item 2\n{single}")
+
+def _answer(content: str):
+    return {"choices": [{"message": {"content": content}}]}
+
+def test_parse_batch_reads_verdicts():
+    """Test that a JSON array of yes/no strings or booleans gives one verdict per item"""
+    assert SensitivityChecker._parse_batch(_answer('["yes", "No", "no"]'), 3) == [True, False, False]
+    assert SensitivityChecker._parse_batch(_answer('Here you go: [true, false]'), 2) == [True, False]
+
+def test_parse_batch_rejects_malformed_answers():
+    """Test that an answer without a usable array of the right length leaves every item undecided"""
+    for content in ("yes", '["yes", "no"', '["yes"]', '["yes", "no", "no"]', "[yes, no]"):
+        assert SensitivityChecker._parse_batch(_answer(content), 2) == [None, None]
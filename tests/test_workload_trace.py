@@ -0,0 +1,126 @@
+import sys
+import os
+import json
+import pytest
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from workload_trace import (
+    Workload, WorkloadRecorder, dimmed_seconds, parse_policy, replay, verdict_key
+)
+
+START = 1_700_000_000.0
+
+def _bank_workload() -> Workload:
+    """One person, then a second one joining while a banking page is shown."""
+    content = "Accounts Available balance $3,214"
+    return Workload([
+        {"t": START, "k": "start", "settings": {"check_interval": 0.5}},
+        {"t": START, "k": "face", "count": 1, "error": False},
+        {"t": START + 1.0, "k": "page", "url": "https://bank.example", "title": "Accounts",
+         "dom": "Available balance $3,214", "blocks": [], "timestamp": 1},
+        {"t": START + 1.3, "k": "llm", "key": verdict_key(content, "https://bank.example"),
+         "url": "https://bank.example", "verdict": True, "latency": 0.3},
+        {"t": START + 3.0, "k": "face", "count": 2, "error": False},
+        {"t": START + 6.0, "k": "face", "count": 1, "error": False},
+    ])
+
+def test_recorder_writes_changes_only(tmp_path):
+    """Test that faces are recorded when the count changes and pages once, without screenshots"""
+    path = tmp_path / "trace.jsonl"
+    recorder = WorkloadRecorder(str(path), settings={"check_interval": 0.5})
+    for count in (1, 1, 2):
+        recorder.face({"count": count, "polled_at": START})
+    page = {"url": "https://a.example", "title": "A", "dom": "text", "screenshot": "data:...", "timestamp": 7}
+    recorder.page(page)
+    recorder.page(page)
+    recorder.page({"error": "down", "timestamp": 0})
+    recorder.verdict("A text", "https://a.example", True, 0.25)
+    recorder.close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+
+    assert [record["k"] for record in records] == ["start", "face", "face", "page", "llm"]
+    assert [record["count"] for record in records if record["k"] == "face"] == [1, 2]
+    assert "screenshot" not in records[3]
+    assert records[4]["key"] == verdict_key("A text", "https://a.example")
+
+def test_recorder_replaces_an_earlier_recording(tmp_path):
+    """Test that a new recording to the same file starts a fresh file"""
+    path = tmp_path / "trace.jsonl"
+    for count in (1, 2):
+        recorder = WorkloadRecorder(str(path), settings={"check_interval": 0.5})
+        recorder.face({"count": count, "polled_at": START})
+        recorder.close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+
+    assert [record["k"] for record in records] == ["start", "face"]
+    assert records[1]["count"] == 2
+
+def test_sessions_replay_one_at_a_time(tmp_path):
+    """Test that a file of appended recordings loads one session, with its own settings and times"""
+    later = START + 3600
+    path = tmp_path / "trace.jsonl"
+    path.write_text("\n".join(json.dumps(record) for record in [
+        {"t": START, "k": "start", "settings": {"check_interval": 0.5}},
+        {"t": START, "k": "face", "count": 1, "error": False},
+        {"t": later, "k": "start", "settings": {"check_interval": 2.0}},
+        {"t": later + 5, "k": "face", "count": 2, "error": False},
+    ]))
+
+    last, first = Workload.from_file(str(path)), Workload.from_file(str(path), session=0)
+
+    assert (last.settings, last.start, last.end) == ({"check_interval": 2.0}, later + 5, later + 5)
+    assert (first.settings, first.start, first.end) == ({"check_interval": 0.5}, START, START)
+    with pytest.raises(IndexError):
+        Workload.from_file(str(path), session=2)
+    with pytest.raises(ValueError):
+        Workload([json.loads(line) for line in path.read_text().splitlines()])
+
+def test_workload_looks_up_records_by_time():
+    """Test that face_at and page_at return the last record at or before a time"""
+    workload = _bank_workload()
+
+    assert workload.face_at(START - 1) is None
+    assert workload.face_at(START + 3.5)["count"] == 2
+    assert workload.page_at(START + 0.5) is None
+    assert workload.page_at(START + 2.0)["url"] == "https://bank.example"
+    assert workload.settings == {"check_interval": 0.5}
+
+def test_replay_is_deterministic():
+    """Test that a virtual-clock replay dims on the recorded decision and repeats exactly"""
+    first = replay(_bank_workload(), {"check_interval": 0.5})
+    second = replay(_bank_workload(), {"check_interval": 0.5})
+    for report in (first, second):
+        report.pop("decision_cpu_ms")
+
+    assert first == second
+    assert first["dims"] == 1 and first["restores"] == 1
+    assert first["llm_misses"] == 0
+    assert 2.5 <= first["dimmed_s"] <= 3.5
+
+def test_replay_compares_policies():
+    """Test that a slower fixed interval makes fewer decisions over the same workload"""
+    fast = replay(_bank_workload(), {"check_interval": 0.25})
+    slow = replay(_bank_workload(), {"check_interval": 1.0})
+
+    assert slow["decisions"] < fast["decisions"]
+    assert slow["dims"] == fast["dims"] == 1
+
+def test_request_manager_needs_realtime():
+    """Test that llm_concurrency is refused on the virtual clock"""
+    with pytest.raises(ValueError):
+        replay(_bank_workload(), {"llm_concurrency": 1})
+
+def test_parse_policy():
+    """Test that policy values parse as JSON where they can, else as strings"""
+    assert parse_policy("adaptive:adaptive_interval=true,max_interval=2,degraded_policy=fail-open") == (
+        "adaptive", {"adaptive_interval": True, "max_interval": 2, "degraded_policy": "fail-open"})
+    assert parse_policy(":") == ("default", {})
+
+def test_dimmed_seconds_counts_open_dims_to_the_end():
+    """Test that dimmed time adds up dim-restore pairs and a dim still active at the end"""
+    changes = [(10.0, "dim"), (12.0, "restore"), (15.0, "dim")]
+
+    assert dimmed_seconds(changes, 20.0) == 7.0
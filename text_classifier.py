@@ -0,0 +1,114 @@
+"""
+In-process text sensitivity classifier on ONNX Runtime, an alternative to
+asking the LLM server about every page.
+
+Expects a sequence classification model exported to ONNX (inputs input_ids,
+attention_mask and optionally token_type_ids; output logits of shape
+[batch, labels]) and its Hugging Face tokenizer.json, for example:
+
+    optimum-cli export onnx --model <fine-tuned-model> --task text-classification out/
+    python -c "from onnxruntime.quantization import quantize_dynamic, QuantType; \
+quantize_dynamic('out/model.onnx', 'out/model.int8.onnx', weight_type=QuantType.QInt8)"
+
+Needs onnxruntime (already used by the face counter) and tokenizers:
+    pip install tokenizers
+"""
+
+import logging
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class OnnxTextClassifier:
+    """Batched sensitivity probabilities from a quantized ONNX text classifier on the CPU."""
+
+    def __init__(self, model_path: str, tokenizer_path: Optional[str] = None, tokenizer=None,
+                 max_length: int = 256, batch_size: int = 8, sensitive_label: int = 1,
+                 providers: Optional[Sequence[str]] = None):
+        """
+        Args:
+            model_path: ONNX sequence classification model
+            tokenizer_path: tokenizer.json of the model
+            tokenizer: Already loaded tokenizers.Tokenizer, instead of tokenizer_path
+            max_length: Tokens per text, longer texts are truncated (default: 256)
+            batch_size: Texts per session run (default: 8)
+            sensitive_label: Index of the "sensitive" class in the logits (default: 1)
+            providers: ONNX Runtime providers (default: CPU)
+        """
+        import onnxruntime as ort
+        if tokenizer is None:
+            try:
+                from tokenizers import Tokenizer
+            except ImportError as e:
+                raise RuntimeError("The local classifier needs the tokenizers package (pip install tokenizers)") from e
+            if not tokenizer_path:
+                raise ValueError("tokenizer_path is required without a tokenizer")
+            tokenizer = Tokenizer.from_file(tokenizer_path)
+        tokenizer.enable_truncation(max_length=max_length)
+        tokenizer.enable_padding()
+        self.tokenizer = tokenizer
+        self.batch_size = batch_size
+        self.sensitive_label = sensitive_label
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, sess_options=options,
+                                            providers=list(providers or ["CPUExecutionProvider"]))
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        logger.info(f"Loaded text classifier {model_path} (inputs: {sorted(self.input_names)})")
+
+    def _run(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        feeds = {
+            "input_ids": np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+            "attention_mask": np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64),
+        }
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([encoding.type_ids for encoding in encodings], dtype=np.int64)
+        logits = self.session.run(None, {name: value for name, value in feeds.items() if name in self.input_names})[0]
+        logits = logits - logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        return probabilities[:, self.sensitive_label]
+
+    def probabilities(self, texts: Sequence[str]) -> List[float]:
+        """Probability that each text is sensitive, in batches of batch_size."""
+        results: List[float] = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = [text or " " for text in texts[start:start + self.batch_size]]
+            results.extend(float(p) for p in self._run(batch))
+        return results
+
+class LocalSensitivityClassifier:
+    """Confident verdicts from the local model; uncertain texts are left to the LLM."""
+
+    def __init__(self, classifier: OnnxTextClassifier, low: float = 0.2, high: float = 0.8):
+        """
+        Args:
+            classifier: Model giving sensitivity probabilities
+            low: At or below this probability a text is not sensitive (default: 0.2)
+            high: At or above this probability a text is sensitive (default: 0.8)
+        """
+        self.classifier = classifier
+        self.low = low
+        self.high = high
+        self.decided = 0
+        self.deferred = 0
+
+    def classify(self, texts: Sequence[str]) -> List[Tuple[Optional[bool], float]]:
+        """Verdict and probability per text; the verdict is None when the model is not confident."""
+        results = []
+        for probability in self.classifier.probabilities(texts):
+            if probability >= self.high:
+                verdict = True
+            elif probability <= self.low:
+                verdict = False
+            else:
+                verdict = None
+            if verdict is None:
+                self.deferred += 1
+            else:
+                self.decided += 1
+            results.append((verdict, probability))
+        return results
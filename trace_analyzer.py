@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Decision Trace Analyzer
+
+Reads the JSONL spans written by unified_privacy_guard.py --trace-file and
+prints end-to-end latency percentiles (from the face count changing to the
+screen brightness change) plus a per-stage breakdown.
+"""
+
+import argparse
+import json
+import math
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+ROOT_SPAN = "privacy_guard.screen_change"
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+def load_spans(path: str) -> List[Dict]:
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                spans.append(json.loads(line))
+    return spans
+
+def summarize(spans: List[Dict]) -> Dict[str, Dict[str, float]]:
+    """Group span durations (ms) by name, splitting the root span by action."""
+    durations = defaultdict(list)
+    for span in spans:
+        duration_ms = (span["end_time_unix_nano"] - span["start_time_unix_nano"]) / 1e6
+        name = span["name"]
+        if name == ROOT_SPAN:
+            name = f"end_to_end.{span.get('attributes', {}).get('action', 'unknown')}"
+        durations[name].append(duration_ms)
+    
+    return {
+        name: {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "max": max(values),
+        }
+        for name, values in durations.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze privacy guard decision traces")
+    parser.add_argument("trace_file", help="JSONL file written with --trace-file")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+    
+    summary = summarize(load_spans(args.trace_file))
+    if not summary:
+        print("No spans found")
+        sys.exit(1)
+    
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    
+    print(f"{'span':<40} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    print("-" * 86)
+    for name in sorted(summary, key=lambda n: (not n.startswith("end_to_end"), n)):
+        row = summary[name]
+        print(f"{name:<40} {row['count']:>6} {row['p50']:>9.1f} {row['p95']:>9.1f} {row['p99']:>9.1f} {row['max']:>9.1f}")
+
+if __name__ == "__main__":
+    main()
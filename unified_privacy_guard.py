@@ -15,14 +15,25 @@ The script automatically dims the screen when:
 
 import asyncio
 import aiohttp
+import concurrent.futures
 import requests
 import time
 import json
+import hashlib
 import logging
+import http.client
+import math
 import subprocess
 import os
-from typing import Dict, Optional, Any
+import queue
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Any
 from datetime import datetime
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -35,6 +46,73 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def add_face_counter_path():
+    """Make the face_counter package importable from the face-detect directory."""
+    face_detect_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "face-detect")
+    if face_detect_dir not in sys.path:
+        sys.path.insert(0, face_detect_dir)
+
+add_face_counter_path()
+from face_counter import wire
+from face_counter.metrics import MetricsRegistry
+
+class GuardMetrics:
+    """Latency histograms for each dependency of the privacy guard.
+    
+    Same histogram type and buckets as the face counter's /metrics, so the two
+    can be compared and aggregated directly.
+    """
+    
+    def __init__(self):
+        self.registry = MetricsRegistry(prefix="privacy_guard_")
+        self.face_poll = self.registry.histogram("face_poll_seconds", "Face count API request time")
+        self.browser_fetch = self.registry.histogram("browser_fetch_seconds", "Central server browser data request time")
+        self.llm_call = self.registry.histogram("llm_call_seconds", "LLM sensitivity check time")
+        self.brightness_change = self.registry.histogram("brightness_change_seconds", "Screen brightness change time")
+        self.decision = self.registry.histogram("decision_seconds", "Full check cycle time")
+        self.local_classifier = self.registry.histogram("local_classifier_seconds", "Local text classifier batch time")
+        self.screenshot_ocr = self.registry.histogram("screenshot_ocr_seconds", "Screenshot text extraction time")
+        self.check_interval = self.registry.histogram("check_interval_seconds", "Time until the next check cycle")
+    
+    def render(self) -> str:
+        return self.registry.render()
+
+# Process-wide metrics shared by all guard components
+metrics = GuardMetrics()
+
+class MetricsServer:
+    """Serves the guard metrics on GET /metrics from a background thread."""
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 8001):
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+    
+    def start(self):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info(f"Metrics available at http://{self.host}:{self.port}/metrics")
+    
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server = None
+
 class ScreenController:
     """Controls screen brightness on Windows systems."""
     
@@ -66,7 +144,8 @@ class ScreenController:
         
         try:
             cmd = f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, {self._dimmed_brightness})"
-            subprocess.run(["powershell", "-Command", cmd], check=True)
+            with metrics.brightness_change.time():
+                subprocess.run(["powershell", "-Command", cmd], check=True)
             self._is_dimmed = True
             logger.info(f"Screen dimmed to {self._dimmed_brightness}%")
             return True
@@ -78,7 +157,8 @@ class ScreenController:
         """Restore the screen brightness to its original value."""
         try:
             cmd = f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, {self._original_brightness})"
-            subprocess.run(["powershell", "-Command", cmd], check=True)
+            with metrics.brightness_change.time():
+                subprocess.run(["powershell", "-Command", cmd], check=True)
             self._is_dimmed = False
             logger.info(f"Screen brightness restored to {self._original_brightness}%")
             return True
@@ -93,19 +173,281 @@ class ScreenController:
 class FaceDetectionClient:
     """Client for face detection API."""
     
-    def __init__(self, api_url: str = "http://127.0.0.1:8000/face-count"):
+    def __init__(self, api_url: str = "http://127.0.0.1:8000/face-count", window_ms: Optional[float] = None):
+        """With window_ms set, each poll asks for the highest count over that
+        window instead of the latest one, so short events between polls are not missed."""
         self.api_url = api_url
+        self.window_ms = window_ms
     
     def get_face_count(self) -> int:
         """Get the current face count from the face detection API."""
+        return self.get_face_sample()["count"]
+    
+    def get_face_sample(self) -> Dict[str, Any]:
+        """Get the current face count together with its tracing timestamps.
+        
+        Returns a dict with count, trace_id, captured_at, changed_at,
+        received_at (when the API stored the count) and polled_at, all as
+        epoch seconds. Fields the API doesn't provide are None.
+        """
+        sample = {"count": 0, "trace_id": None, "captured_at": None, "changed_at": None,
+                  "received_at": None, "polled_at": None}
         try:
-            response = requests.get(self.api_url, timeout=3)
+            with metrics.face_poll.time():
+                if self.window_ms:
+                    response = requests.get(f"{self.api_url}/window", params={"window_ms": self.window_ms}, timeout=3)
+                else:
+                    response = requests.get(self.api_url, timeout=3)
+            sample["polled_at"] = time.time()
             response.raise_for_status()
             data = response.json()
-            return int(data.get("count", 0))
+            if self.window_ms:
+                window_max = data.get("max")
+                data = data.get("latest") or {}
+                if window_max is not None:
+                    data["count"] = window_max
+            sample["count"] = int(data.get("count", 0))
+            sample["trace_id"] = data.get("trace_id")
+            sample["captured_at"] = data.get("captured_at")
+            sample["changed_at"] = data.get("changed_at")
+            if data.get("timestamp"):
+                sample["received_at"] = datetime.fromisoformat(data["timestamp"]).timestamp()
+        except Exception as e:
+            logger.error(f"Error getting face count: {e}")
+            sample["error"] = str(e)
+        return sample
+
+class BinaryFaceClient:
+    """Face count client for the compact GET /face-count.bin endpoint.
+    
+    Keeps one connection open across polls, over TCP or the Unix domain socket
+    the face counter serves with --api-uds, and decodes a fixed-size record
+    (face_counter.wire) instead of parsing JSON. The server closes idle
+    connections (uvicorn after 5 s), so a request failing on a kept connection
+    is sent once more on a new one.
+    """
+    
+    def __init__(self, api_url: str = "http://127.0.0.1:8000/face-count", uds_path: Optional[str] = None):
+        parsed = urlparse(api_url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 80
+        self.path = f"{parsed.path or '/face-count'}.bin"
+        self.uds_path = uds_path
+        self._connection: Optional[http.client.HTTPConnection] = None
+    
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.uds_path:
+            return wire.UnixHTTPConnection(self.uds_path, timeout=3)
+        return http.client.HTTPConnection(self.host, self.port, timeout=3)
+    
+    def _get(self) -> tuple[int, bytes]:
+        kept = self._connection is not None
+        if not kept:
+            self._connection = self._connect()
+        try:
+            self._connection.request("GET", self.path)
+            response = self._connection.getresponse()
+            return response.status, response.read()
+        except (ConnectionError, http.client.HTTPException):
+            self._connection.close()
+            self._connection = None
+            if not kept:
+                raise
+            # Closed by the server while idle
+            return self._get()
+    
+    def get_face_count(self) -> int:
+        return self.get_face_sample()["count"]
+    
+    def get_face_sample(self) -> Dict[str, Any]:
+        """Same fields as FaceDetectionClient.get_face_sample."""
+        sample = {"count": 0, "trace_id": None, "captured_at": None, "changed_at": None,
+                  "received_at": None, "polled_at": None}
+        try:
+            with metrics.face_poll.time():
+                status, body = self._get()
+            sample["polled_at"] = time.time()
+            if status != 200:
+                raise RuntimeError(f"HTTP {status}")
+            record = wire.unpack_record(body)
+            sample["count"] = record["count"]
+            sample["received_at"] = record["timestamp"]
+            sample["captured_at"] = record["captured_at"]
+            sample["changed_at"] = record["changed_at"]
+            sample["trace_id"] = record["trace_id"]
         except Exception as e:
             logger.error(f"Error getting face count: {e}")
-            return 0
+            sample["error"] = str(e)
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+        return sample
+
+class CameraDemandClient:
+    """Sets the face counter's capture demand through its POST /demand endpoint.
+    
+    Has the set(mode, ttl) method of face_counter.demand.CaptureDemand, which the
+    guard uses directly when the counter runs in its process.
+    """
+    
+    def __init__(self, face_api_url: str = "http://127.0.0.1:8000/face-count", timeout: float = 0.5):
+        self.demand_url = f"{face_api_url.rsplit('/face-count', 1)[0]}/demand"
+        self.timeout = timeout
+    
+    def set(self, mode: str, ttl: Optional[float] = None):
+        params = {"mode": mode}
+        if ttl is not None:
+            params["ttl"] = ttl
+        requests.post(self.demand_url, params=params, timeout=self.timeout).raise_for_status()
+
+class SharedMemoryFaceClient:
+    """Face count client reading the face counter's shared memory block (--shm-name).
+    
+    A read is a few memory copies with no system call. Until the block exists,
+    or when its last count is older than stale_after seconds (writer gone),
+    samples come from the HTTP fallback client instead.
+    """
+    
+    def __init__(self, name: str, fallback, stale_after: float = 5.0):
+        add_face_counter_path()
+        from face_counter.shm_channel import SharedCountReader
+        self._reader_class = SharedCountReader
+        self.name = name
+        self.fallback = fallback
+        self.stale_after = stale_after
+        self._reader = None
+    
+    def get_face_count(self) -> int:
+        return self.get_face_sample()["count"]
+    
+    def get_face_sample(self) -> Dict[str, Any]:
+        """Same fields as FaceDetectionClient.get_face_sample."""
+        record = None
+        with metrics.face_poll.time():
+            try:
+                if self._reader is None:
+                    self._reader = self._reader_class(self.name)
+                record = self._reader.read()
+            except (FileNotFoundError, RuntimeError) as e:
+                logger.debug(f"Shared memory face count unavailable: {e}")
+            polled_at = time.time()
+        if record is None or polled_at - record["timestamp"] > self.stale_after:
+            return self.fallback.get_face_sample()
+        return {
+            "count": record["count"],
+            "trace_id": record["trace_id"],
+            "captured_at": record["captured_at"],
+            "changed_at": record["changed_at"],
+            "received_at": record["timestamp"],
+            "polled_at": polled_at,
+        }
+
+class InProcessFaceClient:
+    """Face count client fed through an in-memory queue instead of HTTP.
+    
+    Used in embedded mode, where the detector loop runs in the same process
+    and pushes a sample per frame with publish().
+    """
+    
+    def __init__(self, max_queue: int = 64):
+        self.samples: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._latest: Dict[str, Any] = {"count": 0, "trace_id": None, "captured_at": None, "changed_at": None,
+                                        "received_at": None, "polled_at": None}
+    
+    def publish(self, sample: Dict[str, Any]):
+        """Queue a sample from the detector loop, dropping the oldest if the guard falls behind."""
+        sample = dict(sample, received_at=time.time())
+        while True:
+            try:
+                self.samples.put_nowait(sample)
+                return
+            except queue.Full:
+                try:
+                    self.samples.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def get_face_count(self) -> int:
+        return self.get_face_sample()["count"]
+    
+    def get_face_sample(self) -> Dict[str, Any]:
+        """Return the newest queued sample without blocking."""
+        with metrics.face_poll.time():
+            while True:
+                try:
+                    self._latest = self.samples.get_nowait()
+                except queue.Empty:
+                    break
+        return dict(self._latest, polled_at=time.time())
+
+class EmbeddedFaceCounter:
+    """Runs the face counter's detector loop in a thread of the guard process."""
+    
+    def __init__(self, model_path: str, face_client: InProcessFaceClient, camera_id: int = 0,
+                 serve_api: bool = False, api_host: str = "127.0.0.1", api_port: int = 8000,
+                 source: Optional[str] = None):
+        self.model_path = model_path
+        self.source = source
+        self.face_client = face_client
+        self.camera_id = camera_id
+        self.serve_api = serve_api
+        self.api_host = api_host
+        self.api_port = api_port
+        self.camera = None
+        self.demand = None  # CaptureDemand of the camera loop, set by start()
+        self._thread: Optional[threading.Thread] = None
+        self._record_face_count = None
+    
+    def start(self):
+        """Load the model and start capturing. Imports face_counter only in this mode."""
+        add_face_counter_path()
+        from face_counter.detector import FaceDetector
+        from face_counter.camera_handler import CameraHandler
+        from face_counter.frame_source import open_frame_source
+        from face_counter.calibration import calibrate
+        
+        if self.serve_api:
+            # Keep the HTTP API for external consumers, fed from the same samples
+            from face_counter.api_server import start_server, record_face_count, set_warming_up, set_calibration, demand
+            self._record_face_count = record_face_count
+            self.demand = demand
+            set_warming_up()
+            threading.Thread(target=start_server, args=(self.api_host, self.api_port), daemon=True).start()
+        
+        else:
+            from face_counter.demand import CaptureDemand
+            self.demand = CaptureDemand()
+        
+        detector = FaceDetector(self.model_path)
+        calibration = calibrate(detector)
+        if self.serve_api:
+            set_calibration(calibration)
+        self.camera = CameraHandler(
+            detector=detector,
+            camera_id=self.camera_id,
+            api_endpoint=None,
+            frame_source=open_frame_source(self.source, loop=True) if self.source else None,
+            display=False,
+            on_count=self._on_count,
+            detection_interval=None if self.source else calibration["detection_interval"],
+            demand=self.demand
+        )
+        self._thread = threading.Thread(target=self.camera.start, name="embedded-face-counter", daemon=True)
+        self._thread.start()
+        logger.info(f"Embedded face counter started on camera {self.camera_id}")
+    
+    def _on_count(self, sample: Dict[str, Any]):
+        self.face_client.publish(sample)
+        if self._record_face_count is not None:
+            self._record_face_count(sample["count"], sample["camera_id"], sample["trace_id"],
+                                    sample["captured_at"], sample["changed_at"])
+    
+    def stop(self):
+        if self.camera is not None:
+            self.camera.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        logger.info("Embedded face counter stopped")
 
 class BrowserDataClient:
     """Client for browser extension data via central server."""
@@ -117,7 +459,8 @@ class BrowserDataClient:
     def get_latest_browser_data(self) -> Dict[str, Any]:
         """Get the latest browser data from central server."""
         try:
-            response = requests.get(f"{self.server_url}/{self.storage_key}", timeout=5)
+            with metrics.browser_fetch.time():
+                response = requests.get(f"{self.server_url}/{self.storage_key}", timeout=5)
             response.raise_for_status()
             data = response.json()
             
@@ -139,7 +482,10 @@ class BrowserDataClient:
 
                 browser_data["url"] = event_payload.get("url", "")
                 browser_data["title"] = event_payload.get("title", "")
-                browser_data["dom"] = event_payload.get("messageData", "").get("textContent", "")
+                message_data = event_payload.get("messageData") or {}
+                browser_data["dom"] = message_data.get("textContent", "")
+                browser_data["blocks"] = message_data.get("textBlocks") or []
+                browser_data["screenshot"] = event_payload.get("screenshot") or ""
                 
                 return browser_data
             
@@ -147,30 +493,87 @@ class BrowserDataClient:
             
         except Exception as e:
             logger.error(f"Error getting browser data: {e}")
-            return {"url": "", "title": "", "dom": "", "screenshot": "", "timestamp": 0}
+            return {"url": "", "title": "", "dom": "", "screenshot": "", "timestamp": 0, "error": str(e)}
+
+class PageVerdicts:
+    """Sensitivity verdicts per text block, so only new or changed blocks are classified.
+    
+    The extension splits page text into blocks identified by a hash of their
+    content. A page is sensitive if any of its current blocks was classified
+    as sensitive. Verdicts are kept for the most recent max_pages URLs.
+    """
+    
+    def __init__(self, max_pages: int = 32):
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[str, Dict[str, bool]]" = OrderedDict()
+    
+    def _page(self, url: str) -> Dict[str, bool]:
+        page = self._pages.setdefault(url, {})
+        self._pages.move_to_end(url)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return page
+    
+    def unclassified(self, url: str, blocks) -> list:
+        """Blocks of the page whose hash has no verdict yet."""
+        page = self._page(url)
+        return [block for block in blocks if block.get("hash") not in page]
+    
+    def record(self, url: str, blocks, is_sensitive: bool):
+        page = self._page(url)
+        for block in blocks:
+            page[block.get("hash")] = is_sensitive
+    
+    def is_sensitive(self, url: str, blocks) -> bool:
+        page = self._page(url)
+        return any(page.get(block.get("hash"), False) for block in blocks)
+
+class SensitivityCheckError(Exception):
+    """The LLM gave no usable answer; never to be taken as a verdict."""
 
 class SensitivityChecker:
     """LLM-based content sensitivity checker."""
     
-    def __init__(self, llm_url: str = "http://localhost:3001/api/v1/openai/chat/completions"):
+    SYSTEM_PROMPT = (
+        "You are a helpful assistant that determines if web content is sensitive. "
+        "If the content contains personal, financial, confidential, or private information, answer 'yes'. "
+        "If the URL is a known sensitive site (e.g., social media, banking), also answer 'yes'. "
+        "Otherwise, answer 'no'. Respond with only 'yes' or 'no'."
+    )
+    
+    # Kept byte-identical across calls so servers with prefix (KV) caching reuse it;
+    # only the user message changes between batches
+    BATCH_SYSTEM_PROMPT = (
+        "You are a helpful assistant that determines if web content is sensitive. "
+        "You are given numbered items, each with a URL and page content. "
+        "An item is sensitive if its content contains personal, financial, confidential, or private information, "
+        "or if its URL is a known sensitive site (e.g., social media, banking). "
+        "Respond with only a JSON array holding 'yes' or 'no' for each item, in order, e.g. [\"yes\", \"no\"]."
+    )
+    
+    def __init__(self, llm_url: str = "http://localhost:3001/api/v1/openai/chat/completions",
+                 max_item_chars: int = 2000):
         self.llm_url = llm_url
         self.api_token = os.environ.get("API_TOKEN", "")
         self.workspace_name = os.environ.get("WORKSPACE_NAME", "default")
+        # Content per page in a prompt, and per item in a batched prompt
+        self.max_item_chars = max_item_chars
     
-    def is_sensitive(self, content: str, url: str) -> bool:
-        """Check if the given content is sensitive using LLM."""
-        system_prompt = (
-            "You are a helpful assistant that determines if web content is sensitive. "
-            "If the content contains personal, financial, confidential, or private information, answer 'yes'. "
-            "If the URL is a known sensitive site (e.g., social media, banking), also answer 'yes'. "
-            "Otherwise, answer 'no'. Respond with only 'yes' or 'no'."
-        )
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.api_token:
+            headers['Authorization'] = f'Bearer {self.api_token}'
+        return headers
+    
+    def _item(self, content: str, url: str) -> str:
+        """One page as the prompts show it, alone or as an item of a batch."""
+        return f"URL: {url}\nContent: {content[:self.max_item_chars]}"
+    
+    def _request(self, content: str, url: str):
+        """Build the chat completion payload and headers."""
+        system_prompt = self.SYSTEM_PROMPT
         
-        user_prompt = (
-            f"URL: {url}\n"
-            # f"Content: {content[:8000]}\n"  # Truncate to 2000 chars
-            # "Is the content sensitive?"
-        )
+        user_prompt = self._item(content, url)
         
         payload = {
             "model": self.workspace_name,
@@ -180,25 +583,511 @@ class SensitivityChecker:
             ],
             "temperature": 0.7
         }
-        print(self.workspace_name)
+        return payload, self._headers()
+    
+    def _batch_request(self, items):
+        """Build one chat completion payload classifying several (content, url) items."""
+        user_prompt = "\n\n".join(
+            f"Item {number}\n{self._item(content, url)}"
+            for number, (content, url) in enumerate(items, 1)
+        )
+        payload = {
+            "model": self.workspace_name,
+            "messages": [
+                {"role": "system", "content": self.BATCH_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            "temperature": 0
+        }
+        return payload, self._headers()
+    
+    def _parse(self, data: Dict[str, Any], url: str) -> bool:
+        answer = data["choices"][0]["message"]["content"].strip().lower()
+        is_sensitive = answer.startswith("y")
+        logger.info(f"Content sensitivity check: {is_sensitive} for URL: {url[:50]}...")
+        return is_sensitive
+    
+    @staticmethod
+    def _parse_batch(data: Dict[str, Any], count: int) -> List[Optional[bool]]:
+        """Per-item verdicts of a batched answer; None for every item if the answer has the wrong shape."""
+        answer = data["choices"][0]["message"]["content"]
+        try:
+            verdicts = json.loads(answer[answer.index("["):answer.rindex("]") + 1])
+        except ValueError:
+            verdicts = None
+        if not isinstance(verdicts, list) or len(verdicts) != count:
+            logger.warning(f"Unusable batched sensitivity answer for {count} items: {answer[:100]!r}")
+            return [None] * count
+        return [verdict if isinstance(verdict, bool) else str(verdict).strip().lower().startswith("y")
+                for verdict in verdicts]
+    
+    def is_sensitive(self, content: str, url: str) -> bool:
+        """Check if the given content is sensitive using LLM.
+        
+        Raises SensitivityCheckError if the LLM fails, so the caller applies its
+        degraded policy instead of taking the failure for "not sensitive".
+        """
+        payload, headers = self._request(content, url)
         
         try:
-            headers = {"Content-Type": "application/json"}
-            if self.api_token:
-                headers['Authorization'] = f'Bearer {self.api_token}'
-            
-            response = requests.post(self.llm_url, json=payload, headers=headers, timeout=10)
+            with metrics.llm_call.time():
+                response = requests.post(self.llm_url, json=payload, headers=headers, timeout=10)
             response.raise_for_status()
-            data = response.json()
-            answer = data["choices"][0]["message"]["content"].strip().lower()
-            is_sensitive = answer.startswith("y")
+            return self._parse(response.json(), url)
             
-            logger.info(f"Content sensitivity check: {is_sensitive} for URL: {url[:50]}...")
-            return is_sensitive
+        except Exception as e:
+            logger.error(f"Error checking content sensitivity: {e}")
+            raise SensitivityCheckError(str(e)) from e
+    
+    async def is_sensitive_async(self, session: aiohttp.ClientSession, content: str, url: str) -> bool:
+        """Same as is_sensitive, on an event loop so the request can be cancelled.
+        
+        Raises SensitivityCheckError if the LLM fails.
+        """
+        payload, headers = self._request(content, url)
+        
+        try:
+            with metrics.llm_call.time():
+                async with session.post(self.llm_url, json=payload, headers=headers,
+                                        timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    response.raise_for_status()
+                    data = await response.json()
+            return self._parse(data, url)
+            
+        except asyncio.CancelledError:
+            logger.info(f"Cancelled sensitivity check for URL: {url[:50]}...")
+            raise
+        except Exception as e:
+            logger.error(f"Error checking content sensitivity: {e}")
+            raise SensitivityCheckError(str(e)) from e
+    
+    async def is_sensitive_batch_async(self, session: aiohttp.ClientSession, items) -> List[Optional[bool]]:
+        """Classify several (content, url) items with one LLM call.
+        
+        Returns a verdict per item, None for items the answer did not cover
+        (the caller can check those one by one). Raises SensitivityCheckError
+        if the LLM fails.
+        """
+        payload, headers = self._batch_request(items)
+        
+        try:
+            with metrics.llm_call.time():
+                async with session.post(self.llm_url, json=payload, headers=headers,
+                                        timeout=aiohttp.ClientTimeout(total=10 + 2 * len(items))) as response:
+                    response.raise_for_status()
+                    data = await response.json()
+            verdicts = self._parse_batch(data, len(items))
+            logger.info(f"Batched sensitivity check of {len(items)} items: {verdicts}")
+            return verdicts
             
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error(f"Error checking content sensitivity: {e}")
-            return False  # Default to not sensitive if LLM fails
+            raise SensitivityCheckError(str(e)) from e
+
+class LLMRequestManager:
+    """Runs sensitivity checks on a background event loop so the guard loop never blocks on the LLM.
+    
+    - Concurrent requests for the same content key share one LLM call (single-flight),
+      and recent verdicts are reused. A failed check ends its future with
+      SensitivityCheckError and is not kept, so the next request asks again.
+    - Requests for pages other than the current one can be cancelled.
+    - At most max_concurrency requests go to the LLM server at once.
+    - With batch_size > 1, checks submitted within batch_window seconds of each
+      other are sent as one batched prompt of up to batch_size items.
+    """
+    
+    def __init__(self, checker: SensitivityChecker, max_concurrency: int = 1, max_results: int = 128,
+                 batch_size: int = 1, batch_window: float = 0.05):
+        self.checker = checker
+        self.max_concurrency = max_concurrency
+        self.max_results = max_results
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        # Only touched on the event loop thread
+        self._pending = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.batched_items = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, "concurrent.futures.Future"] = {}
+        self._inflight_pages: Dict[str, str] = {}
+        self._results: "OrderedDict[str, bool]" = OrderedDict()
+        self.deduplicated = 0
+        self.cancelled = 0
+        
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-requests", daemon=True)
+        self._thread.start()
+        self._semaphore = asyncio.run_coroutine_threadsafe(self._make_semaphore(), self._loop).result()
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _make_semaphore(self) -> asyncio.Semaphore:
+        return asyncio.Semaphore(self.max_concurrency)
+    
+    @staticmethod
+    def key(content: str, url: str) -> str:
+        return hashlib.sha1(f"{url}\0{content}".encode()).hexdigest()
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        return self._session
+    
+    async def _run(self, content: str, url: str) -> bool:
+        if self.batch_size > 1:
+            return await self._run_batched(content, url)
+        async with self._semaphore:
+            return await self.checker.is_sensitive_async(self._get_session(), content, url)
+    
+    async def _run_batched(self, content: str, url: str) -> bool:
+        verdict = self._loop.create_future()
+        self._pending.append((content, url, verdict))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self.batch_window, self._flush)
+        # Cancelling the request cancels this future, and the flush then leaves it out
+        return await verdict
+    
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch = [item for item in self._pending if not item[2].done()]
+        self._pending = []
+        if batch:
+            self._loop.create_task(self._send_batch(batch))
+    
+    async def _send_batch(self, batch):
+        try:
+            async with self._semaphore:
+                session = self._get_session()
+                if len(batch) == 1:
+                    content, url, _ = batch[0]
+                    verdicts = [await self.checker.is_sensitive_async(session, content, url)]
+                else:
+                    verdicts = await self.checker.is_sensitive_batch_async(
+                        session, [(content, url) for content, url, _ in batch])
+                    self.batches += 1
+                    self.batched_items += len(batch)
+                for (content, url, future), verdict in zip(batch, verdicts):
+                    if verdict is None and not future.done():
+                        try:
+                            verdict = await self.checker.is_sensitive_async(session, content, url)
+                        except SensitivityCheckError as e:
+                            future.set_exception(e)
+                            continue
+                    if not future.done():
+                        future.set_result(verdict)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+    
+    def submit(self, content: str, url: str, page: Optional[str] = None) -> "concurrent.futures.Future":
+        """Start a check, or join the one already running for the same content and URL.
+        
+        Args:
+            content: Content to classify
+            url: Page URL
+            page: Page the request belongs to, for cancel_stale (default: url)
+        """
+        key = self.key(content, url)
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                future = concurrent.futures.Future()
+                future.set_result(self._results[key])
+                return future
+            if key in self._inflight:
+                self.deduplicated += 1
+                return self._inflight[key]
+            future = asyncio.run_coroutine_threadsafe(self._run(content, url), self._loop)
+            self._inflight[key] = future
+            self._inflight_pages[key] = page or url
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return future
+    
+    def _finish(self, key: str, future: "concurrent.futures.Future"):
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._inflight_pages.pop(key, None)
+            # Only verdicts are reused; failures and cancellations are asked again
+            if not future.cancelled() and future.exception() is None and isinstance(future.result(), bool):
+                self._results[key] = future.result()
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+    
+    def cancel_stale(self, current_page: str) -> int:
+        """Cancel in-flight requests of every page except current_page. Returns how many were cancelled."""
+        with self._lock:
+            stale = [future for key, future in self._inflight.items() if self._inflight_pages[key] != current_page]
+        for future in stale:
+            if future.cancel():
+                self.cancelled += 1
+        return len(stale)
+    
+    def close(self):
+        async def _close():
+            if self._session is not None:
+                await self._session.close()
+        asyncio.run_coroutine_threadsafe(_close(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+class CircuitBreaker:
+    """Per-dependency circuit breaker with latency-based tripping.
+    
+    - Closed: calls go through. failure_threshold failed or slow calls in a
+      row (slower than slow_threshold, or not done within the caller's timeout)
+      open the breaker.
+    - Open: calls are answered by the fallback at once for reset_timeout seconds.
+    - Half-open: one probe call goes through; success closes the breaker,
+      failure opens it again.
+    
+    call() runs the dependency on the breaker's own worker thread and waits at
+    most the given timeout, so a stalled dependency costs the caller that
+    timeout and never more. While an abandoned call is still running, later
+    calls get the fallback instead of queueing behind it.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+    
+    def __init__(self, name: str, failure_threshold: int = 3, slow_threshold: float = 1.0,
+                 reset_timeout: float = 5.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_threshold = slow_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"breaker-{name}")
+        self._running: Optional[concurrent.futures.Future] = None
+        self.trips = 0
+        self.rejected = 0
+        self.timeouts = 0
+    
+    def allow(self) -> bool:
+        """Whether a call may go to the dependency now; starts a probe when the open period is over."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.time() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+    
+    def record(self, duration: float, failed: bool = False):
+        """Record the outcome of a call that allow() let through."""
+        failed = failed or duration > self.slow_threshold
+        with self._lock:
+            self._probing = False
+            if not failed:
+                if self.state != self.CLOSED:
+                    logger.info(f"Circuit breaker {self.name} closed")
+                self.state = self.CLOSED
+                self._failures = 0
+                return
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                    logger.warning(f"Circuit breaker {self.name} open after {self._failures} failed or slow calls "
+                                   f"(last {duration:.2f} s)")
+                self.state = self.OPEN
+                self._opened_at = time.time()
+    
+    def release(self):
+        """Give back a probe that allow() granted but that made no call."""
+        with self._lock:
+            self._probing = False
+    
+    def call(self, fn, timeout: float, fallback, is_failure=None):
+        """Run fn within timeout seconds, or return fallback() if the breaker is open, fn is too slow or fails.
+        
+        Args:
+            fn: Dependency call
+            timeout: Longest wait for fn
+            fallback: Called for the result when fn is not run or not done in time
+            is_failure: Optional predicate telling whether a returned result is a failure
+        """
+        if timeout <= 0 or (self._running is not None and not self._running.done()):
+            self.rejected += 1
+            return fallback()
+        if not self.allow():
+            return fallback()
+        
+        start = time.time()
+        outcome = {"timed_out": False}
+        
+        def finished(future: concurrent.futures.Future):
+            failed = outcome["timed_out"] or future.exception() is not None
+            if not failed and is_failure is not None:
+                failed = bool(is_failure(future.result()))
+            self.record(time.time() - start, failed)
+        
+        self._running = self._executor.submit(fn)
+        try:
+            result = self._running.result(timeout=max(0.0, timeout))
+            return fallback() if is_failure is not None and is_failure(result) else result
+        except concurrent.futures.TimeoutError:
+            outcome["timed_out"] = True
+            self.timeouts += 1
+            logger.debug(f"{self.name} did not answer within {timeout:.2f} s")
+            return fallback()
+        except Exception as e:
+            logger.error(f"Error calling {self.name}: {e}")
+            return fallback()
+        finally:
+            self._running.add_done_callback(finished)
+    
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+class BudgetedCalls:
+    """Slow calls run on a worker thread, waited for only as long as a check cycle's budget allows.
+    
+    A call not done in time keeps running, and the next cycle asking for the
+    same key takes its result instead of starting it again. Asking for a new
+    key drops the calls of every other key; those not started yet are cancelled.
+    """
+    
+    def __init__(self, name: str):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self._pending: Dict[str, concurrent.futures.Future] = {}
+    
+    def running(self, key: str) -> bool:
+        return key in self._pending
+    
+    def result(self, key: str, fn, timeout: float) -> tuple[bool, Any]:
+        """(True, result of fn) if the call for key is done within timeout, else (False, None).
+        
+        Exceptions of fn are raised once its call is done.
+        """
+        future = self._pending.get(key)
+        if future is None:
+            for stale in self._pending.values():
+                stale.cancel()
+            self._pending = {key: self._executor.submit(fn)}
+            future = self._pending[key]
+        done, _ = concurrent.futures.wait([future], timeout=max(0.0, timeout))
+        if not done:
+            return False, None
+        del self._pending[key]
+        return True, future.result()
+    
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+class DecisionTracer:
+    """Writes end-to-end decision spans to a JSONL file.
+    
+    Each screen change becomes one trace, keyed by the trace ID of the face
+    count that caused it. Spans follow the OpenTelemetry field names
+    (trace_id, span_id, parent_span_id, start/end_time_unix_nano, attributes)
+    so the file can be converted or imported without reshaping.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+        logger.info(f"Writing decision traces to {path}")
+    
+    @staticmethod
+    def _span(trace_id: str, name: str, start: float, end: float, parent_span_id: Optional[str] = None,
+              attributes: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return {
+            "trace_id": trace_id,
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_span_id": parent_span_id,
+            "name": name,
+            "start_time_unix_nano": int(start * 1e9),
+            "end_time_unix_nano": int(end * 1e9),
+            "attributes": attributes or {},
+        }
+    
+    def record_screen_change(self, face_sample: Dict[str, Any], decided_at: float, action: str,
+                             action_start: float, action_end: float, reason: str):
+        """Record the spans leading from the triggering frame to a brightness change."""
+        trace_id = face_sample.get("trace_id") or uuid.uuid4().hex
+        captured_at = face_sample.get("captured_at")
+        changed_at = face_sample.get("changed_at") or captured_at
+        received_at = face_sample.get("received_at")
+        polled_at = face_sample.get("polled_at") or decided_at
+        origin = changed_at or received_at or polled_at
+        
+        root = self._span(trace_id, "privacy_guard.screen_change", origin, action_end, attributes={
+            "action": action,
+            "reason": reason,
+            "face_count": face_sample.get("count"),
+        })
+        spans = [root]
+        stages = [
+            ("face_counter.count_unchanged", changed_at, captured_at),
+            ("face_counter.detect_and_publish", captured_at, received_at),
+            ("privacy_guard.face_poll", received_at, polled_at),
+            ("privacy_guard.decision", polled_at, decided_at),
+            (f"screen_controller.{action}", action_start, action_end),
+        ]
+        for name, start, end in stages:
+            if start is not None and end is not None:
+                spans.append(self._span(trace_id, name, start, end, parent_span_id=root["span_id"]))
+        
+        with self._lock:
+            for span in spans:
+                self._file.write(json.dumps(span) + "\n")
+            self._file.flush()
+    
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+class AdaptiveScheduler:
+    """Check interval that follows how much is at stake.
+    
+    - alert (min_interval): the screen is dimmed, a sensitivity check is
+      running, the face count just rose, the page is sensitive, or several
+      faces are on a page not classified yet
+    - watch (base_interval): several faces on a page known to be harmless,
+      or one face on a page not classified yet
+    - idle: nobody in view, or one face on a harmless page; the interval
+      grows by backoff per cycle up to max_interval
+    """
+    
+    def __init__(self, base_interval: float, min_interval: Optional[float] = None,
+                 max_interval: Optional[float] = None, backoff: float = 1.5):
+        self.base_interval = base_interval
+        self.min_interval = base_interval / 2 if min_interval is None else min_interval
+        self.max_interval = base_interval * 4 if max_interval is None else max_interval
+        self.backoff = backoff
+        self.interval = base_interval
+        self.state = "watch"
+        self._last_face_count = 0
+    
+    def update(self, face_count: int, is_sensitive: Optional[bool], dimmed: bool, awaiting: bool) -> float:
+        """Interval until the next check, given what the last check saw."""
+        rising = face_count > self._last_face_count
+        self._last_face_count = face_count
+        if dimmed or awaiting or rising or is_sensitive or (face_count > 1 and is_sensitive is None):
+            self.state, self.interval = "alert", self.min_interval
+        elif face_count > 1 or (face_count == 1 and is_sensitive is None):
+            self.state, self.interval = "watch", self.base_interval
+        else:
+            self.state = "idle"
+            self.interval = min(self.max_interval, max(self.interval, self.base_interval) * self.backoff)
+        return self.interval
 
 class UnifiedPrivacyGuard:
     """Main privacy guard controller that integrates all components."""
@@ -207,16 +1096,103 @@ class UnifiedPrivacyGuard:
                  face_api_url: str = "http://127.0.0.1:8000/face-count",
                  browser_server_url: str = "http://localhost:3000/api/storage",
                  llm_url: str = "http://localhost:3001/api/v1/openai/chat/completions",
-                 check_interval: float = 0.5):
+                 check_interval: float = 0.5,
+                 trace_file: Optional[str] = None,
+                 face_client=None,
+                 face_window_ms: Optional[float] = None,
+                 screenshot_extractor=None,
+                 min_dom_chars: int = 200,
+                 llm_concurrency: int = 0,
+                 llm_wait: float = 0.2,
+                 local_classifier=None,
+                 llm_batch_size: int = 1,
+                 llm_batch_window: float = 0.05,
+                 tick_budget: Optional[float] = None,
+                 degraded_policy: str = "cached",
+                 llm_slow_threshold: float = 5.0,
+                 breaker_reset: float = 5.0,
+                 adaptive_interval: bool = False,
+                 min_interval: Optional[float] = None,
+                 max_interval: Optional[float] = None,
+                 camera_demand=None,
+                 idle_camera_mode: str = "low",
+                 camera_demand_ttl: float = 10.0,
+                 recorder=None):
         
-        self.face_client = FaceDetectionClient(face_api_url)
+        self.face_client = face_client or FaceDetectionClient(face_api_url, window_ms=face_window_ms)
         self.browser_client = BrowserDataClient(browser_server_url)
         self.sensitivity_checker = SensitivityChecker(llm_url)
         self.screen_controller = ScreenController()
         self.check_interval = check_interval
+        # With adaptive_interval, check_interval is the base of an AdaptiveScheduler
+        self.scheduler = AdaptiveScheduler(check_interval, min_interval, max_interval) if adaptive_interval else None
+        # Screenshots are OCR'd only for pages with less DOM text than min_dom_chars
+        self.screenshot_extractor = screenshot_extractor
+        self.min_dom_chars = min_dom_chars
+        self.page_verdicts = PageVerdicts()
+        # With a request manager, a check cycle waits at most llm_wait seconds for
+        # the LLM and keeps the current screen state until the verdict arrives.
+        # The new blocks of a page are checked one request each; with
+        # llm_batch_size > 1 those requests share batched prompts
+        self.llm_manager = (LLMRequestManager(self.sensitivity_checker, llm_concurrency,
+                                              batch_size=llm_batch_size, batch_window=llm_batch_window)
+                            if llm_concurrency > 0 else None)
+        self.llm_wait = llm_wait
+        self._awaiting_llm = False
+        # Optional text_classifier.LocalSensitivityClassifier, consulted before the LLM
+        self.local_classifier = local_classifier
+        
+        # A check cycle waits at most tick_budget seconds (default: check_interval) for
+        # the face API and browser server. Each dependency has a circuit breaker; while
+        # one is open, degraded_policy decides in its place:
+        #   fail-open    not sensitive / no faces
+        #   fail-closed  sensitive / several faces
+        #   cached       last verdict of the page / last face count (fail-closed without one)
+        #   local        local classifier probability, else as cached
+        # tick_budget 0 disables the budget and the breakers.
+        self.tick_budget = check_interval if tick_budget is None else tick_budget
+        self.degraded_policy = degraded_policy
+        if self.tick_budget > 0:
+            self.face_breaker = CircuitBreaker("face_api", slow_threshold=self.tick_budget, reset_timeout=breaker_reset)
+            self.browser_breaker = CircuitBreaker("browser_server", slow_threshold=self.tick_budget,
+                                                  reset_timeout=breaker_reset)
+            self.llm_breaker = CircuitBreaker("llm", slow_threshold=llm_slow_threshold, reset_timeout=breaker_reset)
+        else:
+            self.face_breaker = self.browser_breaker = self.llm_breaker = None
+        self._tick_deadline = math.inf
+        # Within the budget, sync LLM checks (llm_concurrency 0), screenshot OCR,
+        # the local classifier and camera demands run off the guard thread;
+        # whatever is not done in time is picked up by a later cycle
+        self._llm_calls = BudgetedCalls("guard-llm")
+        self._ocr_calls = BudgetedCalls("guard-ocr")
+        self._local_calls = BudgetedCalls("guard-local")
+        self._demand_calls = BudgetedCalls("guard-demand")
+        self._llm_degraded = False
+        self._llm_watched = set()
+        self._url_verdicts: "OrderedDict[str, bool]" = OrderedDict()
+        
+        # With camera_demand (a CaptureDemand or CameraDemandClient), the camera
+        # runs at full rate only while the page is sensitive or not classified yet,
+        # the screen is dimmed or a check is running, and in idle_camera_mode
+        # (low or paused) while the page content shown is known to be harmless. Demands are leases of
+        # camera_demand_ttl seconds, renewed at half of it.
+        self.camera_demand = camera_demand
+        self.idle_camera_mode = idle_camera_mode
+        self.camera_demand_ttl = camera_demand_ttl
+        self.camera_mode = "full"
+        self._camera_demand_sent_at = 0.0
+        self._camera_resumed_at = 0.0
+        self._peeked_page: Optional[Dict[str, Any]] = None
         
         self.last_check_time = 0
         self.last_browser_data = {}
+        self.last_face_sample: Dict[str, Any] = {}
+        self._received_face_sample: Dict[str, Any] = {}
+        self.tracer = DecisionTracer(trace_file) if trace_file else None
+        # Optional workload_trace.WorkloadRecorder, given every face sample, browser
+        # event and LLM verdict; recording also polls the browser with one face or none
+        self.recorder = recorder
+        self._llm_recorded = set()
         self.running = False
         
         logger.info("Unified Privacy Guard initialized")
@@ -226,25 +1202,47 @@ class UnifiedPrivacyGuard:
         Determine if screen should be dimmed based on face count and content sensitivity.
         Returns (should_dim, reason)
         """
+        self._tick_deadline = time.time() + self.tick_budget if self.tick_budget > 0 else math.inf
+        self._llm_degraded = False
+        
         # Get face count
-        face_count = self.face_client.get_face_count()
+        if self.face_breaker is not None:
+            self.last_face_sample = self.face_breaker.call(self._poll_face, self._remaining(),
+                                                           self._face_fallback, is_failure=lambda sample: sample.get("error"))
+        else:
+            self.last_face_sample = self._poll_face()
+        if self.recorder is not None:
+            self.recorder.face(self.last_face_sample)
+        captured_at = self.last_face_sample.get("captured_at")
+        if self._camera_resumed_at and captured_at and captured_at < self._camera_resumed_at:
+            # Captured before the camera was paused: the count is unknown, so
+            # the cached policies cannot reuse it either
+            self.last_face_sample = self._face_fallback(stale=True)
+        face_count = self.last_face_sample["count"]
         logger.debug(f"Face count: {face_count}")
         
         # If only 1 or fewer faces, no need to dim
         if face_count <= 1:
+            if self.camera_mode != "full" or self.recorder is not None:
+                self._peek_page()
             return False, f"Only {face_count} face(s) detected"
         
-        # Get browser data
-        browser_data = self.browser_client.get_latest_browser_data()
+        # Get browser data; while the server is failing the last data is reused
+        browser_data = self._get_browser_data()
         
         # Check if we have new data
         if browser_data["timestamp"] == self.last_browser_data.get("timestamp", 0):
-            # No new data, use previous decision but check face count
-            if face_count > 1 and self.screen_controller.is_dimmed:
-                return True, "Multiple faces detected, keeping screen dimmed"
-            return False, "No new browser data"
+            if self._awaiting_llm:
+                # Same page, look again for the verdict of the running check
+                browser_data = self.last_browser_data
+            else:
+                # No new data, use previous decision but check face count
+                if face_count > 1 and self.screen_controller.is_dimmed:
+                    return True, "Multiple faces detected, keeping screen dimmed"
+                return False, "No new browser data"
         
         self.last_browser_data = browser_data
+        self._peeked_page = None
         
         url = browser_data.get("url", "")
         dom_content = browser_data.get("dom", "")
@@ -252,35 +1250,371 @@ class UnifiedPrivacyGuard:
         
         # Combine available content for sensitivity analysis
         content_to_analyze = f"{title} {dom_content}".strip()
+        blocks = list(browser_data.get("blocks") or [])
+        screenshot = browser_data.get("screenshot", "")
+        if self.screenshot_extractor and screenshot and len(dom_content.strip()) < self.min_dom_chars:
+            screenshot_text = self._screenshot_text(screenshot)
+            if screenshot_text is None:
+                self._awaiting_llm = True
+                return self.screen_controller.is_dimmed, "Waiting for screenshot text"
+            content_to_analyze = f"{content_to_analyze} {screenshot_text}".strip()
+            if blocks and screenshot_text:
+                blocks.append({"hash": f"ocr-{hashlib.sha1(screenshot_text.encode()).hexdigest()}", "text": screenshot_text})
         
         if not content_to_analyze and not url:
             return False, "No content to analyze"
         
-        # Check content sensitivity
-        is_sensitive = self.sensitivity_checker.is_sensitive(content_to_analyze, url)
+        # Check content sensitivity, per text block when the extension sends them
+        if blocks:
+            is_sensitive = self._classify_blocks(url, title, blocks)
+        else:
+            is_sensitive = self._check_sensitivity(content_to_analyze, url)
+        
+        # A verdict of the degraded policy is not the page's; look again next cycle
+        self._awaiting_llm = is_sensitive is None or self._llm_degraded
+        if is_sensitive is not None and not self._llm_degraded:
+            self._url_verdicts[url] = is_sensitive
+            self._url_verdicts.move_to_end(url)
+            while len(self._url_verdicts) > self.page_verdicts.max_pages:
+                self._url_verdicts.popitem(last=False)
+        if is_sensitive is None:
+            return self.screen_controller.is_dimmed, "Waiting for sensitivity check"
         
         if face_count > 1 and is_sensitive:
             return True, f"Multiple faces ({face_count}) detected with sensitive content"
         
         return False, f"Content not sensitive or insufficient faces ({face_count})"
     
+    def _get_browser_data(self) -> Dict[str, Any]:
+        if self.browser_breaker is not None:
+            browser_data = self.browser_breaker.call(self.browser_client.get_latest_browser_data, self._remaining(),
+                                                     lambda: self.last_browser_data or {"timestamp": 0},
+                                                     is_failure=lambda data: data.get("error"))
+        else:
+            browser_data = self.browser_client.get_latest_browser_data()
+        if self.recorder is not None:
+            self.recorder.page(browser_data)
+        return browser_data
+    
+    def _peek_page(self):
+        """Note the page shown while the camera is not at full rate, without classifying it.
+        
+        The face count is too stale then to skip looking at the browser; the page
+        is classified once several faces are seen, as usual.
+        """
+        browser_data = self._get_browser_data()
+        if browser_data["timestamp"] != self.last_browser_data.get("timestamp", 0):
+            self._peeked_page = browser_data
+    
+    def _known_harmless(self, browser_data: Dict[str, Any]) -> bool:
+        """Whether all content of the page was classified, and found not sensitive."""
+        url = browser_data.get("url", "")
+        if not url or self._url_verdicts.get(url) is not False:
+            return False
+        blocks = browser_data.get("blocks")
+        if blocks:
+            return not (self.page_verdicts.unclassified(url, blocks) or self.page_verdicts.is_sensitive(url, blocks))
+        # Without blocks the URL's verdict holds for the content classified last only
+        return all(browser_data.get(key) == self.last_browser_data.get(key)
+                   for key in ("url", "title", "dom", "screenshot"))
+    
+    def _desired_camera_mode(self) -> str:
+        if self.screen_controller.is_dimmed or self._awaiting_llm:
+            return "full"
+        # Any new content on the page, even at the same URL, resumes the camera
+        page = self._peeked_page if self._peeked_page is not None else self.last_browser_data
+        return self.idle_camera_mode if self._known_harmless(page) else "full"
+    
+    def _update_camera_demand(self):
+        """Send the camera demand when it changes, and renew it before its lease expires."""
+        mode = self._desired_camera_mode()
+        now = time.time()
+        if mode == self.camera_mode and (mode == "full" or now - self._camera_demand_sent_at < self.camera_demand_ttl / 2):
+            return
+        ttl = None if mode == "full" else self.camera_demand_ttl
+        try:
+            if self.tick_budget > 0:
+                # Not sent in time: confirmed by a later cycle asking for the same mode
+                sent, _ = self._demand_calls.result(mode, lambda: self.camera_demand.set(mode, ttl), self._remaining())
+                if not sent:
+                    return
+            else:
+                self.camera_demand.set(mode, ttl)
+        except Exception as e:
+            # Retried next cycle; a lease already sent expires back to full
+            logger.error(f"Error setting camera demand: {e}")
+            return
+        if mode != self.camera_mode:
+            logger.info(f"Camera demand: {mode}")
+            if self.camera_mode == "paused":
+                self._camera_resumed_at = now
+        self.camera_mode = mode
+        self._camera_demand_sent_at = now
+    
+    def _check_sensitivity(self, content: str, url: str) -> Optional[bool]:
+        """Sensitivity verdict, or None while the LLM request is still running."""
+        if self.local_classifier is not None:
+            results = self._classify_locally([content])
+            if results is None:
+                return None
+            verdict, _ = results[0]
+            if verdict is not None:
+                return verdict
+        return self._ask_llm(content, url)
+    
+    def _classify_locally(self, texts):
+        """Local classifier results for texts, or None while they take longer than the tick budget."""
+        def classify():
+            with metrics.local_classifier.time():
+                return self.local_classifier.classify(texts)
+        if self.tick_budget <= 0:
+            return classify()
+        key = hashlib.sha1("\0".join(texts).encode()).hexdigest()
+        done, results = self._local_calls.result(key, classify, self._remaining())
+        return results if done else None
+    
+    def _remaining(self) -> float:
+        """Seconds left of the current check cycle's budget."""
+        return max(0.0, self._tick_deadline - time.time())
+    
+    def _poll_face(self) -> Dict[str, Any]:
+        """Poll the face API, keeping the last sample it really answered with."""
+        sample = self.face_client.get_face_sample()
+        if not sample.get("error"):
+            self._received_face_sample = sample
+        return sample
+    
+    def _face_fallback(self, stale: bool = False) -> Dict[str, Any]:
+        """Face sample used while the face API is failing, per the degraded policy.
+        
+        The cached policies reuse the last count the face API answered with, or
+        no faces when it never answered (e.g. no face detection running).
+        
+        Args:
+            stale: Whether the last received count predates a camera pause
+        """
+        received = self._received_face_sample
+        sample = dict(received or {"count": 0, "trace_id": None, "captured_at": None,
+                                   "changed_at": None, "received_at": None})
+        sample.pop("error", None)
+        if self.degraded_policy == "fail-open" or not (received or stale):
+            sample["count"] = 0
+        elif self.degraded_policy == "fail-closed" or stale:
+            sample["count"] = max(sample.get("count", 0), 2)
+        sample["polled_at"] = time.time()
+        return sample
+    
+    def _degraded_verdict(self, content: str, url: str) -> bool:
+        """Sensitivity verdict used while the LLM is failing, per the degraded policy."""
+        self._llm_degraded = True
+        results = (self._classify_locally([content])
+                   if self.degraded_policy == "local" and self.local_classifier is not None else None)
+        if results is not None:
+            _, probability = results[0]
+            return probability >= 0.5
+        if self.degraded_policy in ("cached", "local") and url in self._url_verdicts:
+            return self._url_verdicts[url]
+        return self.degraded_policy != "fail-open"
+    
+    def _submit_llm(self, content: str, url: str) -> "concurrent.futures.Future":
+        """Submit to the request manager, reporting the request's outcome to the LLM breaker once."""
+        future = self.llm_manager.submit(content, url)
+        if self.recorder is not None and not future.done() and future not in self._llm_recorded:
+            self._record_verdict_when_done(future, content, url)
+        if self.llm_breaker is None:
+            return future
+        if future.done():
+            self.llm_breaker.release()
+        elif future not in self._llm_watched:
+            self._llm_watched.add(future)
+            start = time.time()
+            
+            def finished(done: "concurrent.futures.Future"):
+                self._llm_watched.discard(done)
+                if done.cancelled():
+                    self.llm_breaker.release()
+                else:
+                    self.llm_breaker.record(time.time() - start, done.exception() is not None)
+            future.add_done_callback(finished)
+        return future
+    
+    def _record_verdict_when_done(self, future: "concurrent.futures.Future", content: str, url: str):
+        self._llm_recorded.add(future)
+        start = time.time()
+        
+        def finished(done: "concurrent.futures.Future"):
+            self._llm_recorded.discard(done)
+            if not done.cancelled() and done.exception() is None:
+                self.recorder.verdict(content, url, done.result(), time.time() - start)
+        future.add_done_callback(finished)
+    
+    def _check_llm(self, content: str, url: str) -> bool:
+        """Blocking check, reported to the LLM breaker and the recorder."""
+        start = time.time()
+        try:
+            verdict = self.sensitivity_checker.is_sensitive(content, url)
+        except SensitivityCheckError:
+            if self.llm_breaker is not None:
+                self.llm_breaker.record(time.time() - start, True)
+            raise
+        if self.llm_breaker is not None:
+            self.llm_breaker.record(time.time() - start)
+        if self.recorder is not None:
+            self.recorder.verdict(content, url, verdict, time.time() - start)
+        return verdict
+    
+    def _ask_llm(self, content: str, url: str) -> Optional[bool]:
+        if self.llm_manager is None and self.tick_budget > 0:
+            # Blocking check on a worker thread; a check still running past the
+            # budget was let through by the breaker when it started
+            key = LLMRequestManager.key(content, url)
+            if not self._llm_calls.running(key) and not self.llm_breaker.allow():
+                return self._degraded_verdict(content, url)
+            try:
+                done, verdict = self._llm_calls.result(key, lambda: self._check_llm(content, url), self._remaining())
+            except SensitivityCheckError:
+                return self._degraded_verdict(content, url)
+            return verdict if done else None
+        
+        if self.llm_breaker is not None and not self.llm_breaker.allow():
+            return self._degraded_verdict(content, url)
+        
+        if self.llm_manager is None:
+            # Blocking check; without a tick budget there is none to keep
+            try:
+                return self._check_llm(content, url)
+            except SensitivityCheckError:
+                return self._degraded_verdict(content, url)
+        
+        # The user left every other page, their answers are no longer needed
+        self.llm_manager.cancel_stale(url)
+        future = self._submit_llm(content, url)
+        try:
+            return future.result(timeout=min(self.llm_wait, self._remaining()))
+        except concurrent.futures.TimeoutError:
+            return None
+        except concurrent.futures.CancelledError:
+            return None
+        except Exception:
+            # Failed checks are not cached, the next cycle asks again
+            return self._degraded_verdict(content, url)
+    
+    def _classify_blocks(self, url: str, title: str, blocks) -> Optional[bool]:
+        """Classify only the blocks not seen on this page before, then aggregate the page verdict."""
+        new_blocks = self.page_verdicts.unclassified(url, blocks)
+        if new_blocks and self.local_classifier is not None:
+            # One batched run over the new blocks; only the uncertain ones go to the LLM
+            results = self._classify_locally([block.get("text", "") for block in new_blocks])
+            if results is None:
+                return None
+            uncertain = []
+            for block, (verdict, _) in zip(new_blocks, results):
+                if verdict is None:
+                    uncertain.append(block)
+                else:
+                    self.page_verdicts.record(url, [block], verdict)
+            new_blocks = uncertain
+        if new_blocks and self.llm_manager is not None:
+            return self._submit_blocks(url, title, blocks, new_blocks)
+        # One check per block, so each verdict covers only text the LLM saw
+        for block in new_blocks:
+            verdict = self._ask_llm(f"{title} {block.get('text', '')}".strip(), url)
+            if verdict is None:
+                # One sensitive block decides the page without waiting for the rest
+                return True if self.page_verdicts.is_sensitive(url, blocks) else None
+            if self._llm_degraded:
+                # Not kept per block, so the blocks are classified again once the LLM is back
+                return verdict or self.page_verdicts.is_sensitive(url, blocks)
+            self.page_verdicts.record(url, [block], verdict)
+            if verdict:
+                # The rest are classified with the page's next event
+                break
+        return self.page_verdicts.is_sensitive(url, blocks)
+    
+    def _submit_blocks(self, url: str, title: str, blocks, new_blocks) -> Optional[bool]:
+        """Submit each new block as its own request; with batching, one prompt returns a verdict per block."""
+        if self.llm_breaker is not None and not self.llm_breaker.allow():
+            new_text = "\n".join(block.get("text", "") for block in new_blocks)
+            return (self._degraded_verdict(f"{title} {new_text}".strip(), url)
+                    or self.page_verdicts.is_sensitive(url, blocks))
+        self.llm_manager.cancel_stale(url)
+        futures = [(block, self._submit_llm(f"{title} {block.get('text', '')}".strip(), url))
+                   for block in new_blocks]
+        done, _ = concurrent.futures.wait([future for _, future in futures],
+                                          timeout=min(self.llm_wait, self._remaining()))
+        waiting = False
+        failed = []
+        for block, future in futures:
+            if future not in done or future.cancelled():
+                waiting = True
+            elif future.exception() is not None:
+                failed.append(block)
+            else:
+                self.page_verdicts.record(url, [block], future.result())
+        if failed:
+            failed_text = "\n".join(block.get("text", "") for block in failed)
+            return (self._degraded_verdict(f"{title} {failed_text}".strip(), url)
+                    or self.page_verdicts.is_sensitive(url, blocks))
+        is_sensitive = self.page_verdicts.is_sensitive(url, blocks)
+        # One sensitive block decides the page without waiting for the rest
+        if waiting and not is_sensitive:
+            return None
+        return is_sensitive
+    
+    def _screenshot_text(self, screenshot: str) -> Optional[str]:
+        """Text of a screenshot data URL, empty if OCR fails, None while OCR takes longer than the tick budget."""
+        def extract():
+            try:
+                with metrics.screenshot_ocr.time():
+                    return self.screenshot_extractor.extract_text(screenshot)
+            except Exception as e:
+                logger.error(f"Error extracting screenshot text: {e}")
+                return ""
+        if self.tick_budget <= 0:
+            return extract()
+        done, text = self._ocr_calls.result(hashlib.sha1(screenshot.encode()).hexdigest(), extract, self._remaining())
+        return text if done else None
+    
     def update_screen_state(self):
         """Update screen brightness based on current conditions."""
         should_dim, reason = self.should_dim_screen()
+        decided_at = time.time()
         
         if should_dim and not self.screen_controller.is_dimmed:
             logger.info(f"Dimming screen: {reason}")
             self.screen_controller.dim_screen()
+            self._trace_screen_change("dim", decided_at, reason)
         elif not should_dim and self.screen_controller.is_dimmed:
             logger.info(f"Restoring screen brightness: {reason}")
             self.screen_controller.restore_brightness()
+            self._trace_screen_change("restore", decided_at, reason)
         else:
             logger.debug(f"Screen state unchanged: {reason}")
+        
+        if self.camera_demand is not None:
+            self._update_camera_demand()
+    
+    def _trace_screen_change(self, action: str, decided_at: float, reason: str):
+        if self.tracer:
+            self.tracer.record_screen_change(self.last_face_sample, decided_at, action, decided_at, time.time(), reason)
+    
+    def next_interval(self) -> float:
+        """Seconds from the start of this check cycle to the next one."""
+        if self.scheduler is None:
+            interval = self.check_interval
+        else:
+            url = self.last_browser_data.get("url")
+            interval = self.scheduler.update(self.last_face_sample.get("count", 0),
+                                             self._url_verdicts.get(url) if url else None,
+                                             self.screen_controller.is_dimmed, self._awaiting_llm)
+        metrics.check_interval.observe(interval)
+        return interval
     
     def run_once(self):
         """Run a single check cycle."""
         try:
-            self.update_screen_state()
+            with metrics.decision.time():
+                self.update_screen_state()
         except Exception as e:
             logger.error(f"Error in check cycle: {e}")
     
@@ -288,7 +1622,10 @@ class UnifiedPrivacyGuard:
         """Run the privacy guard continuously."""
         self.running = True
         logger.info("Starting Unified Privacy Guard...")
-        logger.info(f"Check interval: {self.check_interval} seconds")
+        if self.scheduler:
+            logger.info(f"Check interval: adaptive, {self.scheduler.min_interval}-{self.scheduler.max_interval} seconds")
+        else:
+            logger.info(f"Check interval: {self.check_interval} seconds")
         
         try:
             while self.running:
@@ -298,7 +1635,7 @@ class UnifiedPrivacyGuard:
                 
                 # Calculate sleep time to maintain consistent interval
                 elapsed = time.time() - start_time
-                sleep_time = max(0, self.check_interval - elapsed)
+                sleep_time = max(0, self.next_interval() - elapsed)
                 
                 if sleep_time > 0:
                     time.sleep(sleep_time)
@@ -317,6 +1654,31 @@ class UnifiedPrivacyGuard:
         if self.screen_controller.is_dimmed:
             self.screen_controller.restore_brightness()
         
+        if self.camera_demand is not None and self.camera_mode != "full":
+            try:
+                self.camera_demand.set("full")
+            except Exception as e:
+                logger.error(f"Error resuming camera: {e}")
+        
+        if self.tracer:
+            self.tracer.close()
+        
+        if self.recorder:
+            self.recorder.close()
+        
+        if self.screenshot_extractor:
+            self.screenshot_extractor.close()
+        
+        if self.llm_manager:
+            self.llm_manager.close()
+        
+        for breaker in (self.face_breaker, self.browser_breaker, self.llm_breaker):
+            if breaker is not None:
+                breaker.close()
+        
+        for calls in (self._llm_calls, self._ocr_calls, self._local_calls, self._demand_calls):
+            calls.close()
+        
         logger.info("Privacy Guard stopped")
 
 def main():
@@ -345,6 +1707,182 @@ def main():
         default=0.5,
         help="Check interval in seconds"
     )
+    parser.add_argument(
+        "--adaptive-interval",
+        action="store_true",
+        help="Check at --min-interval while dimmed or several faces see sensitive content, "
+             "and back off towards --max-interval while nothing is at stake"
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        help="Shortest adaptive check interval (default: half the check interval)"
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        help="Longest adaptive check interval (default: 4 times the check interval)"
+    )
+    parser.add_argument(
+        "--camera-demand",
+        action="store_true",
+        help="Lower the face counter's capture rate while the page is known to be harmless "
+             "(through its /demand endpoint, or directly with --embedded)"
+    )
+    parser.add_argument(
+        "--idle-camera-mode",
+        choices=["low", "paused"],
+        default="low",
+        help="Capture demand on harmless pages with --camera-demand: low-power detection rate, "
+             "or paused with the camera released (default: low)"
+    )
+    parser.add_argument(
+        "--face-wire",
+        choices=["json", "binary"],
+        default="json",
+        help="Poll GET /face-count (json) or the compact GET /face-count.bin (binary)"
+    )
+    parser.add_argument(
+        "--face-api-uds",
+        help="Poll the face API over this Unix domain socket (implies --face-wire binary)"
+    )
+    parser.add_argument(
+        "--face-shm",
+        help="Read face counts from this shared memory block (face counter --shm-name), "
+             "falling back to the face API while it is unavailable"
+    )
+    parser.add_argument(
+        "--face-window-ms",
+        type=float,
+        default=0,
+        help="Use the highest face count of this many milliseconds per check instead of the latest (0 to disable)"
+    )
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=1,
+        help="Sensitivity checks sent to the LLM server at once (default: 1, 0 to check synchronously)"
+    )
+    parser.add_argument(
+        "--llm-wait",
+        type=float,
+        default=0.2,
+        help="Seconds a check cycle waits for a running sensitivity check before moving on (default: 0.2)"
+    )
+    parser.add_argument(
+        "--llm-batch-size",
+        type=int,
+        default=1,
+        help="Sensitivity checks packed into one LLM prompt (default: 1, needs --llm-concurrency > 0)"
+    )
+    parser.add_argument(
+        "--llm-batch-window",
+        type=float,
+        default=0.05,
+        help="Seconds a check waits for others to share its batch (default: 0.05)"
+    )
+    parser.add_argument(
+        "--tick-budget",
+        type=float,
+        help="Longest a check cycle waits on the face API, browser server and LLM, in seconds "
+             "(default: the check interval, 0 to wait for every call and disable the circuit breakers)"
+    )
+    parser.add_argument(
+        "--degraded-policy",
+        choices=["fail-open", "fail-closed", "cached", "local"],
+        default="cached",
+        help="Decision while a dependency's circuit breaker is open: fail-open, fail-closed (dim), cached "
+             "(last verdict of the page / last face count) or local (--classifier-model probability) (default: cached)"
+    )
+    parser.add_argument(
+        "--llm-slow-threshold",
+        type=float,
+        default=5.0,
+        help="LLM calls slower than this many seconds count as failures for its circuit breaker (default: 5)"
+    )
+    parser.add_argument(
+        "--breaker-reset",
+        type=float,
+        default=5.0,
+        help="Seconds an open circuit breaker waits before probing its dependency again (default: 5)"
+    )
+    parser.add_argument(
+        "--classifier-model",
+        help="ONNX text classifier run in-process before the LLM (needs --classifier-tokenizer)"
+    )
+    parser.add_argument(
+        "--classifier-tokenizer",
+        help="tokenizer.json of --classifier-model"
+    )
+    parser.add_argument(
+        "--classifier-thresholds",
+        type=float,
+        nargs=2,
+        default=[0.2, 0.8],
+        metavar=("LOW", "HIGH"),
+        help="Probabilities at or below LOW / at or above HIGH are decided locally, others go to the LLM (default: 0.2 0.8)"
+    )
+    parser.add_argument(
+        "--screenshot-ocr",
+        action="store_true",
+        help="OCR tab screenshots of pages with little DOM text (needs pytesseract and Pillow)"
+    )
+    parser.add_argument(
+        "--ocr-workers",
+        type=int,
+        default=2,
+        help="Screenshot tiles recognized in parallel (default: 2)"
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=8001,
+        help="Port for the Prometheus /metrics endpoint (0 to disable)"
+    )
+    parser.add_argument(
+        "--trace-file",
+        help="Append end-to-end decision spans to this JSONL file (analyze with trace_analyzer.py)"
+    )
+    parser.add_argument(
+        "--record-workload",
+        help="Write every face sample, browser event and LLM verdict to this JSONL file "
+             "(replay with workload_trace.py)"
+    )
+    parser.add_argument(
+        "--embedded",
+        action="store_true",
+        help="Run the face detector in this process and read counts from memory instead of the face API"
+    )
+    parser.add_argument(
+        "--model-path",
+        help="ONNX face detection model (required with --embedded)"
+    )
+    parser.add_argument(
+        "--camera-id",
+        type=int,
+        default=0,
+        help="Camera device ID for --embedded (default: 0)"
+    )
+    parser.add_argument(
+        "--face-source",
+        help="With --embedded, replay a video file, image directory or frame dump instead of the camera"
+    )
+    parser.add_argument(
+        "--serve-face-api",
+        action="store_true",
+        help="With --embedded, also serve the face count HTTP API for external consumers"
+    )
+    parser.add_argument(
+        "--face-api-host",
+        default="127.0.0.1",
+        help="Host for --serve-face-api"
+    )
+    parser.add_argument(
+        "--face-api-port",
+        type=int,
+        default=8000,
+        help="Port for --serve-face-api"
+    )
     parser.add_argument(
         "--test-once",
         action="store_true",
@@ -353,21 +1891,115 @@ def main():
     
     args = parser.parse_args()
     
+    face_client = None
+    embedded_counter = None
+    if args.embedded:
+        if not args.model_path:
+            parser.error("--model-path is required with --embedded")
+        face_client = InProcessFaceClient()
+        embedded_counter = EmbeddedFaceCounter(
+            args.model_path,
+            face_client,
+            camera_id=args.camera_id,
+            serve_api=args.serve_face_api,
+            api_host=args.face_api_host,
+            api_port=args.face_api_port,
+            source=args.face_source
+        )
+        embedded_counter.start()
+    elif args.face_wire == "binary" or args.face_api_uds:
+        if args.face_window_ms:
+            parser.error("--face-window-ms needs --face-wire json")
+        face_client = BinaryFaceClient(args.face_api_url, uds_path=args.face_api_uds)
+    if args.face_shm and not args.embedded:
+        fallback = face_client or FaceDetectionClient(args.face_api_url, window_ms=args.face_window_ms)
+        face_client = SharedMemoryFaceClient(args.face_shm, fallback)
+    
+    screenshot_extractor = None
+    if args.screenshot_ocr:
+        try:
+            from screenshot_ocr import ScreenshotTextExtractor
+            screenshot_extractor = ScreenshotTextExtractor(workers=args.ocr_workers)
+        except (ImportError, RuntimeError) as e:
+            parser.error(f"--screenshot-ocr: {e}")
+    
+    local_classifier = None
+    if args.classifier_model:
+        if not args.classifier_tokenizer:
+            parser.error("--classifier-tokenizer is required with --classifier-model")
+        try:
+            from text_classifier import LocalSensitivityClassifier, OnnxTextClassifier
+            local_classifier = LocalSensitivityClassifier(
+                OnnxTextClassifier(args.classifier_model, args.classifier_tokenizer),
+                low=args.classifier_thresholds[0],
+                high=args.classifier_thresholds[1]
+            )
+        except (ImportError, RuntimeError) as e:
+            parser.error(f"--classifier-model: {e}")
+    
+    camera_demand = None
+    if args.camera_demand:
+        camera_demand = embedded_counter.demand if embedded_counter else CameraDemandClient(args.face_api_url)
+    
+    recorder = None
+    if args.record_workload:
+        from workload_trace import WorkloadRecorder
+        # The settings a replay uses by default
+        recorder = WorkloadRecorder(args.record_workload, settings={
+            "check_interval": args.check_interval,
+            "adaptive_interval": args.adaptive_interval,
+            "min_interval": args.min_interval,
+            "max_interval": args.max_interval,
+            "tick_budget": args.tick_budget,
+            "degraded_policy": args.degraded_policy,
+        })
+    
     # Create privacy guard instance
     privacy_guard = UnifiedPrivacyGuard(
         face_api_url=args.face_api_url,
         browser_server_url=args.browser_server_url,
         llm_url=args.llm_url,
-        check_interval=args.check_interval
+        check_interval=args.check_interval,
+        trace_file=args.trace_file,
+        face_client=face_client,
+        face_window_ms=args.face_window_ms,
+        screenshot_extractor=screenshot_extractor,
+        llm_concurrency=args.llm_concurrency,
+        llm_wait=args.llm_wait,
+        local_classifier=local_classifier,
+        llm_batch_size=args.llm_batch_size,
+        llm_batch_window=args.llm_batch_window,
+        tick_budget=args.tick_budget,
+        degraded_policy=args.degraded_policy,
+        llm_slow_threshold=args.llm_slow_threshold,
+        breaker_reset=args.breaker_reset,
+        adaptive_interval=args.adaptive_interval,
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        camera_demand=camera_demand,
+        idle_camera_mode=args.idle_camera_mode,
+        recorder=recorder
     )
     
+    metrics_server = None
+    if args.metrics_port and not args.test_once:
+        metrics_server = MetricsServer(port=args.metrics_port)
+        metrics_server.start()
+    
     if args.test_once:
         logger.info("Running single test cycle...")
         privacy_guard.run_once()
         logger.info("Test completed")
     else:
         # Run continuously
-        privacy_guard.run()
+        try:
+            privacy_guard.run()
+        finally:
+            if metrics_server:
+                metrics_server.stop()
+    
+    if embedded_counter:
+        embedded_counter.stop()
 
 if __name__ == "__main__":
     main()
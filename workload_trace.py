@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Workload recording and deterministic replay for the privacy guard.
+
+unified_privacy_guard.py --record-workload trace.jsonl writes what the guard
+saw to a JSONL file, one record per line with its epoch time "t" and kind "k":
+
+    start   guard settings of the recording, opening a session
+    face    face count sample, written only when the count or error changes
+    page    browser event, written once per event (screenshots left out)
+    llm     LLM verdict with its latency, keyed by a hash of URL and content
+
+replay feeds a recording through UnifiedPrivacyGuard's decision logic with
+the face API, browser server, LLM and screen replaced by the recording. By
+default it runs on a virtual clock, as fast as the decisions can be computed
+and with identical results on every run; --realtime replays at the recorded
+pace instead, which is needed for --llm-concurrency. A file holding several
+sessions (e.g. recordings appended to one another) replays one of them,
+--session, the last by default. Each --policy is one set
+of guard arguments, so several policies are compared on the same workload:
+
+    python workload_trace.py replay trace.jsonl \\
+        --policy fixed: --policy adaptive:adaptive_interval=true,max_interval=2
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import threading
+import time
+import types
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+from trace_analyzer import percentile
+
+# Browser event fields replayed; the screenshot is left out to keep traces small
+PAGE_FIELDS = ("url", "title", "dom", "blocks", "timestamp")
+
+def verdict_key(content: str, url: str) -> str:
+    return hashlib.sha1(f"{url}\0{content}".encode("utf-8")).hexdigest()[:16]
+
+class WorkloadRecorder:
+    """Writes the guard's inputs to a JSONL file, replacing it; safe to call from the LLM callback threads."""
+
+    def __init__(self, path: str, settings: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "w", encoding="utf-8")
+        self._last_face: Optional[Tuple[int, bool]] = None
+        self._last_page = None
+        self._write({"k": "start", "settings": settings or {}})
+
+    def _write(self, record: Dict[str, Any]):
+        record.setdefault("t", time.time())
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def face(self, sample: Dict[str, Any]):
+        state = (sample.get("count", 0), bool(sample.get("error")))
+        if state == self._last_face:
+            return
+        self._last_face = state
+        self._write({"t": sample.get("polled_at") or time.time(), "k": "face", "count": state[0], "error": state[1],
+                     "captured_at": sample.get("captured_at"), "changed_at": sample.get("changed_at")})
+
+    def page(self, browser_data: Dict[str, Any]):
+        if browser_data.get("error") or browser_data.get("timestamp") == self._last_page:
+            return
+        self._last_page = browser_data.get("timestamp")
+        self._write({"k": "page", **{field: browser_data.get(field) for field in PAGE_FIELDS}})
+
+    def verdict(self, content: str, url: str, is_sensitive: bool, latency: float):
+        self._write({"k": "llm", "key": verdict_key(content, url), "url": url, "verdict": is_sensitive,
+                     "latency": round(latency, 4)})
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+def split_sessions(records: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Split records, in file order, into the sessions opened by each start record."""
+    sessions: List[List[Dict[str, Any]]] = []
+    for record in records:
+        if record.get("k") == "start" or not sessions:
+            sessions.append([])
+        sessions[-1].append(record)
+    return sessions
+
+class Workload:
+    """One recording session loaded for replay."""
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        """
+        Raises:
+            ValueError: For records of several sessions, or without face, page or LLM records
+        """
+        if sum(record.get("k") == "start" for record in records) > 1:
+            raise ValueError("The records hold several sessions, replay one of split_sessions()")
+        self.settings: Dict[str, Any] = {}
+        self.faces: List[Dict[str, Any]] = []
+        self.pages: List[Dict[str, Any]] = []
+        self.verdicts: Dict[str, Dict[str, Any]] = {}
+        self.url_verdicts: Dict[str, Dict[str, Any]] = {}
+        for record in sorted(records, key=lambda record: record["t"]):
+            kind = record.get("k")
+            if kind == "start":
+                self.settings = record.get("settings", {})
+            elif kind == "face":
+                self.faces.append(record)
+            elif kind == "page":
+                self.pages.append(record)
+            elif kind == "llm":
+                self.verdicts[record["key"]] = record
+                self.url_verdicts[record.get("url", "")] = record
+        times = [record["t"] for record in records if record.get("k") != "start"]
+        if not times:
+            raise ValueError("The workload has no face, page or LLM records")
+        self.start, self.end = min(times), max(times)
+        self._face_times = [record["t"] for record in self.faces]
+        self._page_times = [record["t"] for record in self.pages]
+
+    @classmethod
+    def from_file(cls, path: str, session: int = -1) -> "Workload":
+        """Load one session of a recording, the last by default.
+        
+        Raises:
+            ValueError: For an empty file or session
+            IndexError: For a session the file does not hold
+        """
+        with open(path, encoding="utf-8") as f:
+            sessions = split_sessions([json.loads(line) for line in f if line.strip()])
+        if not sessions:
+            raise ValueError(f"{path} holds no records")
+        return cls(sessions[session])
+
+    @staticmethod
+    def _at(times: List[float], records: List[Dict[str, Any]], t: float) -> Optional[Dict[str, Any]]:
+        index = bisect_right(times, t) - 1
+        return records[index] if index >= 0 else None
+
+    def face_at(self, t: float) -> Optional[Dict[str, Any]]:
+        return self._at(self._face_times, self.faces, t)
+
+    def page_at(self, t: float) -> Optional[Dict[str, Any]]:
+        return self._at(self._page_times, self.pages, t)
+
+class VirtualClock:
+    """Stands in for the time module in unified_privacy_guard; sleeping only moves the clock."""
+
+    def __init__(self, start: float):
+        self.now = start
+        self._lock = threading.Lock()
+        self.module = types.SimpleNamespace(time=self.time, sleep=self.sleep, perf_counter=self.time,
+                                            monotonic=self.time, process_time=time.process_time)
+
+    def time(self) -> float:
+        with self._lock:
+            return self.now
+
+    def sleep(self, seconds: float):
+        with self._lock:
+            self.now += max(0.0, seconds)
+
+    def trace_time(self) -> float:
+        return self.time()
+
+class RealClock:
+    """Replays at the recorded pace, the recording's start mapped to now."""
+
+    def __init__(self, start: float):
+        self.offset = time.time() - start
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float):
+        time.sleep(max(0.0, seconds))
+
+    def trace_time(self) -> float:
+        return time.time() - self.offset
+
+class ReplayFaceClient:
+    def __init__(self, workload: Workload, clock):
+        self.workload = workload
+        self.clock = clock
+        self.offset = getattr(clock, "offset", 0.0)
+        self.polls = 0
+
+    def get_face_count(self) -> int:
+        return self.get_face_sample()["count"]
+
+    def get_face_sample(self) -> Dict[str, Any]:
+        self.polls += 1
+        now = self.clock.time()
+        record = self.workload.face_at(self.clock.trace_time()) or {"count": 0, "t": self.workload.start}
+        sample = {"count": record["count"], "trace_id": None, "captured_at": now,
+                  "changed_at": (record.get("changed_at") or record["t"]) + self.offset,
+                  "received_at": None, "polled_at": now}
+        if record.get("error"):
+            sample["error"] = "recorded face API error"
+        return sample
+
+class ReplayBrowserClient:
+    def __init__(self, workload: Workload, clock):
+        self.workload = workload
+        self.clock = clock
+        self.polls = 0
+
+    def get_latest_browser_data(self) -> Dict[str, Any]:
+        self.polls += 1
+        record = self.workload.page_at(self.clock.trace_time())
+        if record is None:
+            return {"url": "", "title": "", "dom": "", "screenshot": "", "timestamp": 0}
+        data = {field: record.get(field) for field in PAGE_FIELDS}
+        data["blocks"] = data["blocks"] or []
+        data["screenshot"] = ""
+        return data
+
+class ReplaySensitivityChecker:
+    """Answers with the recorded verdict after its recorded latency.
+
+    Content the recording has no verdict for (a policy splitting pages into
+    different LLM requests) gets the last verdict recorded for its URL, or
+    "not sensitive", and is counted as a miss.
+    """
+
+    def __init__(self, workload: Workload, clock):
+        self.workload = workload
+        self.clock = clock
+        self.calls = 0
+        self.misses = 0
+
+    def _lookup(self, content: str, url: str) -> Tuple[bool, float]:
+        self.calls += 1
+        record = self.workload.verdicts.get(verdict_key(content, url))
+        if record is None:
+            self.misses += 1
+            record = self.workload.url_verdicts.get(url, {"verdict": False, "latency": 0.0})
+        return bool(record["verdict"]), float(record.get("latency") or 0.0)
+
+    def is_sensitive(self, content: str, url: str) -> bool:
+        verdict, latency = self._lookup(content, url)
+        self.clock.sleep(latency)
+        return verdict
+
+    async def is_sensitive_async(self, session, content: str, url: str) -> bool:
+        verdict, latency = self._lookup(content, url)
+        await asyncio.sleep(latency)
+        return verdict
+
+    async def is_sensitive_batch_async(self, session, items) -> List[Optional[bool]]:
+        results = [self._lookup(content, url) for content, url in items]
+        await asyncio.sleep(max((latency for _, latency in results), default=0.0))
+        return [verdict for verdict, _ in results]
+
+class ReplayScreen:
+    """ScreenController stand-in recording when the screen was dimmed."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self._is_dimmed = False
+        self.changes: List[Tuple[float, str]] = []
+
+    @property
+    def is_dimmed(self) -> bool:
+        return self._is_dimmed
+
+    def dim_screen(self, dim_percentage: Optional[int] = None) -> bool:
+        self._is_dimmed = True
+        self.changes.append((self.clock.time(), "dim"))
+        return True
+
+    def restore_brightness(self) -> bool:
+        self._is_dimmed = False
+        self.changes.append((self.clock.time(), "restore"))
+        return True
+
+def dim_latencies(workload: Workload, changes: List[Tuple[float, str]], offset: float) -> List[float]:
+    """Seconds from the last face count or page change before each dim to the dim."""
+    latencies = []
+    for at, action in changes:
+        if action != "dim":
+            continue
+        trace_at = at - offset
+        face, page = workload.face_at(trace_at), workload.page_at(trace_at)
+        cause = max(record["t"] for record in (face, page, {"t": workload.start}) if record)
+        latencies.append(max(0.0, trace_at - cause))
+    return latencies
+
+def dimmed_seconds(changes: List[Tuple[float, str]], end: float) -> float:
+    total, dimmed_at = 0.0, None
+    for at, action in changes:
+        if action == "dim" and dimmed_at is None:
+            dimmed_at = at
+        elif action == "restore" and dimmed_at is not None:
+            total, dimmed_at = total + at - dimmed_at, None
+    return total + (end - dimmed_at if dimmed_at is not None else 0.0)
+
+def replay(workload: Workload, policy: Dict[str, Any], realtime: bool = False) -> Dict[str, Any]:
+    """Run the guard with the given arguments over the workload and measure what it did."""
+    import unified_privacy_guard as upg
+
+    clock = RealClock(workload.start) if realtime else VirtualClock(workload.start)
+    kwargs = dict(policy)
+    if not realtime and kwargs.get("llm_concurrency"):
+        raise ValueError("llm_concurrency needs --realtime, the request manager runs on real time")
+
+    guard_time = upg.time
+    if not realtime:
+        upg.time = clock.module
+    guard = None
+    try:
+        face_client = ReplayFaceClient(workload, clock)
+        guard = upg.UnifiedPrivacyGuard(face_client=face_client, **kwargs)
+        guard.browser_client = browser_client = ReplayBrowserClient(workload, clock)
+        guard.sensitivity_checker = checker = ReplaySensitivityChecker(workload, clock)
+        if guard.llm_manager is not None:
+            guard.llm_manager.checker = checker
+        guard.screen_controller = screen = ReplayScreen(clock)
+
+        offset = getattr(clock, "offset", 0.0)
+        end = workload.end + offset
+        cpu_times = []
+        while clock.time() <= end:
+            tick = clock.time()
+            cpu_start = time.perf_counter()
+            guard.run_once()
+            cpu_times.append(time.perf_counter() - cpu_start)
+            clock.sleep(guard.next_interval() - (clock.time() - tick))
+
+        latencies = dim_latencies(workload, screen.changes, offset)
+        return {
+            "policy": policy,
+            "replayed_s": workload.end - workload.start,
+            "decisions": len(cpu_times),
+            "llm_calls": checker.calls,
+            "llm_misses": checker.misses,
+            "face_polls": face_client.polls,
+            "browser_polls": browser_client.polls,
+            "dims": sum(action == "dim" for _, action in screen.changes),
+            "restores": sum(action == "restore" for _, action in screen.changes),
+            "dimmed_s": dimmed_seconds(screen.changes, end),
+            "dim_latency_ms": {name: percentile(latencies, pct) * 1000
+                               for name, pct in (("p50", 50), ("p95", 95), ("max", 100))},
+            "decision_cpu_ms": {name: percentile(cpu_times, pct) * 1000
+                                for name, pct in (("p50", 50), ("p99", 99), ("max", 100))},
+        }
+    finally:
+        if guard is not None:
+            guard.stop()
+        upg.time = guard_time
+
+def parse_policy(spec: str) -> Tuple[str, Dict[str, Any]]:
+    """NAME:key=value,key=value; values are read as JSON when they parse, else as strings."""
+    name, _, assignments = spec.partition(":")
+    policy = {}
+    for assignment in filter(None, assignments.split(",")):
+        key, _, value = assignment.partition("=")
+        try:
+            policy[key.strip()] = json.loads(value)
+        except ValueError:
+            policy[key.strip()] = value
+    return name or "default", policy
+
+def print_report(name: str, report: Dict[str, Any]):
+    latency, cpu = report["dim_latency_ms"], report["decision_cpu_ms"]
+    print(f"--- {name} {json.dumps(report['policy'])}")
+    print(f"decisions        {report['decisions']} over {report['replayed_s']:.1f} s")
+    print(f"llm calls        {report['llm_calls']} ({report['llm_misses']} without a recorded verdict)")
+    print(f"polls            face {report['face_polls']}, browser {report['browser_polls']}")
+    print(f"screen changes   {report['dims']} dims, {report['restores']} restores, dimmed {report['dimmed_s']:.1f} s")
+    print(f"dim latency      p50 {latency['p50']:.0f} ms  p95 {latency['p95']:.0f} ms  max {latency['max']:.0f} ms")
+    print(f"decision cpu     p50 {cpu['p50']:.3f} ms  p99 {cpu['p99']:.3f} ms  max {cpu['max']:.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded privacy guard workload")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    replay_parser = subparsers.add_parser("replay", help="Replay a workload through one or more policies")
+    replay_parser.add_argument("workload", help="JSONL file written with --record-workload")
+    replay_parser.add_argument("--policy", action="append", default=[],
+                               help="NAME:key=value,... UnifiedPrivacyGuard arguments, repeat to compare "
+                                    "(default: the settings of the recording)")
+    replay_parser.add_argument("--session", type=int, default=-1,
+                               help="Session to replay when the file holds several, from 0 or negative "
+                                    "from the end (default: the last)")
+    replay_parser.add_argument("--realtime", action="store_true", help="Replay at the recorded pace")
+    replay_parser.add_argument("--json", help="Also write the reports to this JSON file")
+    replay_parser.add_argument("--verbose", action="store_true", help="Keep the guard's info logging")
+    args = parser.parse_args()
+
+    import logging
+    if not args.verbose:
+        logging.getLogger("unified_privacy_guard").setLevel(logging.WARNING)
+
+    try:
+        workload = Workload.from_file(args.workload, args.session)
+    except IndexError:
+        print(f"{args.workload} has no session {args.session}", file=sys.stderr)
+        sys.exit(2)
+    policies = [parse_policy(spec) for spec in args.policy] or [("recorded", workload.settings)]
+    reports = {}
+    for name, policy in policies:
+        try:
+            reports[name] = replay(workload, policy, realtime=args.realtime)
+        except (TypeError, ValueError) as e:
+            print(f"Policy {name}: {e}", file=sys.stderr)
+            sys.exit(2)
+        print_report(name, reports[name])
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+
+if __name__ == "__main__":
+    main()